@@ -2,7 +2,9 @@
 """Add BC_001 to BC_010 entries (Level 1) to Business_Communication.json"""
 
 import json
-import random
+
+from hard_distractors import level_difficulty, select_hard_distractors
+from random_streams import stream_random
 
 # Level 1 vocabulary for Business_Communication
 level1_words = [
@@ -24,7 +26,7 @@ humorous_distractors = [
     "Schlafenszeit", "Kaffeeklatsch", "Pausenraum"
 ]
 
-def create_distractors(word_en, word_de):
+def create_distractors(word_en, word_de, rng):
     """Create 3 regular + 1 humorous distractor"""
     distractors = []
     
@@ -51,9 +53,15 @@ def create_distractors(word_en, word_de):
         ("show", "Show")
     ]
     
-    selected = random.sample([s for s in similar if s[0] != word_de and s[1] != word_en], 3)
+    # The most confusable of the similar words for level 1, else random ones
+    selected = select_hard_distractors(
+        similar, [(word_de, word_en)], k=3, difficulty=level_difficulty(1), seed=rng.getrandbits(32)
+    )
+    selected = selected[0] if selected and len(selected[0]) == 3 else None
+    if not selected:
+        selected = rng.sample([s for s in similar if s[0] != word_de and s[1] != word_en], 3)
     for i, (w_de, w_en) in enumerate(selected):
-        use_german = random.random() > 0.5
+        use_german = rng.random() > 0.5
         distractors.append({
             "entry": {
                 "word": w_de if use_german else w_en,
@@ -68,8 +76,8 @@ def create_distractors(word_en, word_de):
             "behavior": "seek_center",
             "context": f"{w_de if use_german else w_en} = {w_en if use_german else w_de}, nicht {word_de}",
             "visual": {
-                "color": random.choice(["#FF5722", "#9B59B6", "#E91E63", "#FF9800"]),
-                "variant": random.choice(["diamond", "bubble", "square"]),
+                "color": rng.choice(["#FF5722", "#9B59B6", "#E91E63", "#FF9800"]),
+                "variant": rng.choice(["diamond", "bubble", "square"]),
                 "pulsate": True,
                 "shake": False,
                 "fontSize": 1
@@ -79,13 +87,13 @@ def create_distractors(word_en, word_de):
         })
     
     # Add humorous distractor
-    humorous = random.choice(humorous_distractors)
+    humorous = rng.choice(humorous_distractors)
     distractors.append({
         "entry": {
             "word": humorous,
             "type": "Wrong"
         },
-        "spawnPosition": round(0.7 + random.random() * 0.2, 2),
+        "spawnPosition": round(0.7 + rng.random() * 0.2, 2),
         "spawnSpread": 0.05,
         "speed": 1.2,
         "points": 100,
@@ -95,7 +103,7 @@ def create_distractors(word_en, word_de):
         "context": f"{humorous} = {humorous.lower()} (humorvoller Distraktor - nicht {word_de}!)",
         "visual": {
             "color": "#FFC107",
-            "variant": random.choice(["hexagon", "bubble"]),
+            "variant": rng.choice(["hexagon", "bubble"]),
             "pulsate": True,
             "shake": True,
             "fontSize": 1
@@ -108,6 +116,8 @@ def create_distractors(word_en, word_de):
 
 def create_entry(index, word_en, word_de, word_type):
     """Create a level 1 entry"""
+    # Same random stream per round as generate_business_english.py
+    rng = stream_random("business_english", "Business_Communication", index)
     colors = ["#2196F3", "#4CAF50", "#F44336", "#9C27B0", "#00BCD4", 
               "#FF9800", "#607D8B", "#795548", "#3F51B5", "#E91E63"]
     color = colors[index % len(colors)]
@@ -136,7 +146,7 @@ def create_entry(index, word_en, word_de, word_type):
                     "word": word_de,
                     "type": "Translation"
                 },
-                "spawnPosition": round(random.random(), 2),
+                "spawnPosition": round(rng.random(), 2),
                 "spawnSpread": 0.05,
                 "speed": 0.9,
                 "points": 200,
@@ -146,14 +156,14 @@ def create_entry(index, word_en, word_de, word_type):
                 "context": f"{word_en} = {word_de}",
                 "visual": {
                     "color": color,
-                    "variant": random.choice(["hexagon", "star", "bubble", "spike"]),
+                    "variant": rng.choice(["hexagon", "star", "bubble", "spike"]),
                     "pulsate": False,
                     "fontSize": 1.1
                 },
                 "sound": "bubble_hit_soft"
             }
         ],
-        "distractors": create_distractors(word_en, word_de),
+        "distractors": create_distractors(word_en, word_de, rng),
         "meta": {
             "source": "Business English",
             "tags": [
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Benchmark the chapter export pipeline on synthetic content trees.
+
+This script:
+1. Generates synthetic content trees at 1x/10x/100x the size of public/content/themes
+   (same universe/theme/chapter layout, items built with item_generator.create_item()
+   and the Disney theme spec)
+2. Runs the export pipeline stages (discover, decode, extract, format, write) on
+   every tree in a fresh process and times each stage
+3. Records rows/s, MB/s and peak RSS per scale in export_benchmark_baseline.json
+4. Fails (exit code 1) when a stage got slower or memory grew beyond the tolerance
+
+Usage:
+    python benchmark_exports.py                        # compare against the baseline
+    python benchmark_exports.py --scales 1 10          # skip the 100x tree
+    python benchmark_exports.py --update-baseline      # record a new baseline
+    python benchmark_exports.py --bench-dir bench      # keep/reuse the generated trees
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, Any, List
+
+from export_all import CHAPTER_TABLES
+from export_common import CONTENT_DIR, CsvRowWriter, chapter_universe_id, discover_content_files, load_chapter_file
+from generate_disney_items import THEME_SPEC
+from item_generator import create_item
+
+# Paths
+BASELINE_FILE = Path("export_benchmark_baseline.json")
+
+BASELINE_VERSION = 1
+
+# Size of the current content tree - scale 1x
+UNIVERSE_COUNT = 16
+THEME_COUNT = 66
+CHAPTER_COUNT = 205
+ROUNDS_PER_CHAPTER = 11
+
+DEFAULT_SCALES = [1, 10, 100]
+
+# Allowed slowdown (rows/s) and memory growth (peak RSS) before a run counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Stages faster than this are too noisy to compare against the baseline
+MIN_COMPARABLE_SECONDS = 0.05
+
+STAGES = ['discover', 'decode', 'extract', 'format', 'write']
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ber", "gen", "ung", "lich", "schaft", "ter", "ra"]
+
+
+def synthetic_word(rng: random.Random) -> str:
+    """Return a random word-like string."""
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def synthetic_item_data(rng: random.Random) -> Dict[str, Any]:
+    """Return item data in the ITEMS format consumed by create_item()."""
+    base = synthetic_word(rng)
+    correct = [
+        {"word": synthetic_word(rng), "context": f"{base} = {synthetic_word(rng)}"}
+        for _ in range(rng.choice([1, 1, 1, 1, 2]))
+    ]
+    distractors = [
+        {"word": synthetic_word(rng), "context": f"{base} ist nicht {synthetic_word(rng)}", "redirect": base}
+        for _ in range(rng.choice([3, 3, 4]))
+    ]
+    return {"base": base, "level": rng.randint(1, 6), "correct": correct, "distractors": distractors}
+
+
+def generate_corpus(root: Path, scale: int, seed: int = 42) -> None:
+    """Write a synthetic content tree with scale times the current number of themes and chapters."""
+    rng = random.Random(seed)
+
+    content_dir = root / CONTENT_DIR
+    universe_ids = [f"universe_{u:02d}" for u in range(UNIVERSE_COUNT)]
+    theme_count = THEME_COUNT * scale
+    chapter_count = CHAPTER_COUNT * scale
+
+    # Chapters round-robin over themes, themes round-robin over universes
+    theme_chapters = {t: [] for t in range(theme_count)}
+    for c in range(chapter_count):
+        theme_chapters[c % theme_count].append(f"Chapter_{c:06d}")
+
+    for u, universe_id in enumerate(universe_ids):
+        (content_dir / universe_id).mkdir(parents=True, exist_ok=True)
+        universe = {
+            "id": universe_id,
+            "name": universe_id.replace('_', ' ').title(),
+            "colorPrimary": "#95a5a6",
+            "available": True,
+            "language": "de",
+            "themes": [f"theme_{t:05d}" for t in range(u, theme_count, UNIVERSE_COUNT)],
+            "meta": {"author": "benchmark", "version": "1.0", "created": "2025-01-01"},
+        }
+        with open(content_dir / f"universe.{universe_id}.json", 'w', encoding='utf-8') as f:
+            json.dump(universe, f, indent=2, ensure_ascii=False)
+
+    round_number = 0
+    for t, chapters in theme_chapters.items():
+        theme_id = f"theme_{t:05d}"
+        universe_dir = content_dir / universe_ids[t % UNIVERSE_COUNT]
+        theme = {
+            "id": theme_id,
+            "name": theme_id,
+            "colorPrimary": "#34495e",
+            "chapters": {chapter: {"title": chapter, "backgroundGradient": ["#34495e", "#2c3e50"]} for chapter in chapters},
+            "meta": {"author": "benchmark", "version": "1.0", "created": "2025-01-01"},
+        }
+        with open(universe_dir / f"themes.{theme_id}.json", 'w', encoding='utf-8') as f:
+            json.dump(theme, f, indent=2, ensure_ascii=False)
+
+        theme_dir = universe_dir / theme_id
+        theme_dir.mkdir(exist_ok=True)
+        for chapter in chapters:
+            items = []
+            for index in range(1, ROUNDS_PER_CHAPTER + 1):
+                item = create_item(THEME_SPEC, index, chapter, synthetic_item_data(rng))
+                round_number += 1
+                item["id"] = f"BM_{round_number:07d}"
+                item["theme"] = theme_id
+                items.append(item)
+            with open(theme_dir / f"{chapter}.json", 'w', encoding='utf-8') as f:
+                json.dump(items, f, indent=2, ensure_ascii=False)
+
+
+def ensure_corpus(bench_dir: Path, scale: int, seed: int) -> Path:
+    """Return the tree for a scale, generating it unless an identical one already exists."""
+    root = bench_dir / f"scale_{scale}x"
+    marker = root / "corpus.json"
+    spec = {'scale': scale, 'seed': seed, 'chapters': CHAPTER_COUNT * scale, 'rounds_per_chapter': ROUNDS_PER_CHAPTER}
+
+    if marker.exists():
+        with open(marker, 'r', encoding='utf-8') as f:
+            if json.load(f) == spec:
+                print(f"Reusing {scale}x corpus in {root}")
+                return root
+
+    if root.exists():
+        shutil.rmtree(root)
+
+    print(f"Generating {scale}x corpus ({spec['chapters']} chapter files) in {root}...")
+    started = time.perf_counter()
+    generate_corpus(root, scale, seed)
+    with open(marker, 'w', encoding='utf-8') as f:
+        json.dump(spec, f)
+    print(f"   generated in {time.perf_counter() - started:.1f}s")
+    return root
+
+
+def stage_result(seconds: float, rows: int, size: int) -> Dict[str, float]:
+    """Build the timing record of one stage."""
+    return {
+        'seconds': round(seconds, 4),
+        'rows': rows,
+        'rows_per_s': round(rows / seconds, 1) if seconds else 0.0,
+        'mb_per_s': round(size / 1_000_000 / seconds, 2) if seconds else 0.0,
+    }
+
+
+def run_pipeline(root: Path) -> Dict[str, Any]:
+    """Run the export stages on one tree and return the timings (runs in a fresh process)."""
+    os.chdir(root)
+    output_dir = root / "bench_output"
+    output_dir.mkdir(exist_ok=True)
+
+    seconds = dict.fromkeys(STAGES, 0.0)
+
+    started = time.perf_counter()
+    _, chapter_files = discover_content_files()
+    seconds['discover'] = time.perf_counter() - started
+
+    input_bytes = 0
+    round_count = 0
+    row_count = 0
+
+    handles = []
+    writers = []
+    try:
+        for label, exporter, _ in CHAPTER_TABLES:
+            handle = open(output_dir / exporter.OUTPUT_CSV_FILE.name, 'w', encoding='utf-8', newline='')
+            writer = CsvRowWriter(handle, exporter.CSV_COLUMNS)
+            writer.writeheader()
+            handles.append(handle)
+            writers.append(writer)
+
+        for chapter_file in chapter_files:
+            input_bytes += chapter_file.stat().st_size
+
+            t0 = time.perf_counter()
+            loaded = load_chapter_file(chapter_file)
+            t1 = time.perf_counter()
+            if not loaded:
+                continue
+            items, created_at = loaded
+            round_count += len(items)
+
+            universe_id = chapter_universe_id(chapter_file)
+            table_rows = [list(extractor(items, created_at, universe_id)) for _, _, extractor in CHAPTER_TABLES]
+            t2 = time.perf_counter()
+
+            formatted = [
+                [exporter.format_csv_row(row) for row in rows]
+                for (_, exporter, _), rows in zip(CHAPTER_TABLES, table_rows)
+            ]
+            t3 = time.perf_counter()
+
+            for writer, rows in zip(writers, formatted):
+                writer.writerows(rows)
+                row_count += len(rows)
+            t4 = time.perf_counter()
+
+            seconds['decode'] += t1 - t0
+            seconds['extract'] += t2 - t1
+            seconds['format'] += t3 - t2
+            seconds['write'] += t4 - t3
+    finally:
+        for handle in handles:
+            handle.close()
+
+    output_bytes = sum(path.stat().st_size for path in output_dir.iterdir())
+
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = peak_rss / 1_000_000 if sys.platform == 'darwin' else peak_rss / 1024
+
+    return {
+        'chapter_files': len(chapter_files),
+        'rounds': round_count,
+        'rows': row_count,
+        'input_mb': round(input_bytes / 1_000_000, 2),
+        'output_mb': round(output_bytes / 1_000_000, 2),
+        'peak_rss_mb': round(peak_rss_mb, 1),
+        'stages': {
+            'discover': stage_result(seconds['discover'], len(chapter_files), 0),
+            'decode': stage_result(seconds['decode'], round_count, input_bytes),
+            'extract': stage_result(seconds['extract'], row_count, input_bytes),
+            'format': stage_result(seconds['format'], row_count, input_bytes),
+            'write': stage_result(seconds['write'], row_count, output_bytes),
+        },
+    }
+
+
+def measure_scale(root: Path) -> Dict[str, Any]:
+    """Run the pipeline in a fresh process so peak RSS belongs to this scale alone."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+        return pool.submit(run_pipeline, root.resolve()).result()
+
+
+def find_regressions(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Compare a run against the baseline and describe every regression found."""
+    regressions = []
+    for scale, result in results['scales'].items():
+        base = baseline.get('scales', {}).get(scale)
+        if not base:
+            continue
+
+        for stage, timing in result['stages'].items():
+            base_timing = base['stages'].get(stage)
+            if not base_timing or base_timing['seconds'] < MIN_COMPARABLE_SECONDS:
+                continue
+            if timing['rows_per_s'] < base_timing['rows_per_s'] * (1 - tolerance):
+                regressions.append(
+                    f"{scale}x {stage}: {timing['rows_per_s']:.0f} rows/s "
+                    f"(baseline {base_timing['rows_per_s']:.0f} rows/s)"
+                )
+
+        if result['peak_rss_mb'] > base['peak_rss_mb'] * (1 + tolerance):
+            regressions.append(
+                f"{scale}x peak RSS: {result['peak_rss_mb']:.0f} MB (baseline {base['peak_rss_mb']:.0f} MB)"
+            )
+
+    return regressions
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    """Print a table of the stage timings per scale."""
+    for scale, result in results['scales'].items():
+        print(f"\n{scale}x: {result['chapter_files']} chapter files, {result['rounds']} rounds, "
+              f"{result['rows']} rows, {result['input_mb']} MB in, {result['output_mb']} MB out, "
+              f"peak RSS {result['peak_rss_mb']} MB")
+        for stage, timing in result['stages'].items():
+            print(f"   {stage:<9} {timing['seconds']:>9.3f}s {timing['rows_per_s']:>12.0f} rows/s "
+                  f"{timing['mb_per_s']:>9.2f} MB/s")
+
+
+def run_benchmark(scales: List[int], bench_dir: Path, baseline_file: Path, tolerance: float,
+                  update_baseline: bool, seed: int) -> bool:
+    """Run all scales and compare against (or record) the baseline. Returns False on regression."""
+    results = {
+        'version': BASELINE_VERSION,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'scales': {},
+    }
+
+    for scale in scales:
+        root = ensure_corpus(bench_dir, scale, seed)
+        print(f"Benchmarking {scale}x...")
+        results['scales'][str(scale)] = measure_scale(root)
+
+    print_results(results)
+
+    baseline = None
+    if baseline_file.exists() and not update_baseline:
+        with open(baseline_file, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('version') != BASELINE_VERSION:
+            print(f"\nIgnoring {baseline_file}: written by a different benchmark version")
+            baseline = None
+
+    if baseline is None:
+        with open(baseline_file, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Baseline written to {baseline_file}")
+        return True
+
+    regressions = find_regressions(results, baseline, tolerance)
+    if regressions:
+        print(f"\n❌ Regressions against {baseline_file} (tolerance {tolerance:.0%}):")
+        for regression in regressions:
+            print(f"   {regression}")
+        return False
+
+    print(f"\n✅ No regressions against {baseline_file} (tolerance {tolerance:.0%})")
+    return True
+
+
+def main() -> None:
+    """Parse command line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the export pipeline on synthetic content trees.")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES, metavar='N',
+                        help="Corpus sizes relative to the current content tree (default: 1 10 100)")
+    parser.add_argument('--bench-dir', type=Path,
+                        help="Where to generate the trees; kept and reused between runs (default: temporary directory)")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE,
+                        help=f"Baseline file (default: {BASELINE_FILE})")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown / memory growth as a fraction (default: 0.25)")
+    parser.add_argument('--update-baseline', action='store_true', help="Record this run as the new baseline")
+    parser.add_argument('--seed', type=int, default=42, help="Seed for the synthetic content (default: 42)")
+    args = parser.parse_args()
+
+    if args.bench_dir:
+        args.bench_dir.mkdir(parents=True, exist_ok=True)
+        ok = run_benchmark(args.scales, args.bench_dir, args.baseline, args.tolerance, args.update_baseline, args.seed)
+    else:
+        with tempfile.TemporaryDirectory(prefix="export_bench_") as tmp:
+            ok = run_benchmark(args.scales, Path(tmp), args.baseline, args.tolerance, args.update_baseline, args.seed)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
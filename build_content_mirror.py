@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Build a local SQLite mirror of the content tree.
+
+This script:
+1. Loads all universes, themes and chapters from the universe/theme JSON files
+2. Loads all rounds and round objects (base, correct, distractors) from the chapter files
+3. Stores them in content_mirror.sqlite with the same indexes as round_objects_table.sql
+   (round_id, theme_id, object_type, word) plus an FTS5 index on word/context
+
+The mirror is rebuilt incrementally: a source_files table keeps size, mtime and
+sha256 of every chapter file, and only rounds of changed, new or deleted chapter
+files are replaced. Universes, themes and chapters come from a handful of small
+files and are always reloaded.
+
+Example queries:
+    python build_content_mirror.py --find Meeting
+    sqlite3 content_mirror.sqlite "SELECT round_id FROM round_objects WHERE word = 'Meeting'"
+"""
+
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+import export_chapters_csv
+import export_round_objects_csv
+import export_rounds_csv
+import export_universes_csv
+import generate_themes_insert
+from export_common import (
+    CONTENT_DIR, add_jobs_argument, chapter_universe_id, discover_content_files, find_all_universe_files,
+    load_chapter_file, map_chapter_files, row_values
+)
+from export_manifest import SourceState
+
+# Paths
+OUTPUT_DB_FILE = Path("content_mirror.sqlite")
+
+# Stored in pragma user_version; a mirror with another version is rebuilt
+SCHEMA_VERSION = 2
+
+# Schema - rounds/round_objects mirror public.rounds and round_objects_table.sql.
+# JSONB and text[] columns are stored as JSON text, booleans as 0/1, timestamps as text.
+# Theme and chapter ids are not unique across theme files, so they are indexed, not keys.
+SCHEMA = """
+create table if not exists universes (
+  id text primary key,
+  uuid text,
+  name text not null,
+  description text,
+  color_primary text,
+  color_accent text,
+  background_gradient text,
+  laser_color text,
+  icon text,
+  available integer default 1,
+  language text,
+  music text,
+  particle_effect text,
+  ship_skin text,
+  meta text,
+  created_at text,
+  updated_at text
+);
+
+create table if not exists themes (
+  id text not null,
+  uuid text,
+  universe_id text,
+  universe_uuid text,
+  name text not null,
+  description text,
+  color_primary text,
+  color_accent text,
+  background_gradient text,
+  laser_color text,
+  icon text,
+  music text,
+  particle_effect text,
+  created_at text
+);
+
+create table if not exists chapters (
+  id text not null,
+  uuid text,
+  themes_uuid text,
+  themes_uuid_backup text,
+  title text,
+  description text,
+  backgroundimage text,
+  background_gradient text,
+  meta text,
+  created_at text,
+  updated_at text
+);
+
+create table if not exists rounds (
+  id text primary key,
+  uuid text,
+  chapter_id text not null,
+  chapter_uuid text,
+  level integer,
+  published integer default 1,
+  wave_duration real,
+  meta_source text,
+  meta_tags text,
+  meta_difficulty_scaling text,
+  created_at text,
+  updated_at text,
+  source_file text not null
+);
+
+create table if not exists round_objects (
+  id integer primary key,
+  round_id text not null references rounds(id) on delete cascade,
+  theme_id text not null,
+  object_type text not null check (object_type in ('base', 'correct', 'distractor')),
+  order_index integer not null default 0,
+  word text,
+  entry_type text,
+  image text,
+  visual text not null,
+  spawn_position real,
+  spawn_spread real,
+  speed real,
+  points integer,
+  hp integer,
+  pattern text,
+  collection_order integer,
+  damage integer,
+  behavior text,
+  redirect text,
+  context text,
+  sound text,
+  created_at text,
+  updated_at text,
+  constraint round_objects_unique_round_type_order unique (round_id, object_type, order_index)
+);
+
+create table if not exists source_files (
+  path text primary key,
+  size integer not null,
+  mtime_ns integer not null,
+  sha256 text not null
+);
+
+create index if not exists idx_themes_id on themes(id);
+create index if not exists idx_themes_universe_id on themes(universe_id);
+create index if not exists idx_chapters_id on chapters(id);
+create index if not exists idx_chapters_themes_uuid on chapters(themes_uuid);
+create index if not exists idx_chapters_themes_uuid_backup on chapters(themes_uuid_backup);
+create index if not exists idx_rounds_chapter_id on rounds(chapter_id);
+create index if not exists idx_rounds_source_file on rounds(source_file);
+create index if not exists idx_round_objects_round_id on round_objects(round_id);
+create index if not exists idx_round_objects_theme_id on round_objects(theme_id);
+create index if not exists idx_round_objects_type on round_objects(object_type);
+create index if not exists idx_round_objects_word on round_objects(word);
+
+-- Full text index on word/context, kept in sync by triggers
+create virtual table if not exists round_objects_fts using fts5(
+  word, context, content='round_objects', content_rowid='id'
+);
+
+create trigger if not exists round_objects_fts_insert after insert on round_objects begin
+  insert into round_objects_fts(rowid, word, context) values (new.id, new.word, new.context);
+end;
+
+create trigger if not exists round_objects_fts_delete after delete on round_objects begin
+  insert into round_objects_fts(round_objects_fts, rowid, word, context) values ('delete', old.id, old.word, old.context);
+end;
+"""
+
+
+def sqlite_value(value: Any, column_type: str) -> Any:
+    """Convert a typed row value (see COLUMN_TYPES) to what the mirror stores."""
+    if value is None:
+        return None
+    if column_type in ('jsonb', 'text[]'):
+        return json.dumps(value, ensure_ascii=False)
+    if column_type == 'boolean':
+        return 1 if value else 0
+    if column_type in ('text', 'timestamptz'):
+        return str(value)
+    return value
+
+
+def insert_rows(conn: sqlite3.Connection, table: str, column_types: Dict[str, str], rows: List[Any],
+                extra: Dict[str, Any] = None) -> int:
+    """Insert typed rows (dicts or row tuples) into a mirror table and return the number of rows inserted."""
+    extra = extra or {}
+    columns = list(column_types)
+    placeholders = ', '.join('?' for _ in columns + list(extra))
+    sql = f"insert into {table} ({', '.join(columns + list(extra))}) values ({placeholders})"
+
+    conn.executemany(sql, (
+        [sqlite_value(value, column_type) for value, column_type in zip(row_values(row, columns), column_types.values())]
+        + list(extra.values())
+        for row in rows
+    ))
+    return len(rows)
+
+
+def extract_mirror_rows(chapter_file: Path) -> Tuple[List[Dict[str, Any]], List[Any]]:
+    """Parse a chapter file once and return its (round rows, round object rows) (process pool worker)."""
+    loaded = load_chapter_file(chapter_file)
+    if not loaded:
+        return [], []
+    items, created_at = loaded
+    universe_id = chapter_universe_id(chapter_file)
+    return (
+        list(export_rounds_csv.extract_round_rows(items, created_at, universe_id)),
+        list(export_round_objects_csv.extract_round_object_rows(items, created_at, universe_id)),
+    )
+
+
+def load_metadata_tables(conn: sqlite3.Connection, theme_files: List[Path]) -> Dict[str, int]:
+    """Reload universes, themes and chapters from scratch."""
+    conn.execute("delete from universes")
+    conn.execute("delete from themes")
+    conn.execute("delete from chapters")
+
+    universes = [export_universes_csv.process_universe_file(path) for path in find_all_universe_files()]
+    counts = {'universes': insert_rows(conn, 'universes', export_universes_csv.COLUMN_TYPES, [u for u in universes if u])}
+
+    theme_rows = []
+    chapter_rows = []
+    for theme_file in theme_files:
+        theme_data = generate_themes_insert.load_theme_file(theme_file)
+        if not theme_data or not theme_data.get('id'):
+            continue
+        universe_id = theme_file.parent.name
+        theme_rows.append(generate_themes_insert.extract_theme_row(theme_data, universe_id, universe_id))
+        chapter_rows.extend(export_chapters_csv.extract_chapter_rows(theme_data, universe_id))
+
+    counts['themes'] = insert_rows(conn, 'themes', generate_themes_insert.COLUMN_TYPES, theme_rows)
+    counts['chapters'] = insert_rows(conn, 'chapters', export_chapters_csv.COLUMN_TYPES, chapter_rows)
+    return counts
+
+
+def sync_chapter_files(conn: sqlite3.Connection, chapter_files: List[Path], jobs: int = 1) -> Tuple[int, int]:
+    """Replace the rounds of changed/new chapter files and drop those of deleted files.
+
+    Returns (number of chapter files re-parsed, number of chapter files removed).
+    """
+    known = {
+        path: {'size': size, 'mtime_ns': mtime_ns, 'sha256': sha256}
+        for path, size, mtime_ns, sha256 in conn.execute("select path, size, mtime_ns, sha256 from source_files")
+    }
+
+    current = {chapter_file.as_posix(): chapter_file for chapter_file in chapter_files}
+    removed = [path for path in known if path not in current]
+
+    states = {}
+    changed = []
+    for key, chapter_file in current.items():
+        state = SourceState(chapter_file)
+        states[key] = state
+        if not state.matches(known.get(key)):
+            changed.append(chapter_file)
+
+    for path in removed + [chapter_file.as_posix() for chapter_file in changed]:
+        # round_objects (and their FTS entries) go with the rounds via on delete cascade
+        conn.execute("delete from rounds where source_file = ?", (path,))
+        conn.execute("delete from source_files where path = ?", (path,))
+
+    for chapter_file, (round_rows, object_rows) in zip(changed, map_chapter_files(extract_mirror_rows, changed, jobs)):
+        key = chapter_file.as_posix()
+        state = states[key]
+        insert_rows(conn, 'rounds', export_rounds_csv.COLUMN_TYPES, round_rows, {'source_file': key})
+        insert_rows(conn, 'round_objects', export_round_objects_csv.COLUMN_TYPES, object_rows)
+        conn.execute(
+            "insert into source_files (path, size, mtime_ns, sha256) values (?, ?, ?, ?)",
+            (key, state.size, state.mtime_ns, state.sha256)
+        )
+
+    return len(changed), len(removed)
+
+
+def connect(db_file: Path = OUTPUT_DB_FILE) -> sqlite3.Connection:
+    """Open the mirror database and make sure the schema exists."""
+    conn = sqlite3.connect(db_file)
+    conn.execute("pragma foreign_keys = on")
+    conn.executescript(SCHEMA)
+    conn.execute(f"pragma user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def schema_version(db_file: Path) -> int:
+    """Return the schema version an existing mirror was built with."""
+    conn = sqlite3.connect(db_file)
+    try:
+        return conn.execute("pragma user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def find_rounds_with_word(conn: sqlite3.Connection, term: str) -> List[Tuple[str, str, str, str]]:
+    """Full text search on word/context; returns (round_id, object_type, word, context) rows."""
+    return conn.execute(
+        """
+        select o.round_id, o.object_type, o.word, o.context
+        from round_objects_fts f
+        join round_objects o on o.id = f.rowid
+        where round_objects_fts match ?
+        order by o.round_id, o.object_type, o.order_index
+        """,
+        (term,)
+    ).fetchall()
+
+
+def build_mirror(db_file: Path = OUTPUT_DB_FILE, jobs: int = 1, rebuild: bool = False) -> None:
+    """Build or incrementally update the SQLite content mirror."""
+    theme_files, chapter_files = discover_content_files()
+
+    if not chapter_files:
+        print(f"No chapter files found in {CONTENT_DIR}")
+        return
+
+    print(f"Found {len(theme_files)} theme files and {len(chapter_files)} chapter files")
+
+    if db_file.exists() and not rebuild and schema_version(db_file) != SCHEMA_VERSION:
+        print(f"{db_file} was built with an older schema, rebuilding it")
+        rebuild = True
+
+    if rebuild and db_file.exists():
+        db_file.unlink()
+
+    conn = connect(db_file)
+    try:
+        with conn:
+            counts = load_metadata_tables(conn, theme_files)
+            reparsed, removed = sync_chapter_files(conn, chapter_files, jobs)
+        conn.execute("pragma optimize")
+
+        counts['rounds'] = conn.execute("select count(*) from rounds").fetchone()[0]
+        counts['round_objects'] = conn.execute("select count(*) from round_objects").fetchone()[0]
+    finally:
+        conn.close()
+
+    print(f"\n✅ SQLite mirror up to date: {db_file}")
+    print(f"   {reparsed} chapter files re-parsed, {removed} removed")
+    for table, count in counts.items():
+        print(f"   {table}: {count}")
+
+
+def main() -> None:
+    """Parse command line arguments and build the mirror (or search it)."""
+    parser = argparse.ArgumentParser(description="Build a local SQLite mirror of public/content/themes.")
+    parser.add_argument('--db', type=Path, default=OUTPUT_DB_FILE, help=f"SQLite file (default: {OUTPUT_DB_FILE})")
+    parser.add_argument('--rebuild', action='store_true', help="Delete the mirror and rebuild it from scratch")
+    parser.add_argument('--find', metavar='TERM', help="Search word/context in an existing mirror instead of building")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    if args.find:
+        conn = connect(args.db)
+        try:
+            for round_id, object_type, word, context in find_rounds_with_word(conn, args.find):
+                print(f"{round_id}\t{object_type}\t{word}\t{context or ''}")
+        finally:
+            conn.close()
+        return
+
+    build_mirror(args.db, jobs=args.jobs, rebuild=args.rebuild)
+
+
+if __name__ == "__main__":
+    main()
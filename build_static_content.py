@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Build minified, precompressed copies of the content JSON for static serving.
+
+This script:
+1. Finds every JSON file the client fetches from /content/themes (JSONLoader.ts):
+   universe.*.json, {universe}/themes.*.json and all chapter files in
+   {universe}/{theme}/ (including level files like Chapter.1.json)
+2. Writes a minified copy of each (no indentation, no whitespace between tokens,
+   key order unchanged) to the same relative path in the output directory
+3. Writes precompressed .gz and .br siblings of every minified file, for static
+   servers that serve them by Accept-Encoding (gzip_static / brotli_static)
+4. Writes a manifest (static-manifest.json) with the source, minified and
+   compressed sizes and the sha256 of every minified file
+
+The human-readable sources in public/content/themes are never modified. The
+default output directory is where vite build copies public/, so run it after
+npm run build and the client loads the minified files from the same URLs.
+
+The build is incremental: files whose source is unchanged since the last build
+(see export_manifest.SourceState) keep their outputs, outputs of deleted
+sources are removed. Brotli requires the brotli package (pip install brotli);
+without it only .gz siblings are written.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+from functools import partial
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from export_common import CONTENT_DIR, add_jobs_argument, map_chapter_files
+from export_manifest import SourceState
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Paths
+OUTPUT_DIR = Path("dist/content/themes")
+MANIFEST_FILE = "static-manifest.json"
+
+MANIFEST_VERSION = 1
+
+# Highest levels: compression runs once per build, the files are served many times
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Precompressed sibling suffixes
+PRECOMPRESSED_SUFFIXES = {
+    'gzip': '.gz',
+    'brotli': '.br',
+}
+
+
+def find_static_files() -> List[Path]:
+    """Find all universe, theme and chapter JSON files served from the content directory."""
+    if not CONTENT_DIR.exists():
+        print(f"Content directory not found: {CONTENT_DIR}")
+        return []
+    return (
+        sorted(CONTENT_DIR.glob("universe.*.json"))
+        + sorted(CONTENT_DIR.glob("*/themes.*.json"))
+        + sorted(CONTENT_DIR.glob("*/*/*.json"))
+    )
+
+
+def available_codecs() -> List[str]:
+    """Return the codecs of the precompressed siblings that can be written."""
+    return [codec for codec in PRECOMPRESSED_SUFFIXES if codec != 'brotli' or brotli is not None]
+
+
+def minify_json(data: Any) -> bytes:
+    """Return the minified UTF-8 JSON of the data."""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def compress(codec: str, data: bytes) -> bytes:
+    """Compress data with a codec (gzip with mtime 0, so unchanged content gives identical files)."""
+    if codec == 'gzip':
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    return brotli.compress(data, quality=BROTLI_QUALITY)
+
+
+def output_files(output_file: Path, codecs: List[str]) -> List[Path]:
+    """Return a minified output file and its precompressed siblings."""
+    return [output_file] + [
+        output_file.with_name(output_file.name + PRECOMPRESSED_SUFFIXES[codec]) for codec in codecs
+    ]
+
+
+def build_file(output_dir: Path, codecs: List[str], source_file: Path) -> Optional[Dict[str, Any]]:
+    """Write the minified copy and compressed siblings of one source file and return its manifest entry."""
+    source = SourceState(source_file)
+    try:
+        # utf-8-sig: a few sources start with a BOM, which fetch() strips as well
+        with open(source_file, 'r', encoding='utf-8-sig') as f:
+            data = json.load(f)
+    except Exception as e:
+        print(f"Error reading {source_file}: {e}")
+        return None
+
+    minified = minify_json(data)
+    output_file = output_dir / source_file.relative_to(CONTENT_DIR)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_bytes(minified)
+
+    entry = {
+        'source': {'size': source.size, 'mtime_ns': source.mtime_ns, 'sha256': source.sha256},
+        'size': len(minified),
+        'sha256': hashlib.sha256(minified).hexdigest(),
+    }
+    for codec, sibling in zip(codecs, output_files(output_file, codecs)[1:]):
+        compressed = compress(codec, minified)
+        sibling.write_bytes(compressed)
+        entry[f'{codec}_size'] = len(compressed)
+    return entry
+
+
+def load_manifest(output_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """Return the file entries of the previous build, or {} if there is no usable manifest."""
+    manifest_file = output_dir / MANIFEST_FILE
+    if not manifest_file.exists():
+        return {}
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except Exception as e:
+        print(f"Warning: Ignoring unreadable manifest {manifest_file}: {e}")
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('files', {})
+
+
+def is_current(output_dir: Path, relative: str, entry: Optional[Dict[str, Any]], codecs: List[str]) -> bool:
+    """Check whether the outputs of a source file from the previous build can be kept."""
+    if not entry or not SourceState(CONTENT_DIR / relative).matches(entry['source']):
+        return False
+    if any(f'{codec}_size' not in entry for codec in codecs):
+        return False
+    output_file = output_dir / relative
+    # vite build copies the pretty sources over the minified files
+    if not output_file.exists() or output_file.stat().st_size != entry['size']:
+        return False
+    return all(path.exists() for path in output_files(output_file, codecs)[1:])
+
+
+def remove_outputs(output_dir: Path, relative: str) -> None:
+    """Remove the minified copy and all compressed siblings of a deleted source file."""
+    for path in output_files(output_dir / relative, list(PRECOMPRESSED_SUFFIXES)):
+        if path.exists():
+            path.unlink()
+
+
+def manifest_totals(files: Dict[str, Dict[str, Any]], codecs: List[str]) -> Dict[str, int]:
+    """Sum the source, minified and compressed sizes of all files."""
+    totals = {
+        'files': len(files),
+        'source_size': sum(entry['source']['size'] for entry in files.values()),
+        'size': sum(entry['size'] for entry in files.values()),
+    }
+    for codec in codecs:
+        totals[f'{codec}_size'] = sum(entry[f'{codec}_size'] for entry in files.values())
+    return totals
+
+
+def build_static_content(output_dir: Path, jobs: int = 1, full: bool = False) -> Optional[Dict[str, int]]:
+    """Build the minified and precompressed content and its manifest; return the manifest totals."""
+    codecs = available_codecs()
+    if 'brotli' not in codecs:
+        print("brotli is not installed, writing only .gz siblings: pip install brotli")
+
+    source_files = find_static_files()
+    if not source_files:
+        print("No content files found!")
+        return None
+
+    previous = {} if full else load_manifest(output_dir)
+    files = {}
+    changed = []
+    for source_file in source_files:
+        relative = source_file.relative_to(CONTENT_DIR).as_posix()
+        if is_current(output_dir, relative, previous.get(relative), codecs):
+            files[relative] = previous[relative]
+        else:
+            changed.append(source_file)
+
+    print(f"Building {len(changed)} of {len(source_files)} files ({len(source_files) - len(changed)} unchanged)")
+    worker = partial(build_file, output_dir, codecs)
+    for source_file, entry in zip(changed, map_chapter_files(worker, changed, jobs)):
+        if entry:
+            files[source_file.relative_to(CONTENT_DIR).as_posix()] = entry
+
+    removed = [relative for relative in previous if not (CONTENT_DIR / relative).exists()]
+    for relative in removed:
+        remove_outputs(output_dir, relative)
+
+    files = dict(sorted(files.items()))
+    totals = manifest_totals(files, codecs)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'totals': totals, 'files': files}, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+    if removed:
+        print(f"Removed the outputs of {len(removed)} deleted files")
+    return totals
+
+
+def main() -> None:
+    """Parse command line arguments and build the static content."""
+    parser = argparse.ArgumentParser(
+        description="Write minified, precompressed (.gz/.br) copies of the content JSON and a manifest."
+    )
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR,
+                        help=f"Output directory mirroring {CONTENT_DIR} (default: {OUTPUT_DIR})")
+    parser.add_argument('--full', action='store_true',
+                        help="Rebuild all files instead of only those changed since the last build")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    totals = build_static_content(args.output_dir, args.jobs, args.full)
+    if not totals:
+        return
+
+    def ratio(size: int) -> str:
+        return f"{totals['source_size'] / size:.1f}x" if size else "-"
+
+    print(f"\n✅ Built {totals['files']} files in {args.output_dir}")
+    print(f"   Sources:  {totals['source_size']:,} bytes")
+    print(f"   Minified: {totals['size']:,} bytes ({ratio(totals['size'])} smaller)")
+    for codec in PRECOMPRESSED_SUFFIXES:
+        if f'{codec}_size' in totals:
+            print(f"   {codec}: {totals[f'{codec}_size']:,} bytes ({ratio(totals[f'{codec}_size'])} smaller)")
+    print(f"   Manifest: {args.output_dir / MANIFEST_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+-- Table for storing one precomputed, client-ready payload per chapter
+-- Opening a chapter is a single primary key fetch instead of chapters + rounds + items
+-- queries and the client-side reshaping in DBToItemTransformer.ts
+
+create table public.chapter_payloads (
+  -- Primary key: same value as chapters.uuid and rounds.chapter_uuid (see content_uuids.py)
+  chapter_uuid uuid primary key,
+
+  -- Human-readable IDs for lookups by URL
+  chapter_id text not null,   -- e.g., "wm_2002"
+  theme_id text not null,     -- e.g., "wm"
+  universe_id text not null,  -- e.g., "fussball"
+
+  -- Fully nested Item[] of the chapter (rounds with base/correct/distractors),
+  -- with roundUuid on every round and uuid on every object
+  payload jsonb not null,
+
+  -- sha256 of the canonical payload JSON (sorted keys, no whitespace);
+  -- changes exactly when the payload changes, usable as a cache key / ETag
+  content_hash text not null,
+
+  -- Sizes for quick overviews without unpacking the payload
+  round_count integer not null default 0,
+  item_count integer not null default 0,
+
+  -- Timestamps
+  created_at timestamp with time zone default timezone('utc', now()),
+  updated_at timestamp with time zone default timezone('utc', now())
+);
+
+-- Indexes
+create index idx_chapter_payloads_theme_chapter on public.chapter_payloads(theme_id, chapter_id);
+
+-- Comments
+comment on table public.chapter_payloads is 'Precomputed client-ready Item[] per chapter, generated by export_chapter_payloads.py';
+comment on column public.chapter_payloads.chapter_uuid is 'Chapter UUID (= chapters.uuid, rounds.chapter_uuid)';
+comment on column public.chapter_payloads.payload is 'Nested Item[] JSONB with roundUuid and object uuids';
+comment on column public.chapter_payloads.content_hash is 'sha256 of the canonical payload JSON';
+
+-- Load (after export_chapter_payloads.py):
+--   \copy public.chapter_payloads (chapter_uuid, chapter_id, theme_id, universe_id, payload, content_hash, round_count, item_count, created_at, updated_at) from 'chapter_payloads_export.csv' with (format csv, header true)
+-- or: python load_postgres.py --dsn ... (loads it together with the other exports)
+--
+-- Fetch a chapter:
+--   select payload, content_hash from public.chapter_payloads where chapter_uuid = $1;
+--   select payload, content_hash from public.chapter_payloads where theme_id = $1 and chapter_id = $2;
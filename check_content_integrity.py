@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Offline integrity report for the content, without a database.
+
+This script runs the checks of check_missing_items.sql and a few more in one
+pass over either
+- the chapter JSON files in public/content/themes/ (--source content, default;
+  chapters declared in a themes.*.json without a chapter file count as empty), or
+- the CSV exports (--source csv: rounds_export.csv and items_export.csv, plus
+  chapters_export.csv, themes_export.csv and universes_export.csv for names and
+  chapters without rounds; plain or .gz/.zst compressed)
+
+Checks (severity):
+- unreadable_chapter (critical): chapter file cannot be parsed
+- round_without_items (critical): round has no items at all
+- orphaned_items (error): items whose round is not in rounds_export.csv
+- duplicate_round_id (error): round id used more than once
+- round_without_base / round_without_correct (error)
+- empty_entry (error): correct/distractor with neither word nor image (the client drops it)
+- round_without_distractors (warning)
+- chapter_few_items (warning): chapter with fewer than --min-chapter-items items
+- empty_context (warning): correct/distractor without context
+- inconsistent_item_counts (notice): items per round in a chapter vary by more
+  than 5 (max - min) or have a standard deviation above 3
+
+Prints a text report or, with --format json, a machine-readable one (summary,
+per-check counts and every issue). Exits with status 1 if an issue of
+--fail-on severity or worse is found, so it can run in content CI.
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import statistics
+import sys
+import time
+from collections import Counter, namedtuple
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+import export_chapters_csv
+import export_items_csv
+import export_rounds_csv
+import export_universes_csv
+import generate_themes_insert
+from compressed_io import find_input_file, open_input
+from export_common import (
+    CONTENT_DIR, add_jobs_argument, chapter_universe_id, discover_content_files, load_chapter_file, map_chapter_files
+)
+
+# Severities, worst first
+SEVERITIES = ['critical', 'error', 'warning', 'notice']
+
+# Check id -> (severity, description)
+CHECKS = {
+    'unreadable_chapter': ('critical', "Chapter file cannot be parsed"),
+    'round_without_items': ('critical', "Round has no items"),
+    'orphaned_items': ('error', "Items reference a round that is not in the rounds export"),
+    'duplicate_round_id': ('error', "Round id is used more than once"),
+    'round_without_base': ('error', "Round has no base item"),
+    'round_without_correct': ('error', "Round has no correct entries"),
+    'empty_entry': ('error', "Correct/distractor entry has neither word nor image"),
+    'round_without_distractors': ('warning', "Round has no distractors"),
+    'chapter_few_items': ('warning', "Chapter has too few items"),
+    'empty_context': ('warning', "Correct/distractor entry has no context"),
+    'inconsistent_item_counts': ('notice', "Items per round vary strongly within the chapter"),
+}
+
+DEFAULT_MIN_CHAPTER_ITEMS = 3
+
+# Same thresholds as check_missing_items.sql (section 4)
+MAX_ITEM_COUNT_SPREAD = 5
+MAX_ITEM_COUNT_STDDEV = 3
+
+SEVERITY_ICONS = {'critical': '🔴', 'error': '🟠', 'warning': '🟡', 'notice': '🔵'}
+
+# One object of a round; index is its position in the correct/distractors array
+ObjectRecord = namedtuple('ObjectRecord', ['object_type', 'index', 'word', 'image', 'context'])
+RoundRecord = namedtuple('RoundRecord', ['round_id', 'objects'])
+# rounds is None for an unreadable chapter file
+ChapterRecord = namedtuple('ChapterRecord', ['universe', 'theme', 'chapter', 'source', 'rounds'])
+
+
+class IntegrityReport:
+    """Runs the checks on chapter records as they stream in and collects the issues."""
+
+    def __init__(self, min_chapter_items: int = DEFAULT_MIN_CHAPTER_ITEMS):
+        self.min_chapter_items = min_chapter_items
+        self.issues = []
+        self.universes = set()
+        self.themes = set()
+        self.chapters = 0
+        self.rounds = 0
+        self.items = 0
+        self.items_per_round = Counter()
+        self._round_ids = Counter()
+
+    def add_issue(self, check: str, chapter: ChapterRecord, round_id: Optional[str] = None, **details: Any) -> None:
+        """Record one issue of a check."""
+        issue = {
+            'check': check,
+            'severity': CHECKS[check][0],
+            'universe': chapter.universe,
+            'theme': chapter.theme,
+            'chapter': chapter.chapter,
+            'source': chapter.source,
+        }
+        if round_id is not None:
+            issue['round_id'] = round_id
+        issue.update(details)
+        self.issues.append(issue)
+
+    def add_chapter(self, chapter: ChapterRecord) -> None:
+        """Check one chapter and its rounds."""
+        self.chapters += 1
+        if chapter.universe:
+            self.universes.add(chapter.universe)
+        if chapter.theme:
+            self.themes.add((chapter.universe, chapter.theme))
+
+        if chapter.rounds is None:
+            self.add_issue('unreadable_chapter', chapter)
+            return
+
+        item_counts = []
+        for round_record in chapter.rounds:
+            item_counts.append(self.check_round(chapter, round_record))
+
+        chapter_items = sum(item_counts)
+        if chapter_items < self.min_chapter_items:
+            self.add_issue('chapter_few_items', chapter, items=chapter_items, rounds=len(item_counts))
+
+        if len(item_counts) > 1:
+            spread = max(item_counts) - min(item_counts)
+            stddev = statistics.stdev(item_counts)
+            if spread > MAX_ITEM_COUNT_SPREAD or stddev > MAX_ITEM_COUNT_STDDEV:
+                self.add_issue(
+                    'inconsistent_item_counts', chapter, min_items=min(item_counts), max_items=max(item_counts),
+                    avg_items=round(statistics.mean(item_counts), 2), stddev_items=round(stddev, 2)
+                )
+
+    def check_round(self, chapter: ChapterRecord, round_record: RoundRecord) -> int:
+        """Check one round and return its item count."""
+        round_id = round_record.round_id
+        objects = round_record.objects
+        self.rounds += 1
+        self.items += len(objects)
+        self.items_per_round[len(objects)] += 1
+
+        self._round_ids[round_id] += 1
+        if self._round_ids[round_id] == 2:
+            self.add_issue('duplicate_round_id', chapter, round_id)
+
+        if not objects:
+            self.add_issue('round_without_items', chapter, round_id)
+            return 0
+
+        types = Counter(obj.object_type for obj in objects)
+        if not types['base']:
+            self.add_issue('round_without_base', chapter, round_id)
+        if not types['correct']:
+            self.add_issue('round_without_correct', chapter, round_id)
+        if not types['distractor']:
+            self.add_issue('round_without_distractors', chapter, round_id)
+
+        for obj in objects:
+            if obj.object_type == 'base':
+                continue
+            if not obj.word and not obj.image:
+                self.add_issue('empty_entry', chapter, round_id, object_type=obj.object_type, index=obj.index)
+            if not obj.context:
+                self.add_issue(
+                    'empty_context', chapter, round_id, object_type=obj.object_type, index=obj.index, word=obj.word
+                )
+        return len(objects)
+
+    def check_counts(self) -> Dict[str, int]:
+        """Return the number of issues per check (every check, including those without issues)."""
+        counts = Counter(issue['check'] for issue in self.issues)
+        return {check: counts[check] for check in CHECKS}
+
+    def failed(self, fail_on: str) -> bool:
+        """Check whether an issue of severity fail_on or worse was found."""
+        failing = set(SEVERITIES[:SEVERITIES.index(fail_on) + 1])
+        return any(issue['severity'] in failing for issue in self.issues)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the totals (check_missing_items.sql sections 7 and 8)."""
+        return {
+            'universes': len(self.universes),
+            'themes': len(self.themes),
+            'chapters': self.chapters,
+            'rounds': self.rounds,
+            'items': self.items,
+            'items_per_round': {str(count): rounds for count, rounds in sorted(self.items_per_round.items())},
+        }
+
+    def to_dict(self, source: str, seconds: float) -> Dict[str, Any]:
+        """Return the machine-readable report."""
+        counts = self.check_counts()
+        return {
+            'source': source,
+            'seconds': round(seconds, 3),
+            'summary': self.summary(),
+            'checks': {
+                check: {'severity': severity, 'description': description, 'count': counts[check]}
+                for check, (severity, description) in CHECKS.items()
+            },
+            'issues': self.issues,
+        }
+
+
+def object_records(item: Dict[str, Any]) -> List[ObjectRecord]:
+    """Return the base/correct/distractor objects of a round from the chapter JSON."""
+    objects = []
+    base = item.get('base')
+    if base:
+        objects.append(ObjectRecord('base', 0, base.get('word'), base.get('image'), None))
+    for object_type, key in (('correct', 'correct'), ('distractor', 'distractors')):
+        entries = item.get(key, [])
+        if not isinstance(entries, list):
+            continue
+        for idx, obj in enumerate(entries):
+            if not isinstance(obj, dict):
+                continue
+            entry = obj.get('entry') or {}
+            objects.append(ObjectRecord(object_type, idx, entry.get('word'), entry.get('image'), obj.get('context')))
+    return objects
+
+
+def scan_chapter_file(file_path: Path) -> ChapterRecord:
+    """Parse a chapter file into a chapter record (process pool worker)."""
+    universe = chapter_universe_id(file_path)
+    loaded = load_chapter_file(file_path)
+    if not loaded:
+        return ChapterRecord(universe, file_path.parent.name, file_path.stem, file_path.as_posix(), None)
+    items, _ = loaded
+    rounds = [
+        RoundRecord(item.get('id', ''), object_records(item))
+        for item in items
+        if isinstance(item, dict)
+    ]
+    return ChapterRecord(universe, file_path.parent.name, file_path.stem, file_path.as_posix(), rounds)
+
+
+def declared_chapters_without_file(theme_files: List[Path], chapter_files: List[Path]) -> Iterator[ChapterRecord]:
+    """Yield an empty chapter record for every chapter of a theme file that has no chapter file.
+
+    The exports still create these chapters (export_chapters_csv.py), with no rounds.
+    """
+    existing = set(chapter_files)
+    for theme_file in theme_files:
+        theme_data = generate_themes_insert.load_theme_file(theme_file)
+        if not theme_data or not theme_data.get('id'):
+            continue
+        universe = theme_file.parent.name
+        for chapter_row in export_chapters_csv.extract_chapter_rows(theme_data, universe):
+            chapter_file = theme_file.parent / theme_data['id'] / f"{chapter_row['id']}.json"
+            if chapter_file not in existing:
+                yield ChapterRecord(universe, theme_data['id'], chapter_row['id'], theme_file.as_posix(), [])
+
+
+def iter_content_chapters(jobs: int = 1) -> Iterator[ChapterRecord]:
+    """Stream chapter records from the content tree, including declared chapters without a file."""
+    theme_files, chapter_files = discover_content_files()
+    yield from map_chapter_files(scan_chapter_file, chapter_files, jobs)
+    yield from declared_chapters_without_file(theme_files, chapter_files)
+
+
+def read_csv_rows(csv_file: Path) -> Iterator[Dict[str, str]]:
+    """Stream the rows of a (plain or compressed) CSV export (nothing if the file does not exist)."""
+    csv_file = find_input_file(csv_file)
+    if not csv_file.exists():
+        return
+    with open_input(csv_file) as f:
+        yield from csv.DictReader(f)
+
+
+def iter_csv_chapters(input_dir: Path, report: IntegrityReport) -> Iterator[ChapterRecord]:
+    """Stream chapter records from the CSV exports.
+
+    Items are grouped by round (by round_uuid if the export has it, else round_id),
+    rounds by chapter (chapter_uuid, else chapter_id). Items whose round is missing
+    are reported as orphaned_items.
+    """
+    rounds_csv = find_input_file(input_dir / export_rounds_csv.OUTPUT_CSV_FILE.name)
+    items_csv = find_input_file(input_dir / export_items_csv.OUTPUT_CSV_FILE.name)
+
+    # Names for chapter/theme/universe labels, if the small exports are there
+    universe_names = {
+        row['uuid']: row['id'] for row in read_csv_rows(input_dir / export_universes_csv.OUTPUT_CSV_FILE.name)
+    }
+    theme_names = {}
+    for row in read_csv_rows(input_dir / generate_themes_insert.OUTPUT_CSV_FILE.name):
+        universe_key = row.get('universe_uuid') or row.get('universe_id', '')
+        theme_names[row.get('uuid') or row['id']] = (universe_names.get(universe_key, universe_key), row['id'])
+    chapter_labels = {}
+    for row in read_csv_rows(input_dir / export_chapters_csv.OUTPUT_CSV_FILE.name):
+        theme_key = row.get('themes_uuid', '')
+        universe, theme = theme_names.get(theme_key, ('', row.get('themes_uuid_backup') or theme_key))
+        chapter_labels[row.get('uuid') or row['id']] = (universe, theme, row['id'])
+
+    objects_by_round = {}
+    counters = {}
+    for row in read_csv_rows(items_csv):
+        round_key = row.get('round_uuid') or row['round_id']
+        object_type = row.get('object_type', '')
+        index_key = (round_key, object_type)
+        index = counters.get(index_key, 0)
+        counters[index_key] = index + 1
+        objects_by_round.setdefault(round_key, []).append(
+            ObjectRecord(object_type, index, row.get('word'), row.get('image'), row.get('context'))
+        )
+
+    chapters = {}
+    for row in read_csv_rows(rounds_csv):
+        chapter_key = row.get('chapter_uuid') or row['chapter_id']
+        round_key = row.get('uuid') or row['id']
+        chapters.setdefault(chapter_key, []).append(RoundRecord(row['id'], objects_by_round.pop(round_key, [])))
+        chapter_labels.setdefault(chapter_key, ('', '', row['chapter_id']))
+
+    source = rounds_csv.as_posix()
+    for chapter_key, (universe, theme, chapter_id) in chapter_labels.items():
+        yield ChapterRecord(universe, theme, chapter_id, source, chapters.get(chapter_key, []))
+
+    for round_key, objects in objects_by_round.items():
+        report.add_issue(
+            'orphaned_items', ChapterRecord('', '', '', items_csv.as_posix(), None), round_key, items=len(objects)
+        )
+
+
+def print_report(report: IntegrityReport, data: Dict[str, Any], limit: int) -> None:
+    """Print the human-readable report."""
+    summary = data['summary']
+    print(f"Checked {summary['chapters']} chapters, {summary['rounds']} rounds, {summary['items']} items "
+          f"({summary['universes']} universes, {summary['themes']} themes) in {data['seconds']:.2f}s")
+    print("Items per round: " + ', '.join(f"{count}: {rounds}" for count, rounds in summary['items_per_round'].items()))
+    print()
+
+    for check, info in data['checks'].items():
+        if not info['count']:
+            continue
+        print(f"{SEVERITY_ICONS[info['severity']]} {check} ({info['severity']}): {info['count']} - {info['description']}")
+        shown = [issue for issue in report.issues if issue['check'] == check][:limit]
+        for issue in shown:
+            location = '/'.join(part for part in (issue['universe'], issue['theme'], issue['chapter']) if part)
+            extra = {key: value for key, value in issue.items()
+                     if key not in ('check', 'severity', 'universe', 'theme', 'chapter', 'source')}
+            print(f"     {location or issue['source']} {' '.join(f'{key}={value}' for key, value in extra.items())}")
+        if info['count'] > len(shown):
+            print(f"     ... {info['count'] - len(shown)} more")
+
+    if not report.issues:
+        print("✅ No integrity issues found")
+
+
+def check_integrity(
+    source: str = 'content',
+    input_dir: Path = Path('.'),
+    jobs: int = 1,
+    min_chapter_items: int = DEFAULT_MIN_CHAPTER_ITEMS,
+) -> Optional[Tuple[IntegrityReport, Dict[str, Any]]]:
+    """Run all checks and return the report and its data (None if there is nothing to check)."""
+    report = IntegrityReport(min_chapter_items)
+    started = time.perf_counter()
+
+    if source == 'content':
+        if not CONTENT_DIR.exists():
+            print(f"Content directory not found: {CONTENT_DIR}", file=sys.stderr)
+            return None
+        chapters = iter_content_chapters(jobs)
+        label = CONTENT_DIR.as_posix()
+    else:
+        with contextlib.redirect_stdout(sys.stderr):
+            rounds_csv = find_input_file(input_dir / export_rounds_csv.OUTPUT_CSV_FILE.name)
+        if not rounds_csv.exists():
+            print(f"Error: Input file not found: {rounds_csv}", file=sys.stderr)
+            return None
+        chapters = iter_csv_chapters(input_dir, report)
+        label = input_dir.as_posix()
+
+    # Progress and read errors go to stderr, so stdout carries only the report
+    with contextlib.redirect_stdout(sys.stderr):
+        for chapter in chapters:
+            report.add_chapter(chapter)
+
+    return report, report.to_dict(label, time.perf_counter() - started)
+
+
+def main() -> None:
+    """Parse command line arguments, run the checks and exit non-zero on failures."""
+    parser = argparse.ArgumentParser(description="Check content integrity offline (content tree or CSV exports).")
+    parser.add_argument('--source', choices=['content', 'csv'], default='content',
+                        help=f"Check the chapter files in {CONTENT_DIR} or the CSV exports (default: content)")
+    parser.add_argument('--input-dir', type=Path, default=Path('.'),
+                        help="Directory with the CSV exports for --source csv (default: .)")
+    parser.add_argument('--format', choices=['text', 'json'], default='text', dest='report_format',
+                        help="Report format (default: text)")
+    parser.add_argument('--output', '-o', type=Path, help="Write the report to this file instead of stdout")
+    parser.add_argument('--min-chapter-items', type=int, default=DEFAULT_MIN_CHAPTER_ITEMS,
+                        help=f"Minimum items per chapter (default: {DEFAULT_MIN_CHAPTER_ITEMS})")
+    parser.add_argument('--fail-on', choices=SEVERITIES + ['never'], default='error',
+                        help="Exit with status 1 if an issue of this severity or worse is found (default: error)")
+    parser.add_argument('--limit', type=int, default=10, help="Issues shown per check in the text report (default: 10)")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    result = check_integrity(args.source, args.input_dir, args.jobs, args.min_chapter_items)
+    if result is None:
+        sys.exit(2)
+    report, data = result
+
+    if args.report_format == 'json':
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+        if args.output:
+            args.output.write_text(text + '\n', encoding='utf-8')
+        else:
+            print(text)
+    elif args.output:
+        with open(args.output, 'w', encoding='utf-8') as f, contextlib.redirect_stdout(f):
+            print_report(report, data, args.limit)
+    else:
+        print_report(report, data, args.limit)
+
+    if args.fail_on != 'never' and report.failed(args.fail_on):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 -- 🔍 CHECK MISSING ITEMS SCRIPT
 -- Dieses Script hilft dabei, Chapters zu finden, bei denen Items fehlen oder verloren gegangen sind
+-- Ohne Datenbank (Content-Dateien oder CSV-Exporte, z.B. in der CI):
+--   python check_content_integrity.py [--source csv] [--format json]
 
 -- ============================================================================
 -- 1. CHAPTERS MIT WENIGER ALS 3 ITEMS (verdächtig!)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Streaming gzip/zstd compression for the export files.
+
+This module:
+1. Maps --compress gzip|zstd to the output file suffix (.gz / .zst), e.g.
+   items_export.csv.gz or rounds_export.pgcopy.zst
+2. Opens output files so that rows are compressed while they are written
+   (no uncompressed intermediate file)
+3. Opens input files by their suffix, so the loader and the reverse importer
+   read compressed and plain exports alike, and finds the compressed sibling
+   of an expected export file (rounds_export.csv -> rounds_export.csv.gz); if
+   several variants exist, the most recently written one is used
+
+zstd requires the zstandard package (pip install zstandard); gzip uses the
+standard library.
+"""
+
+import argparse
+import gzip
+import io
+from pathlib import Path
+from typing import IO, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Compression codec -> file suffix
+COMPRESSION_SUFFIXES = {
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+COMPRESSIONS = list(COMPRESSION_SUFFIXES)
+
+# Fast levels: the exports are rewritten nightly, the ratio barely improves beyond these
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def add_compress_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the shared --compress option to an exporter's argument parser."""
+    parser.add_argument(
+        '--compress', choices=COMPRESSIONS, default=None,
+        help="Compress the output while writing it: gzip (.gz) or zstd (.zst, needs zstandard)"
+    )
+
+
+def check_compress_argument(parser: argparse.ArgumentParser, compress: Optional[str]) -> None:
+    """Exit with a usage error if the codec chosen with --compress is not available."""
+    if compress == 'zstd' and zstandard is None:
+        parser.error("--compress zstd requires zstandard: pip install zstandard")
+
+
+def compressed_file(output_file: Path, compress: Optional[str]) -> Path:
+    """Return the output path for a codec (unchanged without compression)."""
+    if not compress:
+        return output_file
+    return output_file.with_name(output_file.name + COMPRESSION_SUFFIXES[compress])
+
+
+def file_compression(path: Path) -> Optional[str]:
+    """Return the codec of a file by its suffix, or None for a plain file."""
+    for compress, suffix in COMPRESSION_SUFFIXES.items():
+        if path.name.endswith(suffix):
+            return compress
+    return None
+
+
+def uncompressed_name(path: Path) -> str:
+    """Return the file name without its compression suffix (items_export.csv.gz -> items_export.csv)."""
+    compress = file_compression(path)
+    if compress:
+        return path.name[:-len(COMPRESSION_SUFFIXES[compress])]
+    return path.name
+
+
+def candidate_files(path: Path) -> List[Path]:
+    """Return the plain file and its compressed siblings, in lookup order."""
+    return [path] + [compressed_file(path, compress) for compress in COMPRESSIONS]
+
+
+def find_input_file(path: Path) -> Path:
+    """Return the newest of path and its compressed siblings (path itself if none exists).
+
+    A re-export with another --compress setting leaves the previous variant behind,
+    so the most recently written file wins, not the plain one.
+    """
+    existing = [candidate for candidate in candidate_files(path) if candidate.exists()]
+    if not existing:
+        return path
+    newest = max(existing, key=lambda candidate: candidate.stat().st_mtime_ns)
+    if len(existing) > 1:
+        stale = ', '.join(candidate.name for candidate in existing if candidate != newest)
+        print(f"Warning: Using {newest.name}, the newest of several variants (ignoring {stale})")
+    return newest
+
+
+def require_zstandard(path: Path) -> None:
+    """Raise if a zstd file is opened without zstandard installed."""
+    if zstandard is None:
+        raise RuntimeError(f"{path} is zstd compressed, which requires zstandard: pip install zstandard")
+
+
+def open_output(path: Path, mode: str = 'w') -> IO:
+    """Open an output file for writing ('w' text or 'wb' binary), compressing by its suffix.
+
+    Text mode uses utf-8 and newline='' like the plain CSV writers.
+    """
+    compress = file_compression(path)
+    if compress == 'gzip':
+        # mtime=0 keeps the output byte-identical across runs for unchanged content
+        raw = gzip.GzipFile(path, 'wb', compresslevel=GZIP_LEVEL, mtime=0)
+    elif compress == 'zstd':
+        require_zstandard(path)
+        raw = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(open(path, 'wb'), closefd=True)
+    elif mode == 'wb':
+        return open(path, 'wb')
+    else:
+        return open(path, 'w', encoding='utf-8', newline='')
+
+    if mode == 'wb':
+        return raw
+    return io.TextIOWrapper(raw, encoding='utf-8', newline='')
+
+
+def open_input(path: Path, mode: str = 'r') -> IO:
+    """Open an input file for reading ('r' text or 'rb' binary), decompressing by its suffix.
+
+    Text mode uses utf-8 and newline='' as csv.reader expects.
+    """
+    compress = file_compression(path)
+    if compress == 'gzip':
+        raw = gzip.open(path, 'rb')
+    elif compress == 'zstd':
+        require_zstandard(path)
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+    elif mode == 'rb':
+        return open(path, 'rb')
+    else:
+        return open(path, 'r', encoding='utf-8', newline='')
+
+    if mode == 'rb':
+        return raw
+    return io.TextIOWrapper(raw, encoding='utf-8', newline='')
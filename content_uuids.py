@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Deterministic name-based UUIDs for the content hierarchy.
+
+Every row gets the uuid5 of its path in the content tree:
+    universe / theme / chapter / round / object_type / index
+so the exporters can fill the uuid and foreign key uuid columns
+(themes.universe_uuid, chapters.themes_uuid, rounds.chapter_uuid,
+items.round_uuid) themselves. Loading needs no join-updates afterwards,
+and every export of the same content produces the same keys.
+
+The path uses the universe and theme folder names, the chapter key of the
+theme file (= chapter file name), the round id and, for items, the object
+type and its index in the round's correct/distractors array.
+"""
+
+import uuid
+
+# Namespace of all content UUIDs - never change it, every key is derived from it
+CONTENT_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, 'wordrush:content')
+
+
+def content_uuid(*path: object) -> str:
+    """Return the UUID of a content path as a string."""
+    return str(uuid.uuid5(CONTENT_NAMESPACE, '/'.join(str(part) for part in path)))
+
+
+def universe_uuid(universe_id: str) -> str:
+    """UUID of a universe (public.universes.uuid)."""
+    return content_uuid(universe_id)
+
+
+def theme_uuid(universe_id: str, theme_id: str) -> str:
+    """UUID of a theme (public.themes.uuid)."""
+    return content_uuid(universe_id, theme_id)
+
+
+def chapter_uuid(universe_id: str, theme_id: str, chapter_id: str) -> str:
+    """UUID of a chapter (public.chapters.uuid)."""
+    return content_uuid(universe_id, theme_id, chapter_id)
+
+
+def round_uuid(universe_id: str, theme_id: str, chapter_id: str, round_id: str) -> str:
+    """UUID of a round (public.rounds.uuid)."""
+    return content_uuid(universe_id, theme_id, chapter_id, round_id)
+
+
+def object_uuid(universe_id: str, theme_id: str, chapter_id: str, round_id: str, object_type: str, index: int) -> str:
+    """UUID of a base/correct/distractor object of a round (public.items.uuid)."""
+    return content_uuid(universe_id, theme_id, chapter_id, round_id, object_type, index)
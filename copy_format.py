@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL COPY encoders for the exporters.
+
+This module writes rows in the two formats understood by
+COPY ... FROM STDIN:
+1. Text format (tab separated, \\N for NULL, backslash escapes)
+2. Binary format (PGCOPY header, length-prefixed typed fields)
+
+Rows are the typed row dicts produced by the exporters' extract_* functions.
+Each exporter declares the PostgreSQL type of every column in COLUMN_TYPES;
+the types used here are text, integer, numeric, double precision, boolean,
+jsonb, text[], timestamptz and uuid.
+
+Load the output with e.g.:
+    \\copy public.items (round_id, ...) FROM 'items_export.copy'
+    \\copy public.items (round_id, ...) FROM 'items_export.pgcopy' WITH (FORMAT binary)
+"""
+
+import json
+import struct
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Any, Iterable, List
+
+from compressed_io import open_output
+from export_common import row_values
+from export_profile import profile_stage
+
+COPY_TEXT_SUFFIX = ".copy"
+COPY_BINARY_SUFFIX = ".pgcopy"
+
+BINARY_SIGNATURE = b'PGCOPY\n\xff\r\n\x00'
+BINARY_HEADER = BINARY_SIGNATURE + struct.pack('!ii', 0, 0)
+BINARY_TRAILER = struct.pack('!h', -1)
+
+# PostgreSQL epoch for timestamp values in binary format
+POSTGRES_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+TEXT_OID = 25
+
+# Backslash escapes for the COPY text format
+TEXT_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    '\b': '\\b',
+    '\f': '\\f',
+    '\n': '\\n',
+    '\r': '\\r',
+    '\t': '\\t',
+    '\v': '\\v',
+})
+
+
+def copy_output_file(csv_file: Path, binary: bool) -> Path:
+    """Return the COPY output path for an exporter's CSV output path."""
+    return csv_file.with_suffix(COPY_BINARY_SUFFIX if binary else COPY_TEXT_SUFFIX)
+
+
+def copy_statement(table: str, columns: List[str], binary: bool = False) -> str:
+    """Return the COPY ... FROM STDIN statement matching an output file."""
+    options = " WITH (FORMAT binary)" if binary else ""
+    return f"COPY {table} ({', '.join(columns)}) FROM STDIN{options}"
+
+
+def as_integer(value: Any) -> int:
+    """Convert a JSON number to int, refusing to silently truncate fractions."""
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"Expected an integer, got {value}")
+        return int(value)
+    return int(value)
+
+
+def format_array_literal(values: List[Any]) -> str:
+    """Format a list as a PostgreSQL array literal, quoting every element."""
+    elements = []
+    for value in values:
+        if value is None:
+            elements.append('NULL')
+        else:
+            escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+            elements.append(f'"{escaped}"')
+    return '{' + ','.join(elements) + '}'
+
+
+def format_text_value(value: Any, column_type: str) -> str:
+    """Render a non-NULL value as its PostgreSQL text representation."""
+    if column_type == 'boolean':
+        return 't' if value else 'f'
+    if column_type == 'jsonb':
+        return json.dumps(value, ensure_ascii=False)
+    if column_type == 'text[]':
+        return format_array_literal(value)
+    if column_type == 'integer':
+        return str(as_integer(value))
+    return str(value)
+
+
+def encode_text_row(values: List[Any], column_types: List[str]) -> str:
+    """Encode one row in COPY text format (including the trailing newline)."""
+    fields = []
+    for value, column_type in zip(values, column_types):
+        if value is None:
+            fields.append('\\N')
+        else:
+            fields.append(format_text_value(value, column_type).translate(TEXT_ESCAPES))
+    return '\t'.join(fields) + '\n'
+
+
+def encode_numeric(value: Any) -> bytes:
+    """Encode a number in PostgreSQL's binary numeric format (base-10000 digits)."""
+    number = Decimal(str(value))
+    sign = 0x4000 if number.is_signed() else 0x0000
+    dscale = max(0, -number.as_tuple().exponent)
+
+    integer_part, _, fraction_part = format(abs(number), 'f').partition('.')
+    integer_part = integer_part.zfill((len(integer_part) + 3) // 4 * 4)
+    fraction_part = fraction_part.ljust((len(fraction_part) + 3) // 4 * 4, '0')
+
+    digits = [int(integer_part[i:i + 4]) for i in range(0, len(integer_part), 4)]
+    weight = len(digits) - 1
+    digits += [int(fraction_part[i:i + 4]) for i in range(0, len(fraction_part), 4)]
+
+    # Strip leading and trailing zero groups
+    while digits and digits[0] == 0:
+        digits.pop(0)
+        weight -= 1
+    while digits and digits[-1] == 0:
+        digits.pop()
+    if not digits:
+        weight = 0
+        sign = 0x0000
+
+    return struct.pack(f'!hhhh{len(digits)}h', len(digits), weight, sign, dscale, *digits)
+
+
+def encode_timestamptz(value: Any) -> bytes:
+    """Encode a date/timestamp string as microseconds since 2000-01-01 UTC."""
+    moment = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    delta = moment - POSTGRES_EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return struct.pack('!q', micros)
+
+
+def encode_text_array(values: List[Any]) -> bytes:
+    """Encode a one-dimensional text[] in binary array format."""
+    if not values:
+        return struct.pack('!iii', 0, 0, TEXT_OID)
+
+    has_null = any(value is None for value in values)
+    parts = [struct.pack('!iiiii', 1, 1 if has_null else 0, TEXT_OID, len(values), 1)]
+    for value in values:
+        if value is None:
+            parts.append(struct.pack('!i', -1))
+        else:
+            data = str(value).encode('utf-8')
+            parts.append(struct.pack('!i', len(data)) + data)
+    return b''.join(parts)
+
+
+def encode_binary_value(value: Any, column_type: str) -> bytes:
+    """Encode a non-NULL value in PostgreSQL binary format."""
+    if column_type == 'integer':
+        return struct.pack('!i', as_integer(value))
+    if column_type == 'double precision':
+        return struct.pack('!d', float(value))
+    if column_type == 'numeric':
+        return encode_numeric(value)
+    if column_type == 'boolean':
+        return b'\x01' if value else b'\x00'
+    if column_type == 'jsonb':
+        # jsonb binary format: version byte followed by the JSON text
+        return b'\x01' + json.dumps(value, ensure_ascii=False).encode('utf-8')
+    if column_type == 'text[]':
+        return encode_text_array(value)
+    if column_type == 'timestamptz':
+        return encode_timestamptz(value)
+    if column_type == 'uuid':
+        return uuid.UUID(str(value)).bytes
+    return str(value).encode('utf-8')
+
+
+def encode_binary_row(values: List[Any], column_types: List[str]) -> bytes:
+    """Encode one row (tuple) in COPY binary format."""
+    parts = [struct.pack('!h', len(values))]
+    for value, column_type in zip(values, column_types):
+        if value is None:
+            parts.append(struct.pack('!i', -1))
+        else:
+            data = encode_binary_value(value, column_type)
+            parts.append(struct.pack('!i', len(data)) + data)
+    return b''.join(parts)
+
+
+class CopyWriter:
+    """Streaming writer for one COPY text/binary output file.
+
+    column_types maps each COPY column (in order) to its PostgreSQL type.
+    """
+
+    def __init__(self, output_file: Path, column_types: Dict[str, str], binary: bool = False):
+        self.output_file = output_file
+        self.columns = list(column_types)
+        self.types = list(column_types.values())
+        self.binary = binary
+        self.written = 0
+        self._file = open_output(output_file, 'wb')
+        if binary:
+            self._file.write(BINARY_HEADER)
+
+    def write_row(self, row: Any) -> None:
+        """Encode and write one typed row (dict or row tuple, see export_common.row_values)."""
+        values = row_values(row, self.columns)
+        try:
+            if self.binary:
+                self._file.write(encode_binary_row(values, self.types))
+            else:
+                self._file.write(encode_text_row(values, self.types).encode('utf-8'))
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Cannot encode row {self.written + 1} of {self.output_file}: {e}") from e
+        self.written += 1
+
+    def close(self) -> None:
+        """Write the binary trailer (if any) and close the file."""
+        if self._file.closed:
+            return
+        if self.binary:
+            self._file.write(BINARY_TRAILER)
+        self._file.close()
+
+    def __enter__(self) -> 'CopyWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def write_copy_rows(
+    output_file: Path,
+    column_types: Dict[str, str],
+    rows: Iterable[Dict[str, Any]],
+    binary: bool = False
+) -> int:
+    """Stream typed row dicts into a COPY text/binary file and return the number of rows written."""
+    with profile_stage('write'), CopyWriter(output_file, column_types, binary) as writer:
+        for row in rows:
+            writer.write_row(row)
+    return writer.written
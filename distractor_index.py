@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Distractor candidate index for the vocabulary generators.
+
+This module:
+1. Flattens a generator's nested vocabulary ({chapter: {level: [(en, de, type), ...]}})
+   once per run and strips the emojis from every term for comparison
+2. Buckets the terms by (chapter, level, word type), (chapter, level), chapter
+   and the whole vocabulary
+3. Answers "k distractors unlike this word" by sampling the most specific
+   bucket that has enough candidates, in time independent of the vocabulary size
+
+Used by generate_technical_english.py and generate_business_english.py:
+    distractor_index = DistractorIndex(vocabulary)
+    distractor_index.sample(word_en, word_de, chapter, level, word_type, k=3)
+"""
+
+import random
+from typing import Dict, List, Tuple
+
+# One vocabulary term: (english, german, word type)
+Term = Tuple[str, str, str]
+
+# Extra candidates drawn per query, so that dropping the word itself (and
+# duplicates of it elsewhere in the vocabulary) rarely needs a second draw
+SAMPLE_SLACK = 2
+
+
+def clean_term(word: str) -> str:
+    """Return a term without emojis and case, for comparing terms ("Keyboard ⌨️" -> "keyboard")."""
+    return ' '.join(token for token in word.split() if any(char.isalnum() for char in token)).casefold()
+
+
+class DistractorIndex:
+    """Precomputed distractor candidates of a vocabulary, bucketed by chapter, level and word type."""
+
+    def __init__(self, vocabulary: Dict[str, Dict[int, List[Term]]]):
+        self.terms = []
+        self.keys = []
+        self.buckets = {}
+        for chapter, levels in vocabulary.items():
+            for level, words in levels.items():
+                for word_en, word_de, word_type in words:
+                    position = len(self.terms)
+                    self.terms.append((word_en, word_de))
+                    self.keys.append((clean_term(word_en), clean_term(word_de)))
+                    for bucket in ((chapter, level, word_type), (chapter, level), (chapter,), ()):
+                        self.buckets.setdefault(bucket, []).append(position)
+
+    def is_unlike(self, position: int, word_en: str, word_de: str) -> bool:
+        """Check that a candidate differs from the word in both languages."""
+        candidate_en, candidate_de = self.keys[position]
+        return candidate_en != clean_term(word_en) and candidate_de != clean_term(word_de)
+
+    def sample(
+        self, word_en: str, word_de: str, chapter: str, level: int, word_type: str, k: int = 3, rng=random
+    ) -> List[Tuple[str, str]]:
+        """Return k random (english, german) distractors unlike the given word.
+
+        The most specific bucket with more than k terms is used, falling back to
+        the chapter's level, the chapter and the whole vocabulary. Every term of the
+        bucket can be drawn. Fewer than k are returned only if the bucket has fewer
+        unlike terms.
+        """
+        for bucket in ((chapter, level, word_type), (chapter, level), (chapter,), ()):
+            positions = self.buckets.get(bucket, [])
+            if len(positions) > k:
+                break
+
+        drawn = rng.sample(positions, min(len(positions), k + SAMPLE_SLACK))
+        selected = [position for position in drawn if self.is_unlike(position, word_en, word_de)][:k]
+        if len(selected) < k:
+            # Only when the bucket holds several copies of the word: take the rest in random order
+            rest = [
+                position for position in rng.sample(positions, len(positions))
+                if position not in selected and self.is_unlike(position, word_en, word_de)
+            ]
+            selected += rest[:k - len(selected)]
+        return [self.terms[position] for position in selected]
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Export chapters, rounds, items and round objects in a single pass over the content tree.
+
+This script:
+1. Walks public/content/themes/ once to find all themes.*.json and chapter files
+2. Exports chapters from the theme files (chapters_export.csv)
+3. Parses each chapter JSON file exactly once
+4. Fans the parsed rounds out to the rounds, items and round_objects writers
+   (CSV by default, PostgreSQL COPY text/binary with --format)
+5. With --shard-by-universe, writes those three tables per universe folder
+   into shards/{universe}/ plus a manifest (see export_shards.py); --universe
+   limits the run to the given universes and keeps the other shards
+6. With --compress gzip|zstd, compresses every output file while writing it
+   (see compressed_io.py)
+
+The row extraction and CSV formatting are shared with the single-table
+export_*_csv.py scripts, so the output is identical to running them one by one.
+"""
+
+import argparse
+import csv
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import export_chapters_csv
+import export_items_csv
+import export_round_objects_csv
+import export_rounds_csv
+from compressed_io import add_compress_argument, check_compress_argument, compressed_file, open_output
+from content_uuids import chapter_uuid
+from copy_format import CopyWriter, copy_output_file, copy_statement
+from export_common import (
+    CONTENT_DIR, CsvRowWriter, add_format_argument, add_incremental_argument, add_jobs_argument, chapter_universe_id,
+    discover_content_files, load_chapter_file, map_chapter_files
+)
+from export_manifest import write_incremental_csv
+from export_shards import SHARD_DIR, group_by_universe, save_shard_manifest, shard_file_entry
+from export_profile import add_profile_arguments, profile_file, profile_stage, profiling
+
+# Tables fed from chapter files: (label, exporter module, row extractor)
+CHAPTER_TABLES = [
+    ('rounds', export_rounds_csv, export_rounds_csv.extract_round_rows),
+    ('items', export_items_csv, export_items_csv.extract_item_rows),
+    ('round objects', export_round_objects_csv, export_round_objects_csv.extract_round_object_rows),
+]
+
+
+def export_chapters(theme_files, compress: Optional[str] = None) -> int:
+    """Write chapters_export.csv from the theme files and return the row count."""
+    exporter = export_chapters_csv
+    total = 0
+
+    with open_output(compressed_file(exporter.OUTPUT_CSV_FILE, compress)) as f:
+        writer = csv.DictWriter(f, fieldnames=exporter.CSV_COLUMNS, quoting=csv.QUOTE_MINIMAL)
+        writer.writeheader()
+
+        for theme_file in theme_files:
+            with profile_file(theme_file):
+                chapters = exporter.process_theme_file(theme_file)
+                with profile_stage('format'):
+                    rows = [exporter.format_csv_row(chapter) for chapter in chapters]
+                with profile_stage('write'):
+                    writer.writerows(rows)
+            total += len(rows)
+
+    return total
+
+
+def format_chapter_tables(chapter_file: Path) -> List[List[dict]]:
+    """Parse a chapter file once and return its CSV-formatted rows per table (process pool worker)."""
+    table_rows = extract_chapter_tables(chapter_file)
+
+    with profile_stage('format'):
+        return [
+            [exporter.format_csv_row(row) for row in rows]
+            for (_, exporter, _), rows in zip(CHAPTER_TABLES, table_rows)
+        ]
+
+
+def extract_chapter_tables(chapter_file: Path) -> List[List[dict]]:
+    """Parse a chapter file once and return its typed rows per table (process pool worker)."""
+    loaded = load_chapter_file(chapter_file)
+    if not loaded:
+        return [[] for _ in CHAPTER_TABLES]
+    items, created_at = loaded
+
+    universe_id = chapter_universe_id(chapter_file)
+
+    with profile_stage('extract'):
+        return [list(extract_rows(items, created_at, universe_id)) for _, _, extract_rows in CHAPTER_TABLES]
+
+
+def export_chapter_tables(
+    chapter_files, jobs: int = 1, incremental: bool = False, compress: Optional[str] = None
+) -> Dict[str, int]:
+    """Write the rounds, items and round_objects CSVs, parsing every chapter file once."""
+    if incremental:
+        outputs = [(exporter.OUTPUT_CSV_FILE, exporter.CSV_COLUMNS) for _, exporter, _ in CHAPTER_TABLES]
+        row_counts, _ = write_incremental_csv(outputs, chapter_files, format_chapter_tables, jobs)
+        return {label: count for (label, _, _), count in zip(CHAPTER_TABLES, row_counts)}
+
+    totals = {label: 0 for label, _, _ in CHAPTER_TABLES}
+
+    with ExitStack() as stack:
+        writers = []
+        for label, exporter, extract_rows in CHAPTER_TABLES:
+            f = stack.enter_context(open_output(compressed_file(exporter.OUTPUT_CSV_FILE, compress)))
+            writer = CsvRowWriter(f, exporter.CSV_COLUMNS)
+            writer.writeheader()
+            writers.append((label, exporter, extract_rows, writer))
+
+        for table_rows in map_chapter_files(format_chapter_tables, chapter_files, jobs):
+            for (label, _, _, writer), rows in zip(writers, table_rows):
+                with profile_stage('write'):
+                    writer.writerows(rows)
+                totals[label] += len(rows)
+
+    return totals
+
+
+def export_chapter_tables_copy(
+    chapter_files, jobs: int = 1, binary: bool = False, compress: Optional[str] = None
+) -> Dict[str, int]:
+    """Write the rounds, items and round_objects COPY files, parsing every chapter file once."""
+    totals = {label: 0 for label, _, _ in CHAPTER_TABLES}
+
+    with ExitStack() as stack:
+        writers = [
+            stack.enter_context(CopyWriter(
+                compressed_file(copy_output_file(exporter.OUTPUT_CSV_FILE, binary), compress),
+                exporter.COLUMN_TYPES, binary
+            ))
+            for _, exporter, _ in CHAPTER_TABLES
+        ]
+
+        for table_rows in map_chapter_files(extract_chapter_tables, chapter_files, jobs):
+            for (label, _, _), writer, rows in zip(CHAPTER_TABLES, writers, table_rows):
+                with profile_stage('write'):
+                    for row in rows:
+                        writer.write_row(row)
+                totals[label] += len(rows)
+
+    return totals
+
+
+class UniverseShard:
+    """Writers for the rounds, items and round_objects files of one universe shard."""
+
+    def __init__(self, shard_dir: Path, universe: str, output_format: str = 'csv', compress: Optional[str] = None):
+        self.shard_dir = shard_dir
+        self.universe = universe
+        self.output_format = output_format
+        self.rows = [0] * len(CHAPTER_TABLES)
+        self.chapter_uuids = []
+        self.files = []
+        self._stack = ExitStack()
+        self._writers = []
+
+        (shard_dir / universe).mkdir(parents=True, exist_ok=True)
+        binary = output_format == 'copy-binary'
+        for _, exporter, _ in CHAPTER_TABLES:
+            output_file = shard_dir / universe / exporter.OUTPUT_CSV_FILE.name
+            if output_format == 'csv':
+                output_file = compressed_file(output_file, compress)
+                f = self._stack.enter_context(open_output(output_file))
+                writer = CsvRowWriter(f, exporter.CSV_COLUMNS)
+                writer.writeheader()
+            else:
+                output_file = compressed_file(copy_output_file(output_file, binary), compress)
+                writer = self._stack.enter_context(CopyWriter(output_file, exporter.COLUMN_TYPES, binary))
+            self.files.append(output_file)
+            self._writers.append(writer)
+
+    def write_chapter(self, chapter_file: Path, table_rows: List[List[dict]]) -> None:
+        """Write the rows of one chapter file (from format_chapter_tables or extract_chapter_tables)."""
+        self.chapter_uuids.append(chapter_uuid(self.universe, chapter_file.parent.name, chapter_file.stem))
+        for index, (writer, rows) in enumerate(zip(self._writers, table_rows)):
+            with profile_stage('write'):
+                if self.output_format == 'csv':
+                    writer.writerows(rows)
+                else:
+                    for row in rows:
+                        writer.write_row(row)
+            self.rows[index] += len(rows)
+
+    def close(self) -> Dict[str, object]:
+        """Close the shard files and return the shard's manifest entry."""
+        self._stack.close()
+        return {
+            'chapter_uuids': self.chapter_uuids,
+            'files': {
+                exporter.COPY_TABLE: shard_file_entry(self.shard_dir, output_file, rows)
+                for (_, exporter, _), output_file, rows in zip(CHAPTER_TABLES, self.files, self.rows)
+            },
+        }
+
+
+def export_chapter_tables_sharded(
+    chapter_files, jobs: int = 1, output_format: str = 'csv', shard_dir: Path = SHARD_DIR,
+    universes: Optional[List[str]] = None, compress: Optional[str] = None
+) -> Dict[str, Dict[str, int]]:
+    """Write the rounds, items and round_objects files per universe shard and update the shard manifest.
+
+    Returns the row counts per universe and table label.
+    """
+    groups = group_by_universe(chapter_files)
+    if universes:
+        missing = [universe for universe in universes if universe not in groups]
+        if missing:
+            print(f"Warning: No chapter files for universe(s): {', '.join(missing)}")
+        groups = {universe: files for universe, files in groups.items() if universe in universes}
+
+    # Chapter files of one universe are contiguous, so only one shard is open at a time
+    ordered_files = [chapter_file for files in groups.values() for chapter_file in files]
+    worker = format_chapter_tables if output_format == 'csv' else extract_chapter_tables
+
+    shards = {}
+    shard = None
+    for chapter_file, table_rows in zip(ordered_files, map_chapter_files(worker, ordered_files, jobs)):
+        universe = chapter_universe_id(chapter_file)
+        if shard is None or shard.universe != universe:
+            if shard is not None:
+                shards[shard.universe] = shard.close()
+            shard = UniverseShard(shard_dir, universe, output_format, compress)
+        shard.write_chapter(chapter_file, table_rows)
+    if shard is not None:
+        shards[shard.universe] = shard.close()
+
+    manifest_file = save_shard_manifest(shard_dir, output_format, shards, merge=bool(universes))
+    print(f"Shard manifest: {manifest_file}")
+
+    return {
+        universe: {
+            label: entry['files'][exporter.COPY_TABLE]['rows'] for label, exporter, _ in CHAPTER_TABLES
+        }
+        for universe, entry in shards.items()
+    }
+
+
+def generate_all_exports(
+    jobs: int = 1, incremental: bool = False, output_format: str = 'csv', shard_dir: Optional[Path] = None,
+    universes: Optional[List[str]] = None, compress: Optional[str] = None
+) -> None:
+    """Generate all content exports in one pass (per universe shard if shard_dir is given)."""
+    theme_files, chapter_files = discover_content_files()
+
+    if not theme_files and not chapter_files:
+        print(f"No content files found in {CONTENT_DIR}")
+        return
+
+    print(f"Found {len(theme_files)} theme files and {len(chapter_files)} chapter files")
+
+    # chapters_export.csv comes from a few small theme files and is always rebuilt as CSV
+    chapter_count = export_chapters(theme_files, compress)
+    chapters_file = compressed_file(export_chapters_csv.OUTPUT_CSV_FILE, compress)
+
+    if shard_dir is not None:
+        shard_totals = export_chapter_tables_sharded(
+            chapter_files, jobs, output_format, shard_dir, universes, compress
+        )
+        print("\n✅ Sharded export complete")
+        print(f"   {chapters_file}: {chapter_count} chapters")
+        for universe, totals in shard_totals.items():
+            counts = ', '.join(f"{totals[label]} {label}" for label, _, _ in CHAPTER_TABLES)
+            print(f"   {shard_dir / universe}/: {counts}")
+        print(f"   Load with: python load_postgres.py --shards {shard_dir}")
+        return
+
+    binary = output_format == 'copy-binary'
+    if output_format == 'csv':
+        totals = export_chapter_tables(chapter_files, jobs, incremental, compress)
+    else:
+        totals = export_chapter_tables_copy(chapter_files, jobs, binary, compress)
+
+    print("\n✅ Export complete")
+    print(f"   {chapters_file}: {chapter_count} chapters")
+    for label, exporter, _ in CHAPTER_TABLES:
+        if output_format == 'csv':
+            print(f"   {compressed_file(exporter.OUTPUT_CSV_FILE, compress)}: {totals[label]} {label}")
+        else:
+            output_file = compressed_file(copy_output_file(exporter.OUTPUT_CSV_FILE, binary), compress)
+            print(f"   {output_file}: {totals[label]} {label}")
+            print(f"     Load with: {copy_statement(exporter.COPY_TABLE, list(exporter.COLUMN_TYPES), binary)}")
+
+
+def main() -> None:
+    """Parse command line arguments and run all exports."""
+    parser = argparse.ArgumentParser(description="Export chapters, rounds, items and round objects in one pass.")
+    add_jobs_argument(parser)
+    add_incremental_argument(parser)
+    add_format_argument(parser)
+    add_compress_argument(parser)
+    parser.add_argument('--shard-by-universe', action='store_true',
+                        help="Write rounds, items and round_objects per universe into --shard-dir with a manifest")
+    parser.add_argument('--shard-dir', type=Path, default=SHARD_DIR, help=f"Shard directory (default: {SHARD_DIR})")
+    parser.add_argument('--universe', nargs='+', metavar='UNIVERSE',
+                        help="Only (re-)export the shards of these universe folders (with --shard-by-universe)")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if args.incremental and args.output_format != 'csv':
+        parser.error("--incremental is only supported for --format csv")
+    if args.incremental and args.compress:
+        parser.error("--incremental is not supported with --compress")
+    check_compress_argument(parser, args.compress)
+    if args.shard_by_universe and args.incremental:
+        parser.error("--incremental is not supported with --shard-by-universe")
+    if args.universe and not args.shard_by_universe:
+        parser.error("--universe requires --shard-by-universe")
+    with profiling(args):
+        generate_all_exports(
+            jobs=args.jobs, incremental=args.incremental, output_format=args.output_format,
+            shard_dir=args.shard_dir if args.shard_by_universe else None, universes=args.universe,
+            compress=args.compress
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Export one precomputed, client-ready payload per chapter for public.chapter_payloads.
+
+This script:
+1. Finds all chapter JSON files in public/content/themes/{universe}/{theme}/
+2. Builds the nested Item[] of each chapter, as DBToItemTransformer.ts would
+   rebuild it from the rounds and items tables: every round gets its roundUuid
+   and every base/correct/distractor object its uuid (see content_uuids.py)
+3. Hashes the canonical payload JSON (sorted keys, no whitespace) with sha256
+4. Exports one row per chapter in the format required for the public.chapter_payloads
+   table (chapter_payloads_table.sql), as CSV or PostgreSQL COPY text/binary
+
+The client can then open a chapter with a single primary key fetch
+(chapter_uuid) instead of separate chapters, rounds and items queries.
+"""
+
+import argparse
+import hashlib
+import json
+from functools import partial
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional
+
+import content_uuids
+from compressed_io import add_compress_argument, check_compress_argument, compressed_file
+from copy_format import copy_output_file, copy_statement, write_copy_rows
+from export_common import (
+    CONTENT_DIR, RowTally, add_format_argument, add_incremental_argument, add_jobs_argument, chapter_universe_id,
+    find_all_chapter_files, load_chapter_file, map_chapter_files, today, write_csv_rows
+)
+from export_manifest import single_table, write_incremental_csv
+from export_profile import add_profile_arguments, profile_stage, profiling
+
+# Paths
+OUTPUT_CSV_FILE = Path("chapter_payloads_export.csv")
+SCHEMA_FILE = Path("chapter_payloads_table.sql")
+
+# CSV columns matching the database table structure
+CSV_COLUMNS = [
+    "chapter_uuid",
+    "chapter_id",
+    "theme_id",
+    "universe_id",
+    "payload",
+    "content_hash",
+    "round_count",
+    "item_count",
+    "created_at",
+    "updated_at"
+]
+
+# PostgreSQL table and column types for COPY output - see copy_format.py
+COPY_TABLE = "public.chapter_payloads"
+COLUMN_TYPES = {
+    "chapter_uuid": "uuid",
+    "chapter_id": "text",
+    "theme_id": "text",
+    "universe_id": "text",
+    "payload": "jsonb",
+    "content_hash": "text",
+    "round_count": "integer",
+    "item_count": "integer",
+    "created_at": "timestamptz",
+    "updated_at": "timestamptz"
+}
+
+
+def canonical_json(value: Any) -> str:
+    """Serialize a value as canonical JSON (sorted keys, no whitespace)."""
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+def content_hash(payload: List[Dict[str, Any]]) -> str:
+    """Return the sha256 hex digest of the canonical payload JSON."""
+    return hashlib.sha256(canonical_json(payload).encode('utf-8')).hexdigest()
+
+
+def with_uuids(objects: Any, path: tuple, object_type: str) -> List[Dict[str, Any]]:
+    """Return copies of a round's correct/distractor objects with their item uuids."""
+    if not isinstance(objects, list):
+        return []
+    return [
+        {**obj, 'uuid': content_uuids.object_uuid(*path, object_type, idx)}
+        for idx, obj in enumerate(objects)
+        if isinstance(obj, dict)
+    ]
+
+
+def build_round_payload(item: Dict[str, Any], universe_id: str) -> Dict[str, Any]:
+    """Return a client-ready copy of one round with roundUuid and object uuids."""
+    path = (universe_id, item.get('theme', ''), item.get('chapter', ''), item['id'])
+    round_payload = dict(item)
+    round_payload['roundUuid'] = content_uuids.round_uuid(*path)
+
+    base = item.get('base')
+    if isinstance(base, dict):
+        round_payload['base'] = {**base, 'uuid': content_uuids.object_uuid(*path, 'base', 0)}
+    round_payload['correct'] = with_uuids(item.get('correct', []), path, 'correct')
+    round_payload['distractors'] = with_uuids(item.get('distractors', []), path, 'distractor')
+    return round_payload
+
+
+def extract_payload_row(
+    items: List[Any], created_at: str, universe_id: str, theme_id: str, chapter_id: str
+) -> Dict[str, Any]:
+    """Build the payload row of one chapter from its parsed items."""
+    payload = []
+    item_count = 0
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+
+        # Same rounds as export_rounds_csv.py, so the payload matches the rounds table
+        if not item.get('id') or not item.get('chapter'):
+            print(f"Warning: Skipping item with missing id or chapter: {item.get('id', '')}")
+            continue
+
+        round_payload = build_round_payload(item, universe_id)
+        payload.append(round_payload)
+        item_count += (
+            isinstance(round_payload.get('base'), dict)
+            + len(round_payload['correct']) + len(round_payload['distractors'])
+        )
+
+    return {
+        'chapter_uuid': content_uuids.chapter_uuid(universe_id, theme_id, chapter_id),
+        'chapter_id': chapter_id,
+        'theme_id': theme_id,
+        'universe_id': universe_id,
+        'payload': payload,
+        'content_hash': content_hash(payload),
+        'round_count': len(payload),
+        'item_count': item_count,
+        'created_at': created_at,
+        'updated_at': today()
+    }
+
+
+def process_chapter_file(file_path: Path) -> List[Dict[str, Any]]:
+    """Process a single chapter JSON file and return its payload row (empty list if unusable)."""
+    loaded = load_chapter_file(file_path)
+    if not loaded:
+        return []
+    items, created_at = loaded
+    with profile_stage('extract'):
+        return [extract_payload_row(items, created_at, chapter_universe_id(file_path), file_path.parent.name, file_path.stem)]
+
+
+def format_csv_row(payload_row: Dict[str, Any]) -> Dict[str, str]:
+    """Format a payload row for CSV."""
+    return {
+        'chapter_uuid': payload_row['chapter_uuid'],
+        'chapter_id': payload_row['chapter_id'],
+        'theme_id': payload_row['theme_id'],
+        'universe_id': payload_row['universe_id'],
+        'payload': json.dumps(payload_row['payload'], ensure_ascii=False),
+        'content_hash': payload_row['content_hash'],
+        'round_count': payload_row['round_count'],
+        'item_count': payload_row['item_count'],
+        'created_at': payload_row['created_at'] or '',
+        'updated_at': payload_row['updated_at'] or ''
+    }
+
+
+def iter_payload_rows(chapter_files: List[Path], jobs: int = 1) -> Iterator[Dict[str, Any]]:
+    """Lazily discover -> parse -> extract the payload rows of all chapter files."""
+    return chain.from_iterable(map_chapter_files(process_chapter_file, chapter_files, jobs))
+
+
+def format_chapter_file(file_path: Path) -> List[Dict[str, str]]:
+    """Parse a chapter file and return its CSV-formatted payload row (process pool worker)."""
+    rows = process_chapter_file(file_path)
+    with profile_stage('format'):
+        return [format_csv_row(row) for row in rows]
+
+
+def generate_csv_export(
+    jobs: int = 1, incremental: bool = False, output_format: str = 'csv', compress: Optional[str] = None
+) -> None:
+    """Generate CSV (or PostgreSQL COPY) export of all chapter payloads."""
+    chapter_files = find_all_chapter_files()
+
+    if not chapter_files:
+        print(f"No chapter files found in {CONTENT_DIR}")
+        return
+
+    print(f"Found {len(chapter_files)} chapter files")
+
+    if incremental:
+        (total,), reparsed = write_incremental_csv(
+            [(OUTPUT_CSV_FILE, CSV_COLUMNS)], chapter_files, partial(single_table, format_chapter_file), jobs
+        )
+        print(f"\n✅ Incremental CSV export complete: {OUTPUT_CSV_FILE}")
+        print(f"   Exported {total} chapter payloads ({reparsed} chapter files re-parsed)")
+        return
+
+    tally = RowTally()
+    if output_format == 'csv':
+        output_file = compressed_file(OUTPUT_CSV_FILE, compress)
+        rows = chain.from_iterable(map_chapter_files(format_chapter_file, chapter_files, jobs))
+        write_csv_rows(output_file, CSV_COLUMNS, tally.count(rows))
+    else:
+        binary = output_format == 'copy-binary'
+        output_file = compressed_file(copy_output_file(OUTPUT_CSV_FILE, binary), compress)
+        write_copy_rows(output_file, COLUMN_TYPES, tally.count(iter_payload_rows(chapter_files, jobs)), binary)
+
+    print(f"\n✅ {'CSV' if output_format == 'csv' else 'COPY'} export complete: {output_file}")
+    print(f"   Exported {tally.total} chapter payloads")
+    print(f"   Create the table with: {SCHEMA_FILE}")
+    if compress:
+        print("   Load with: python load_postgres.py --dsn ... (decompresses while loading)")
+    elif output_format == 'csv':
+        print(f"   Load with: \\copy {COPY_TABLE} ({', '.join(CSV_COLUMNS)}) from '{output_file}' with (format csv, header true)")
+    else:
+        print(f"   Load with: {copy_statement(COPY_TABLE, list(COLUMN_TYPES), binary)}")
+
+
+def main() -> None:
+    """Parse command line arguments and run the export."""
+    parser = argparse.ArgumentParser(description="Export one client-ready payload per chapter for public.chapter_payloads.")
+    add_jobs_argument(parser)
+    add_incremental_argument(parser)
+    add_format_argument(parser)
+    add_compress_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if args.incremental and args.output_format != 'csv':
+        parser.error("--incremental is only supported for --format csv")
+    if args.incremental and args.compress:
+        parser.error("--incremental is not supported with --compress")
+    check_compress_argument(parser, args.compress)
+    with profiling(args):
+        generate_csv_export(
+            jobs=args.jobs, incremental=args.incremental, output_format=args.output_format, compress=args.compress
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,20 +8,26 @@ This script:
 3. Exports to CSV in the format required for public.chapters table
 """
 
+import argparse
 import json
 import csv
 from pathlib import Path
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+
+import content_uuids
+from compressed_io import add_compress_argument, check_compress_argument, compressed_file, open_output
+from export_common import CONTENT_DIR, find_all_theme_files, today
+from export_profile import add_profile_arguments, profile_file, profile_stage, profiling
 
 # Paths
-CONTENT_DIR = Path("public/content/themes")
 OUTPUT_CSV_FILE = Path("chapters_export.csv")
 
 # CSV columns matching the database table structure
 CSV_COLUMNS = [
     "id",
+    "uuid",
     "themes_uuid",
+    "themes_uuid_backup",
     "title",
     "description",
     "backgroundimage",
@@ -31,6 +37,21 @@ CSV_COLUMNS = [
     "updated_at"
 ]
 
+# Column types of the rows returned by process_theme_file() (themes_uuid_backup holds the theme id)
+COLUMN_TYPES = {
+    "id": "text",
+    "uuid": "uuid",
+    "themes_uuid": "uuid",
+    "themes_uuid_backup": "text",
+    "title": "text",
+    "description": "text",
+    "backgroundimage": "text",
+    "background_gradient": "jsonb",
+    "meta": "jsonb",
+    "created_at": "timestamptz",
+    "updated_at": "timestamptz"
+}
+
 
 def format_csv_value(value: Any) -> str:
     """Format value for CSV export."""
@@ -40,7 +61,8 @@ def format_csv_value(value: Any) -> str:
     str_value = str(value)
     # Escape quotes by doubling them
     if '"' in str_value or ',' in str_value or '\n' in str_value:
-        return f'"{str_value.replace('"', '""')}"'
+        escaped = str_value.replace('"', '""')
+        return f'"{escaped}"'
     return str_value
 
 
@@ -57,15 +79,24 @@ def format_jsonb_for_csv(value: Any) -> str:
 def process_theme_file(file_path: Path) -> List[Dict[str, Any]]:
     """Process a single theme JSON file and return list of chapter rows."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with profile_stage('decode'), open(file_path, 'r', encoding='utf-8') as f:
             theme_data = json.load(f)
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
         return []
     
+    if not theme_data.get('id', ''):
+        print(f"Warning: No theme id found in {file_path}")
+        return []
+    
+    with profile_stage('extract'):
+        return extract_chapter_rows(theme_data, file_path.parent.name)
+
+
+def extract_chapter_rows(theme_data: Dict[str, Any], universe_id: str) -> List[Dict[str, Any]]:
+    """Extract chapter rows from parsed theme JSON of the given universe folder."""
     theme_id = theme_data.get('id', '')
     if not theme_id:
-        print(f"Warning: No theme id found in {file_path}")
         return []
     
     # Get created_at from theme meta
@@ -75,7 +106,7 @@ def process_theme_file(file_path: Path) -> List[Dict[str, Any]]:
     
     # Default to current date if not found
     if not created_at:
-        created_at = datetime.now().strftime('%Y-%m-%d')
+        created_at = today()
     
     chapters = theme_data.get('chapters', {})
     if not chapters:
@@ -108,14 +139,16 @@ def process_theme_file(file_path: Path) -> List[Dict[str, Any]]:
         # Create row
         row = {
             'id': chapter_id,
-            'themes_uuid': theme_id,
+            'uuid': content_uuids.chapter_uuid(universe_id, theme_id, chapter_id),
+            'themes_uuid': content_uuids.theme_uuid(universe_id, theme_id),
+            'themes_uuid_backup': theme_id,
             'title': title,
             'description': description,
             'backgroundimage': background_image,
             'background_gradient': background_gradient,
             'meta': meta if meta else None,
             'created_at': created_at,
-            'updated_at': datetime.now().strftime('%Y-%m-%d')
+            'updated_at': today()
         }
         
         chapter_rows.append(row)
@@ -123,15 +156,24 @@ def process_theme_file(file_path: Path) -> List[Dict[str, Any]]:
     return chapter_rows
 
 
-def find_all_theme_files() -> List[Path]:
-    """Find all themes.*.json files in the content directory."""
-    theme_files = []
-    for theme_file in CONTENT_DIR.rglob("themes.*.json"):
-        theme_files.append(theme_file)
-    return sorted(theme_files)
-
-
-def generate_csv_export() -> None:
+def format_csv_row(chapter: Dict[str, Any]) -> Dict[str, str]:
+    """Format a chapter row for CSV - use raw values, csv.DictWriter handles escaping."""
+    return {
+        'id': chapter['id'] or '',
+        'uuid': chapter['uuid'],
+        'themes_uuid': chapter['themes_uuid'],
+        'themes_uuid_backup': chapter['themes_uuid_backup'] or '',
+        'title': chapter['title'] or '',
+        'description': chapter['description'] or '',
+        'backgroundimage': chapter['backgroundimage'] or '',
+        'background_gradient': format_jsonb_for_csv(chapter['background_gradient']),
+        'meta': format_jsonb_for_csv(chapter['meta']),
+        'created_at': chapter['created_at'] or '',
+        'updated_at': chapter['updated_at'] or ''
+    }
+
+
+def generate_csv_export(compress: Optional[str] = None) -> None:
     """Generate CSV export of all chapters."""
     theme_files = find_all_theme_files()
     
@@ -145,36 +187,38 @@ def generate_csv_export() -> None:
     
     for theme_file in theme_files:
         print(f"Processing {theme_file}...")
-        chapters = process_theme_file(theme_file)
+        with profile_file(theme_file):
+            chapters = process_theme_file(theme_file)
         all_chapters.extend(chapters)
         print(f"  Found {len(chapters)} chapters")
     
     print(f"\nTotal chapters: {len(all_chapters)}")
     
+    with profile_stage('format'):
+        rows = [format_csv_row(chapter) for chapter in all_chapters]
+    
     # Write CSV file
-    with open(OUTPUT_CSV_FILE, 'w', encoding='utf-8', newline='') as f:
+    output_file = compressed_file(OUTPUT_CSV_FILE, compress)
+    with profile_stage('write'), open_output(output_file) as f:
         writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS, quoting=csv.QUOTE_MINIMAL)
         writer.writeheader()
-        
-        for chapter in all_chapters:
-            # Format row for CSV - use raw values, csv.DictWriter handles escaping
-            csv_row = {
-                'id': chapter['id'] or '',
-                'themes_uuid': chapter['themes_uuid'] or '',
-                'title': chapter['title'] or '',
-                'description': chapter['description'] or '',
-                'backgroundimage': chapter['backgroundimage'] or '',
-                'background_gradient': format_jsonb_for_csv(chapter['background_gradient']),
-                'meta': format_jsonb_for_csv(chapter['meta']),
-                'created_at': chapter['created_at'] or '',
-                'updated_at': chapter['updated_at'] or ''
-            }
-            writer.writerow(csv_row)
-    
-    print(f"\n✅ CSV export complete: {OUTPUT_CSV_FILE}")
+        writer.writerows(rows)
+    
+    print(f"\n✅ CSV export complete: {output_file}")
     print(f"   Exported {len(all_chapters)} chapters")
 
 
+def main() -> None:
+    """Parse command line arguments and run the export."""
+    parser = argparse.ArgumentParser(description="Export all chapters from theme JSON files to CSV.")
+    add_compress_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    check_compress_argument(parser, args.compress)
+    with profiling(args):
+        generate_csv_export(compress=args.compress)
+
+
 if __name__ == "__main__":
-    generate_csv_export()
+    main()
 
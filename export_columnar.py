@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Export the whole content corpus as columnar Parquet (or Arrow IPC) files.
+
+This script:
+1. Walks public/content/themes/ once to find universe, theme and chapter files
+2. Extracts universes, themes and chapters from the universe/theme JSON files
+3. Parses each chapter file once and extracts rounds, items and round objects
+4. Writes one columnar file per table to content_columnar/{table}.parquet (or .arrow)
+
+Row extraction is shared with the export_*_csv.py scripts and the column types
+come from their COLUMN_TYPES, so the columnar data matches the CSV exports.
+Low-cardinality string columns (object_type, variant, sound, behavior, color, ...)
+are dictionary-encoded with one dictionary per column that grows across batches
+(written as dictionary deltas, which the Arrow IPC file format allows, unlike
+replacing the dictionary). Rows are written in record batches, so memory stays
+bounded by BATCH_SIZE rather than the size of the corpus.
+
+Requires pyarrow (pip install pyarrow).
+"""
+
+import argparse
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Iterable
+
+import export_chapters_csv
+import export_universes_csv
+import generate_themes_insert
+from copy_format import as_integer
+from export_all import CHAPTER_TABLES, extract_chapter_tables
+from export_common import (
+    CONTENT_DIR, add_jobs_argument, discover_content_files, find_all_universe_files, map_chapter_files, row_values
+)
+from export_profile import add_profile_arguments, profile_file, profile_stage, profiling
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Paths
+OUTPUT_DIR = Path("content_columnar")
+
+# Rows per record batch / Parquet row group
+BATCH_SIZE = 50_000
+
+# String columns with few distinct values - stored dictionary-encoded
+DICTIONARY_COLUMNS = {
+    'object_type', 'variant', 'sound', 'behavior', 'color', 'pattern', 'type', 'entry_type',
+    'theme_id', 'chapter_id', 'themes_uuid', 'themes_uuid_backup', 'chapter_uuid', 'universe_id', 'meta_source',
+    'language', 'particle_effect',
+}
+
+
+def arrow_type(column: str, column_type: str) -> 'pa.DataType':
+    """Map a PostgreSQL column type (see COLUMN_TYPES) to an Arrow type."""
+    if column_type == 'integer':
+        return pa.int32()
+    if column_type in ('numeric', 'double precision'):
+        return pa.float64()
+    if column_type == 'boolean':
+        return pa.bool_()
+    if column_type == 'text[]':
+        return pa.list_(pa.string())
+    if column_type == 'timestamptz':
+        return pa.timestamp('us', tz='UTC')
+    if column in DICTIONARY_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    # text and jsonb (stored as JSON text)
+    return pa.string()
+
+
+def convert_value(value: Any, column_type: str) -> Any:
+    """Convert a typed row value to the Python value Arrow expects for the column type."""
+    if value is None:
+        return None
+    if column_type == 'integer':
+        return as_integer(value)
+    if column_type in ('numeric', 'double precision'):
+        return float(value)
+    if column_type == 'boolean':
+        return bool(value)
+    if column_type == 'jsonb':
+        return json.dumps(value, ensure_ascii=False)
+    if column_type == 'text[]':
+        return [str(element) for element in value]
+    if column_type == 'timestamptz':
+        moment = datetime.fromisoformat(str(value))
+        return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    return str(value)
+
+
+class ColumnarTableWriter:
+    """Buffers typed row dicts column-wise and writes them as record batches."""
+
+    def __init__(self, output_file: Path, column_types: Dict[str, str], output_format: str = 'parquet'):
+        self.output_file = output_file
+        self.column_types = column_types
+        self.schema = pa.schema([(column, arrow_type(column, pg_type)) for column, pg_type in column_types.items()])
+        self.columns = {column: [] for column in column_types}
+        # value -> index of every dictionary column, shared by all batches
+        self.dictionaries = {field.name: {} for field in self.schema if pa.types.is_dictionary(field.type)}
+        self.buffered = 0
+        self.written = 0
+
+        if output_format == 'parquet':
+            self._writer = pq.ParquetWriter(output_file, self.schema, compression='zstd')
+        else:
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            self._writer = pa.ipc.new_file(str(output_file), self.schema, options=options)
+
+    def write_rows(self, rows: Iterable[Any]) -> None:
+        """Append typed rows (dicts or row tuples), flushing a record batch every BATCH_SIZE rows."""
+        names = list(self.column_types)
+        with profile_stage('format'):
+            for row in rows:
+                for column, pg_type, value in zip(names, self.column_types.values(), row_values(row, names)):
+                    self.columns[column].append(convert_value(value, pg_type))
+                self.buffered += 1
+                if self.buffered >= BATCH_SIZE:
+                    self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows as one record batch."""
+        if not self.buffered:
+            return
+
+        arrays = []
+        for field in self.schema:
+            values = self.columns[field.name]
+            if pa.types.is_dictionary(field.type):
+                arrays.append(self.dictionary_array(field, values))
+            else:
+                arrays.append(pa.array(values, type=field.type))
+            values.clear()
+
+        with profile_stage('write'):
+            self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self.written += self.buffered
+        self.buffered = 0
+
+    def dictionary_array(self, field: 'pa.Field', values: list) -> 'pa.DictionaryArray':
+        """Encode a batch of a dictionary column against the column's dictionary, extending it."""
+        lookup = self.dictionaries[field.name]
+        indices = [None if value is None else lookup.setdefault(value, len(lookup)) for value in values]
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, type=field.type.index_type), pa.array(list(lookup), type=field.type.value_type)
+        )
+
+    def close(self) -> None:
+        """Flush remaining rows and close the file."""
+        self.flush()
+        self._writer.close()
+
+
+def table_name(exporter) -> str:
+    """Return the bare table name (e.g. round_objects) of a chapter exporter module."""
+    return exporter.COPY_TABLE.split('.')[-1]
+
+
+def write_table(output_dir: Path, table: str, column_types: Dict[str, str], rows: Iterable[Dict[str, Any]],
+                output_format: str) -> int:
+    """Write one small table in a single call and return its row count."""
+    writer = ColumnarTableWriter(output_dir / f"{table}.{output_format}", column_types, output_format)
+    writer.write_rows(rows)
+    writer.close()
+    return writer.written
+
+
+def generate_columnar_export(jobs: int = 1, output_format: str = 'parquet', output_dir: Path = OUTPUT_DIR) -> None:
+    """Generate one columnar file per content table."""
+    if pa is None:
+        print("pyarrow is required for the columnar export: pip install pyarrow")
+        return
+
+    theme_files, chapter_files = discover_content_files()
+    universe_files = find_all_universe_files()
+
+    if not chapter_files:
+        print(f"No chapter files found in {CONTENT_DIR}")
+        return
+
+    print(f"Found {len(universe_files)} universe files, {len(theme_files)} theme files "
+          f"and {len(chapter_files)} chapter files")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    totals = {}
+
+    # Universes
+    universes = (export_universes_csv.process_universe_file(path) for path in universe_files)
+    totals['universes'] = write_table(
+        output_dir, 'universes', export_universes_csv.COLUMN_TYPES, (row for row in universes if row), output_format
+    )
+
+    # Themes and chapters - each theme file is parsed once for both tables
+    theme_rows = []
+    chapter_rows = []
+    for theme_file in theme_files:
+        with profile_file(theme_file):
+            theme_data = generate_themes_insert.load_theme_file(theme_file)
+            if not theme_data or not theme_data.get('id'):
+                continue
+            universe_id = theme_file.parent.name
+            with profile_stage('extract'):
+                theme_rows.append(generate_themes_insert.extract_theme_row(theme_data, universe_id, universe_id))
+                chapter_rows.extend(export_chapters_csv.extract_chapter_rows(theme_data, universe_id))
+
+    totals['themes'] = write_table(
+        output_dir, 'themes', generate_themes_insert.COLUMN_TYPES, theme_rows, output_format
+    )
+    totals['chapters'] = write_table(
+        output_dir, 'chapters', export_chapters_csv.COLUMN_TYPES, chapter_rows, output_format
+    )
+
+    # Rounds, items and round objects - each chapter file is parsed once for all three
+    writers = [
+        ColumnarTableWriter(output_dir / f"{table_name(exporter)}.{output_format}", exporter.COLUMN_TYPES, output_format)
+        for _, exporter, _ in CHAPTER_TABLES
+    ]
+    try:
+        for table_rows in map_chapter_files(extract_chapter_tables, chapter_files, jobs):
+            for writer, rows in zip(writers, table_rows):
+                writer.write_rows(rows)
+    finally:
+        for writer in writers:
+            writer.close()
+
+    for (_, exporter, _), writer in zip(CHAPTER_TABLES, writers):
+        totals[table_name(exporter)] = writer.written
+
+    print(f"\n✅ Columnar export complete: {output_dir}/")
+    for table, total in totals.items():
+        print(f"   {table}.{output_format}: {total} rows")
+
+
+def main() -> None:
+    """Parse command line arguments and run the columnar export."""
+    parser = argparse.ArgumentParser(description="Export the content corpus as Parquet or Arrow IPC files.")
+    parser.add_argument(
+        '--format', choices=['parquet', 'arrow'], default='parquet', dest='output_format',
+        help="parquet (default, zstd compressed) or arrow (Arrow IPC file)"
+    )
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR, help=f"Output directory (default: {OUTPUT_DIR})")
+    add_jobs_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profiling(args):
+        generate_columnar_export(jobs=args.jobs, output_format=args.output_format, output_dir=args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the export_*_csv.py scripts.
+
+This module:
+1. Discovers universe.*.json, themes.*.json and chapter files in public/content/themes/
+2. Loads a chapter JSON file once and derives its created_at date
+3. Provides the lazy discover -> parse -> extract -> format -> write pipeline pieces
+4. Optionally runs the per-chapter work on a process pool (--jobs N)
+
+Every exporter (and export_all.py) uses these so that the content tree is
+walked and parsed the same way everywhere.
+"""
+
+import argparse
+import csv
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+from datetime import datetime
+
+from compressed_io import open_output
+from export_profile import PROFILER, profile_file, profile_stage
+
+# Paths
+CONTENT_DIR = Path("public/content/themes")
+
+# Output formats supported by the chapter exporters (see copy_format.py for the COPY ones)
+OUTPUT_FORMATS = ['csv', 'copy', 'copy-binary']
+
+# Below this many chapter files the process pool start-up costs more than it saves
+PARALLEL_MIN_FILES = 16
+
+T = TypeVar('T')
+
+
+@lru_cache(maxsize=None)
+def today() -> str:
+    """Return the current date in the YYYY-MM-DD format used for created_at/updated_at.
+
+    Computed once per process, so every row of an export run gets the same date.
+    """
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+def is_chapter_file(json_file: Path) -> bool:
+    """Check whether a JSON file inside a theme folder is a main chapter file.
+
+    We exclude themes.*.json files and level-based files (chapter.1.json, chapter.2.json, etc.).
+    """
+    # Skip themes.*.json files
+    if json_file.name.startswith("themes."):
+        return False
+    # Skip level-based files (e.g., "Chapter.1.json") - we only want the main chapter files
+    parts = json_file.stem.split('.')
+    if len(parts) > 1 and parts[-1].isdigit():
+        return False
+    return True
+
+
+def discover_content_files() -> Tuple[List[Path], List[Path]]:
+    """Walk the content directory once and return (theme_files, chapter_files).
+
+    Theme files are:   public/content/themes/{universe}/themes.*.json
+    Chapter files are: public/content/themes/{universe}/{theme}/{chapter}.json
+    """
+    theme_files = []
+    chapter_files = []
+
+    if not CONTENT_DIR.exists():
+        print(f"Content directory not found: {CONTENT_DIR}")
+        return theme_files, chapter_files
+
+    with profile_stage('discovery'):
+        # Walk through all universe folders
+        for universe_dir in CONTENT_DIR.iterdir():
+            if not universe_dir.is_dir():
+                continue
+
+            theme_files.extend(universe_dir.glob("themes.*.json"))
+
+            # Walk through all theme folders
+            for theme_dir in universe_dir.iterdir():
+                if not theme_dir.is_dir():
+                    continue
+
+                for json_file in theme_dir.glob("*.json"):
+                    if is_chapter_file(json_file):
+                        chapter_files.append(json_file)
+
+        return sorted(theme_files), sorted(chapter_files)
+
+
+def chapter_universe_id(chapter_file: Path) -> str:
+    """Return the universe folder name of a chapter file (public/content/themes/{universe}/{theme}/{chapter}.json)."""
+    return chapter_file.parent.parent.name
+
+
+def find_all_chapter_files() -> List[Path]:
+    """Find all chapter JSON files in the content directory.
+
+    Chapter files are in: public/content/themes/{universe}/{theme}/{chapter}.json
+    We exclude themes.*.json files.
+    """
+    return discover_content_files()[1]
+
+
+def find_all_theme_files() -> List[Path]:
+    """Find all themes.*.json files in the content directory."""
+    return discover_content_files()[0]
+
+
+def find_all_universe_files() -> List[Path]:
+    """Find all universe.*.json files in the content directory."""
+    with profile_stage('discovery'):
+        return sorted(CONTENT_DIR.glob("universe.*.json"))
+
+
+def load_chapter_file(file_path: Path) -> Optional[Tuple[List[Dict[str, Any]], str]]:
+    """Load a chapter JSON file and return (items, created_at), or None if it is unusable."""
+    try:
+        with profile_stage('decode'), open(file_path, 'r', encoding='utf-8') as f:
+            items = json.load(f)
+    except Exception as e:
+        print(f"Error reading {file_path}: {e}")
+        return None
+
+    if not isinstance(items, list):
+        print(f"Warning: {file_path} does not contain an array of items")
+        return None
+
+    # Get created_at from first item's meta or use current date
+    created_at = None
+    if items and isinstance(items[0], dict) and isinstance(items[0].get('meta'), dict):
+        created_at = items[0]['meta'].get('created')
+
+    # Default to current date if not found
+    if not created_at:
+        created_at = today()
+
+    return items, created_at
+
+
+def add_jobs_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the shared --jobs option to an exporter's argument parser."""
+    parser.add_argument(
+        '--jobs', '-j', type=int, default=1, metavar='N',
+        help="Parse chapter files on N worker processes (0 = one per CPU, default: 1 = serial)"
+    )
+
+
+def add_format_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the shared --format option to an exporter's argument parser."""
+    parser.add_argument(
+        '--format', choices=OUTPUT_FORMATS, default='csv', dest='output_format',
+        help="csv (default), PostgreSQL COPY text format (.copy) or COPY binary format (.pgcopy)"
+    )
+
+
+def add_incremental_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the shared --incremental option to an exporter's argument parser."""
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help="Only re-parse chapter files that changed since the last incremental export (see export_manifest.py)"
+    )
+
+
+def resolve_jobs(jobs: int, file_count: int) -> int:
+    """Return the number of worker processes to use, 1 meaning serial."""
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    if file_count < PARALLEL_MIN_FILES:
+        return 1
+    return min(jobs, file_count)
+
+
+def map_chapter_files(worker: Callable[[Path], T], chapter_files: List[Path], jobs: int = 1) -> Iterator[T]:
+    """Apply worker to every chapter file and yield the results in file order.
+
+    With jobs > 1 the files are processed on a process pool; the worker must be a
+    module-level function so it can be pickled. Small trees fall back to serial,
+    and so does --profile, which can only time work done in this process.
+    """
+    jobs = 1 if PROFILER.enabled else resolve_jobs(jobs, len(chapter_files))
+
+    if jobs == 1:
+        for chapter_file in chapter_files:
+            print(f"Processing {chapter_file}...")
+            with profile_file(chapter_file):
+                result = worker(chapter_file)
+            yield result
+        return
+
+    print(f"Processing {len(chapter_files)} chapter files on {jobs} worker processes...")
+    chunksize = max(1, len(chapter_files) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # Executor.map keeps the input order, so output stays sorted by path
+        yield from pool.map(worker, chapter_files, chunksize=chunksize)
+
+
+def row_values(row: Union[Dict[str, Any], Sequence[Any]], columns: Sequence[str]) -> Sequence[Any]:
+    """Return the values of a typed row in column order.
+
+    Rows are dicts keyed by column, or row tuples (e.g. ItemRow) whose fields are
+    the exporter's COLUMN_TYPES in order, which are returned as they are.
+    """
+    if isinstance(row, dict):
+        return [row.get(column) for column in columns]
+    return row
+
+
+def csv_row_values(row: Union[Dict[str, str], Sequence[str]], columns: Sequence[str]) -> Sequence[str]:
+    """Return a formatted CSV row in column order (dicts keyed by column or sequences in column order)."""
+    if isinstance(row, dict):
+        return [row.get(column, '') for column in columns]
+    return row
+
+
+class CsvRowWriter:
+    """csv.DictWriter replacement that also accepts rows formatted as sequences in column order."""
+
+    def __init__(self, f, columns: List[str]):
+        self.columns = columns
+        self._writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+
+    def writeheader(self) -> None:
+        self._writer.writerow(self.columns)
+
+    def writerow(self, row: Union[Dict[str, str], Sequence[str]]) -> None:
+        self._writer.writerow(csv_row_values(row, self.columns))
+
+    def writerows(self, rows: Iterable[Union[Dict[str, str], Sequence[str]]]) -> None:
+        self._writer.writerows(csv_row_values(row, self.columns) for row in rows)
+
+
+class RowTally:
+    """Running row counts, updated while rows stream through the pipeline.
+
+    If key is given, rows are also counted per value of that column
+    (e.g. object_type -> base/correct/distractor). For rows that are
+    sequences rather than dicts, key is the column position.
+    """
+
+    def __init__(self, key: Optional[Union[str, int]] = None):
+        self.key = key
+        self.total = 0
+        self.by_key = Counter()
+
+    def count(self, rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Pass rows through unchanged while counting them."""
+        for row in rows:
+            self.total += 1
+            if self.key:
+                self.by_key[row[self.key]] += 1
+            yield row
+
+
+def write_csv_rows(output_file: Path, columns: List[str], rows: Iterable[Union[Dict[str, str], Sequence[str]]]) -> int:
+    """Stream formatted rows into a CSV file and return the number of rows written."""
+    written = 0
+    with profile_stage('write'), open_output(output_file) as f:
+        writer = CsvRowWriter(f, columns)
+        writer.writeheader()
+
+        for row in rows:
+            writer.writerow(row)
+            written += 1
+
+    return written
@@ -9,19 +9,31 @@ This script:
 4. Exports to CSV in the format required for public.items table
 """
 
-import json
-import csv
+import argparse
+from collections import namedtuple
+from functools import partial
+from itertools import chain
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional
+
+import content_uuids
+from compressed_io import add_compress_argument, check_compress_argument, compressed_file
+from copy_format import copy_output_file, copy_statement, write_copy_rows
+from export_common import (
+    CONTENT_DIR, RowTally, add_format_argument, add_incremental_argument, add_jobs_argument, chapter_universe_id,
+    find_all_chapter_files, load_chapter_file, map_chapter_files, today, write_csv_rows
+)
+from export_manifest import single_table, write_incremental_csv
+from export_profile import add_profile_arguments, profile_stage, profiling
 
 # Paths
-CONTENT_DIR = Path("public/content/themes")
 OUTPUT_CSV_FILE = Path("items_export.csv")
 
-# CSV columns matching the database table structure (without id)
+# CSV columns matching the database table structure
 CSV_COLUMNS = [
+    "uuid",
     "round_id",
+    "round_uuid",
     "object_type",
     "collectionorder",
     "word",
@@ -46,132 +58,148 @@ CSV_COLUMNS = [
     "updated_at"
 ]
 
-
-def extract_base_item(round_id: str, base: Dict[str, Any], created_at: str) -> Dict[str, Any]:
+# PostgreSQL table and column types for COPY output - see copy_format.py
+COPY_TABLE = "public.items"
+COLUMN_TYPES = {
+    "uuid": "uuid",
+    "round_id": "text",
+    "round_uuid": "uuid",
+    "object_type": "text",
+    "collectionorder": "integer",
+    "word": "text",
+    "type": "text",
+    "image": "text",
+    "context": "text",
+    "behavior": "text",
+    "damage": "integer",
+    "redirect": "text",
+    "spawn_position": "double precision",
+    "spawn_spread": "double precision",
+    "spawn_delay": "double precision",
+    "speed": "double precision",
+    "points": "integer",
+    "hp": "integer",
+    "sound": "text",
+    "color": "text",
+    "variant": "text",
+    "pulsate": "boolean",
+    "font_size": "double precision",
+    "created_at": "timestamptz",
+    "updated_at": "timestamptz"
+}
+
+# Typed item row - a tuple with the COLUMN_TYPES fields in order (no per-row dict)
+ItemRow = namedtuple('ItemRow', list(COLUMN_TYPES))
+
+
+def extract_base_item(round_id: str, base: Dict[str, Any], created_at: str, item_uuid: str, round_uuid: str) -> ItemRow:
     """Extract base item data."""
     entry = base  # Base doesn't have nested entry structure
     visual = entry.get('visual', {})
     
-    return {
-        'round_id': round_id,
-        'object_type': 'base',
-        'collectionorder': 0,  # Default for base
-        'word': entry.get('word'),
-        'type': entry.get('type'),
-        'image': entry.get('image'),
-        'context': None,
-        'behavior': None,
-        'damage': None,
-        'redirect': None,
-        'spawn_position': None,
-        'spawn_spread': None,
-        'spawn_delay': None,
-        'speed': None,
-        'points': None,
-        'hp': None,
-        'sound': None,
-        'color': visual.get('color'),
-        'variant': visual.get('variant'),
-        'pulsate': visual.get('pulsate'),
-        'font_size': visual.get('fontSize'),
-        'created_at': created_at,
-        'updated_at': datetime.now().strftime('%Y-%m-%d')
-    }
-
-
-def extract_correct_item(round_id: str, correct: Dict[str, Any], order_index: int, created_at: str) -> Dict[str, Any]:
+    return ItemRow(
+        uuid=item_uuid,
+        round_id=round_id,
+        round_uuid=round_uuid,
+        object_type='base',
+        collectionorder=0,  # Default for base
+        word=entry.get('word'),
+        type=entry.get('type'),
+        image=entry.get('image'),
+        context=None,
+        behavior=None,
+        damage=None,
+        redirect=None,
+        spawn_position=None,
+        spawn_spread=None,
+        spawn_delay=None,
+        speed=None,
+        points=None,
+        hp=None,
+        sound=None,
+        color=visual.get('color'),
+        variant=visual.get('variant'),
+        pulsate=visual.get('pulsate'),
+        font_size=visual.get('fontSize'),
+        created_at=created_at,
+        updated_at=today()
+    )
+
+
+def extract_correct_item(
+    round_id: str, correct: Dict[str, Any], order_index: int, created_at: str, item_uuid: str, round_uuid: str
+) -> ItemRow:
     """Extract correct item data."""
     entry = correct.get('entry', {})
     visual = correct.get('visual', {})
     
-    return {
-        'round_id': round_id,
-        'object_type': 'correct',
-        'collectionorder': correct.get('collectionOrder', order_index),
-        'word': entry.get('word'),
-        'type': entry.get('type'),
-        'image': entry.get('image'),
-        'context': correct.get('context'),
-        'behavior': None,
-        'damage': None,
-        'redirect': None,
-        'spawn_position': correct.get('spawnPosition'),
-        'spawn_spread': correct.get('spawnSpread'),
-        'spawn_delay': correct.get('spawnDelay'),
-        'speed': correct.get('speed'),
-        'points': correct.get('points'),
-        'hp': correct.get('hp'),
-        'sound': correct.get('sound'),
-        'color': visual.get('color'),
-        'variant': visual.get('variant'),
-        'pulsate': visual.get('pulsate'),
-        'font_size': visual.get('fontSize'),
-        'created_at': created_at,
-        'updated_at': datetime.now().strftime('%Y-%m-%d')
-    }
-
-
-def extract_distractor_item(round_id: str, distractor: Dict[str, Any], order_index: int, created_at: str) -> Dict[str, Any]:
+    return ItemRow(
+        uuid=item_uuid,
+        round_id=round_id,
+        round_uuid=round_uuid,
+        object_type='correct',
+        collectionorder=correct.get('collectionOrder', order_index),
+        word=entry.get('word'),
+        type=entry.get('type'),
+        image=entry.get('image'),
+        context=correct.get('context'),
+        behavior=None,
+        damage=None,
+        redirect=None,
+        spawn_position=correct.get('spawnPosition'),
+        spawn_spread=correct.get('spawnSpread'),
+        spawn_delay=correct.get('spawnDelay'),
+        speed=correct.get('speed'),
+        points=correct.get('points'),
+        hp=correct.get('hp'),
+        sound=correct.get('sound'),
+        color=visual.get('color'),
+        variant=visual.get('variant'),
+        pulsate=visual.get('pulsate'),
+        font_size=visual.get('fontSize'),
+        created_at=created_at,
+        updated_at=today()
+    )
+
+
+def extract_distractor_item(
+    round_id: str, distractor: Dict[str, Any], order_index: int, created_at: str, item_uuid: str, round_uuid: str
+) -> ItemRow:
     """Extract distractor item data."""
     entry = distractor.get('entry', {})
     visual = distractor.get('visual', {})
     
-    return {
-        'round_id': round_id,
-        'object_type': 'distractor',
-        'collectionorder': 0,  # Default for distractors
-        'word': entry.get('word'),
-        'type': entry.get('type'),
-        'image': entry.get('image'),
-        'context': distractor.get('context'),
-        'behavior': distractor.get('behavior'),
-        'damage': distractor.get('damage'),
-        'redirect': distractor.get('redirect'),
-        'spawn_position': distractor.get('spawnPosition'),
-        'spawn_spread': distractor.get('spawnSpread'),
-        'spawn_delay': distractor.get('spawnDelay'),
-        'speed': distractor.get('speed'),
-        'points': distractor.get('points'),
-        'hp': distractor.get('hp'),
-        'sound': distractor.get('sound'),
-        'color': visual.get('color'),
-        'variant': visual.get('variant'),
-        'pulsate': visual.get('pulsate'),
-        'font_size': visual.get('fontSize'),
-        'created_at': created_at,
-        'updated_at': datetime.now().strftime('%Y-%m-%d')
-    }
-
-
-def process_chapter_file(file_path: Path) -> List[Dict[str, Any]]:
-    """Process a single chapter JSON file and return list of item rows."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            items = json.load(f)
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}")
-        return []
-    
-    if not isinstance(items, list):
-        print(f"Warning: {file_path} does not contain an array of items")
-        return []
-    
-    if len(items) == 0:
-        return []
-    
-    # Get created_at from first item's meta or use current date
-    created_at = None
-    if items and 'meta' in items[0] and isinstance(items[0]['meta'], dict):
-        meta = items[0]['meta']
-        if 'created' in meta:
-            created_at = meta['created']
-    
-    # Default to current date if not found
-    if not created_at:
-        created_at = datetime.now().strftime('%Y-%m-%d')
-    
-    item_rows = []
-    
+    return ItemRow(
+        uuid=item_uuid,
+        round_id=round_id,
+        round_uuid=round_uuid,
+        object_type='distractor',
+        collectionorder=0,  # Default for distractors
+        word=entry.get('word'),
+        type=entry.get('type'),
+        image=entry.get('image'),
+        context=distractor.get('context'),
+        behavior=distractor.get('behavior'),
+        damage=distractor.get('damage'),
+        redirect=distractor.get('redirect'),
+        spawn_position=distractor.get('spawnPosition'),
+        spawn_spread=distractor.get('spawnSpread'),
+        spawn_delay=distractor.get('spawnDelay'),
+        speed=distractor.get('speed'),
+        points=distractor.get('points'),
+        hp=distractor.get('hp'),
+        sound=distractor.get('sound'),
+        color=visual.get('color'),
+        variant=visual.get('variant'),
+        pulsate=visual.get('pulsate'),
+        font_size=visual.get('fontSize'),
+        created_at=created_at,
+        updated_at=today()
+    )
+
+
+def extract_item_rows(items: List[Any], created_at: str, universe_id: str) -> Iterator[ItemRow]:
+    """Lazily extract item rows from the parsed items of a chapter file in the given universe folder."""
     for item in items:
         if not isinstance(item, dict):
             continue
@@ -182,63 +210,38 @@ def process_chapter_file(file_path: Path) -> List[Dict[str, Any]]:
             print(f"Warning: Skipping item with missing id")
             continue
         
+        # Deterministic keys from the content path (see content_uuids.py)
+        path = (universe_id, item.get('theme', ''), item.get('chapter', ''), round_id)
+        round_uuid = content_uuids.round_uuid(*path)
+        
         # Extract base item
         base = item.get('base')
         if base:
-            base_item = extract_base_item(round_id, base, created_at)
-            item_rows.append(base_item)
+            yield extract_base_item(round_id, base, created_at, content_uuids.object_uuid(*path, 'base', 0), round_uuid)
         
         # Extract correct items
         corrects = item.get('correct', [])
         if isinstance(corrects, list):
             for idx, correct in enumerate(corrects):
-                correct_item = extract_correct_item(round_id, correct, idx, created_at)
-                item_rows.append(correct_item)
+                item_uuid = content_uuids.object_uuid(*path, 'correct', idx)
+                yield extract_correct_item(round_id, correct, idx, created_at, item_uuid, round_uuid)
         
         # Extract distractor items
         distractors = item.get('distractors', [])
         if isinstance(distractors, list):
             for idx, distractor in enumerate(distractors):
-                distractor_item = extract_distractor_item(round_id, distractor, idx, created_at)
-                item_rows.append(distractor_item)
-    
-    return item_rows
+                item_uuid = content_uuids.object_uuid(*path, 'distractor', idx)
+                yield extract_distractor_item(round_id, distractor, idx, created_at, item_uuid, round_uuid)
 
 
-def find_all_chapter_files() -> List[Path]:
-    """Find all chapter JSON files in the content directory.
-    
-    Chapter files are in: public/content/themes/{universe}/{theme}/{chapter}.json
-    We exclude themes.*.json files.
-    """
-    chapter_files = []
-    
-    # Walk through all universe folders
-    for universe_dir in CONTENT_DIR.iterdir():
-        if not universe_dir.is_dir():
-            continue
-        
-        # Walk through all theme folders
-        for theme_dir in universe_dir.iterdir():
-            if not theme_dir.is_dir():
-                continue
-            
-            # Find all JSON files in theme folder (excluding themes.*.json)
-            for json_file in theme_dir.glob("*.json"):
-                # Skip themes.*.json files
-                if json_file.name.startswith("themes."):
-                    continue
-                # Skip level-based files (chapter.1.json, chapter.2.json, etc.)
-                # We only want the main chapter files
-                if any(char.isdigit() for char in json_file.stem.split('.')[-1] if '.' in json_file.stem):
-                    # Check if it's a level file (e.g., "Chapter.1.json")
-                    parts = json_file.stem.split('.')
-                    if len(parts) > 1 and parts[-1].isdigit():
-                        continue
-                
-                chapter_files.append(json_file)
-    
-    return sorted(chapter_files)
+def process_chapter_file(file_path: Path) -> List[ItemRow]:
+    """Process a single chapter JSON file and return list of item rows."""
+    loaded = load_chapter_file(file_path)
+    if not loaded:
+        return []
+    items, created_at = loaded
+    with profile_stage('extract'):
+        return list(extract_item_rows(items, created_at, chapter_universe_id(file_path)))
 
 
 def format_value_for_csv(value: Any) -> str:
@@ -250,8 +253,22 @@ def format_value_for_csv(value: Any) -> str:
     return str(value)
 
 
-def generate_csv_export() -> None:
-    """Generate CSV export of all items."""
+def format_csv_row(item: ItemRow) -> List[str]:
+    """Format an item row for CSV (in CSV_COLUMNS order) - empty strings for None values."""
+    return [format_value_for_csv(value) for value in item]
+
+
+def format_chapter_file(file_path: Path) -> List[List[str]]:
+    """Parse a chapter file and return its CSV-formatted item rows (process pool worker)."""
+    rows = process_chapter_file(file_path)
+    with profile_stage('format'):
+        return [format_csv_row(row) for row in rows]
+
+
+def generate_csv_export(
+    jobs: int = 1, incremental: bool = False, output_format: str = 'csv', compress: Optional[str] = None
+) -> None:
+    """Generate CSV (or PostgreSQL COPY) export of all items."""
     chapter_files = find_all_chapter_files()
     
     if not chapter_files:
@@ -260,65 +277,60 @@ def generate_csv_export() -> None:
     
     print(f"Found {len(chapter_files)} chapter files")
     
-    all_items = []
-    
-    for chapter_file in chapter_files:
-        print(f"Processing {chapter_file}...")
-        items = process_chapter_file(chapter_file)
-        all_items.extend(items)
-        print(f"  Found {len(items)} items")
-    
-    print(f"\nTotal items: {len(all_items)}")
-    
-    # Count by type
-    base_count = sum(1 for item in all_items if item['object_type'] == 'base')
-    correct_count = sum(1 for item in all_items if item['object_type'] == 'correct')
-    distractor_count = sum(1 for item in all_items if item['object_type'] == 'distractor')
+    if incremental:
+        (total,), reparsed = write_incremental_csv(
+            [(OUTPUT_CSV_FILE, CSV_COLUMNS)], chapter_files, partial(single_table, format_chapter_file), jobs
+        )
+        print(f"\n✅ Incremental CSV export complete: {OUTPUT_CSV_FILE}")
+        print(f"   Exported {total} items ({reparsed} chapter files re-parsed)")
+        return
     
-    print(f"  - Base items: {base_count}")
-    print(f"  - Correct items: {correct_count}")
-    print(f"  - Distractor items: {distractor_count}")
+    # Formatted and typed item rows both hold object_type at the same position
+    tally = RowTally(key=CSV_COLUMNS.index('object_type'))
+    if output_format == 'csv':
+        # Rows stream straight from the chapter files into the output file; counts are running tallies
+        output_file = compressed_file(OUTPUT_CSV_FILE, compress)
+        rows = chain.from_iterable(map_chapter_files(format_chapter_file, chapter_files, jobs))
+        write_csv_rows(output_file, CSV_COLUMNS, tally.count(rows))
+    else:
+        binary = output_format == 'copy-binary'
+        output_file = compressed_file(copy_output_file(OUTPUT_CSV_FILE, binary), compress)
+        rows = chain.from_iterable(map_chapter_files(process_chapter_file, chapter_files, jobs))
+        write_copy_rows(output_file, COLUMN_TYPES, tally.count(rows), binary)
     
-    # Write CSV file
-    with open(OUTPUT_CSV_FILE, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS, quoting=csv.QUOTE_MINIMAL)
-        writer.writeheader()
-        
-        for item in all_items:
-            # Format row for CSV - empty strings for None values
-            csv_row = {
-                'round_id': format_value_for_csv(item['round_id']),
-                'object_type': format_value_for_csv(item['object_type']),
-                'collectionorder': format_value_for_csv(item['collectionorder']),
-                'word': format_value_for_csv(item['word']),
-                'type': format_value_for_csv(item['type']),
-                'image': format_value_for_csv(item['image']),
-                'context': format_value_for_csv(item['context']),
-                'behavior': format_value_for_csv(item['behavior']),
-                'damage': format_value_for_csv(item['damage']),
-                'redirect': format_value_for_csv(item['redirect']),
-                'spawn_position': format_value_for_csv(item['spawn_position']),
-                'spawn_spread': format_value_for_csv(item['spawn_spread']),
-                'spawn_delay': format_value_for_csv(item['spawn_delay']),
-                'speed': format_value_for_csv(item['speed']),
-                'points': format_value_for_csv(item['points']),
-                'hp': format_value_for_csv(item['hp']),
-                'sound': format_value_for_csv(item['sound']),
-                'color': format_value_for_csv(item['color']),
-                'variant': format_value_for_csv(item['variant']),
-                'pulsate': format_value_for_csv(item['pulsate']),
-                'font_size': format_value_for_csv(item['font_size']),
-                'created_at': format_value_for_csv(item['created_at']),
-                'updated_at': format_value_for_csv(item['updated_at'])
-            }
-            writer.writerow(csv_row)
+    print(f"\nTotal items: {tally.total}")
+    print(f"  - Base items: {tally.by_key['base']}")
+    print(f"  - Correct items: {tally.by_key['correct']}")
+    print(f"  - Distractor items: {tally.by_key['distractor']}")
     
-    print(f"\n✅ CSV export complete: {OUTPUT_CSV_FILE}")
-    print(f"   Exported {len(all_items)} items")
+    print(f"\n✅ {'CSV' if output_format == 'csv' else 'COPY'} export complete: {output_file}")
+    if output_format != 'csv':
+        print(f"   Load with: {copy_statement(COPY_TABLE, list(COLUMN_TYPES), binary)}")
+    print(f"   Exported {tally.total} items")
+
+
+def main() -> None:
+    """Parse command line arguments and run the export."""
+    parser = argparse.ArgumentParser(description="Export all items from chapter JSON files to CSV.")
+    add_jobs_argument(parser)
+    add_incremental_argument(parser)
+    add_format_argument(parser)
+    add_compress_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if args.incremental and args.output_format != 'csv':
+        parser.error("--incremental is only supported for --format csv")
+    if args.incremental and args.compress:
+        parser.error("--incremental is not supported with --compress")
+    check_compress_argument(parser, args.compress)
+    with profiling(args):
+        generate_csv_export(
+            jobs=args.jobs, incremental=args.incremental, output_format=args.output_format, compress=args.compress
+        )
 
 
 if __name__ == "__main__":
-    generate_csv_export()
+    main()
 
 
 
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Incremental CSV export backed by a content-hash manifest.
+
+Next to every exported CSV (e.g. items_export.csv) a manifest
+(items_export.csv.manifest.json) records, for each source chapter file:
+- size, mtime and sha256 of the chapter file
+- the data row range and byte range it produced in the CSV
+
+On the next incremental run only chapter files whose content changed are
+re-parsed. Rows of unchanged files are copied byte-for-byte from the previous
+output, and the new rows of changed files are spliced in at their sorted position.
+If the manifest is missing, was written for different columns, or the CSV was
+rewritten by a non-incremental run, the export falls back to a full rebuild.
+"""
+
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from export_common import CsvRowWriter, map_chapter_files
+from export_profile import profile_stage
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+def manifest_path(output_file: Path) -> Path:
+    """Return the manifest path belonging to an output CSV file."""
+    return output_file.with_name(output_file.name + MANIFEST_SUFFIX)
+
+
+def hash_file(file_path: Path) -> str:
+    """Return the sha256 hex digest of a file's content."""
+    with profile_stage('hash'), open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def encode_csv_rows(columns: List[str], rows: List[Any]) -> bytes:
+    """Format rows exactly like write_csv_rows() does and return the bytes."""
+    buffer = io.StringIO(newline='')
+    writer = CsvRowWriter(buffer, columns)
+    writer.writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+
+def encode_csv_header(columns: List[str]) -> bytes:
+    """Return the CSV header line as bytes."""
+    buffer = io.StringIO(newline='')
+    CsvRowWriter(buffer, columns).writeheader()
+    return buffer.getvalue().encode('utf-8')
+
+
+class ExportManifest:
+    """Per-output record of which chapter file produced which rows/bytes."""
+
+    def __init__(self, output_file: Path, columns: List[str], files: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.output_file = output_file
+        self.columns = columns
+        self.files = files or {}
+
+    @classmethod
+    def load(cls, output_file: Path, columns: List[str]) -> Optional['ExportManifest']:
+        """Load the manifest for output_file, or None if it is missing or no longer matches the output."""
+        path = manifest_path(output_file)
+        if not path.exists() or not output_file.exists():
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable manifest {path}: {e}")
+            return None
+
+        if data.get('version') != MANIFEST_VERSION or data.get('columns') != columns:
+            return None
+
+        # The CSV must be exactly the one this manifest describes
+        stat = output_file.stat()
+        output = data.get('output', {})
+        if output.get('size') != stat.st_size or output.get('mtime_ns') != stat.st_mtime_ns:
+            print(f"Note: {output_file} was modified outside of incremental export, rebuilding it")
+            return None
+
+        return cls(output_file, columns, data.get('files', {}))
+
+    def save(self) -> None:
+        """Write the manifest next to its (already written) output file."""
+        stat = self.output_file.stat()
+        data = {
+            'version': MANIFEST_VERSION,
+            'columns': self.columns,
+            'output': {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns},
+            'files': self.files,
+        }
+        with open(manifest_path(self.output_file), 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+class SourceState:
+    """Size/mtime/hash of a chapter file, hashing lazily and at most once."""
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        stat = file_path.stat()
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self._sha256 = None
+
+    @property
+    def sha256(self) -> str:
+        if self._sha256 is None:
+            self._sha256 = hash_file(self.file_path)
+        return self._sha256
+
+    def matches(self, entry: Optional[Dict[str, Any]]) -> bool:
+        """Check whether a manifest entry describes this exact file content."""
+        if not entry:
+            return False
+        if entry.get('size') == self.size and entry.get('mtime_ns') == self.mtime_ns:
+            return True
+        # Touched but possibly not edited (e.g. git checkout) - compare content
+        return entry.get('size') == self.size and entry.get('sha256') == self.sha256
+
+
+def single_table(worker: Callable[[Path], List[Dict[str, str]]], file_path: Path) -> List[List[Dict[str, str]]]:
+    """Adapt a one-table worker to the list-of-tables shape (use with functools.partial)."""
+    return [worker(file_path)]
+
+
+def write_incremental_csv(
+    outputs: List[Tuple[Path, List[str]]],
+    chapter_files: List[Path],
+    worker: Callable[[Path], List[List[Dict[str, str]]]],
+    jobs: int = 1
+) -> Tuple[List[int], int]:
+    """Incrementally (re)write one or more CSV outputs fed from the same chapter files.
+
+    outputs is a list of (output_file, columns); worker returns the formatted rows of
+    one chapter file per output, in the same order. Returns (row totals per output,
+    number of chapter files that had to be re-parsed).
+    """
+    manifests = [ExportManifest.load(output_file, columns) for output_file, columns in outputs]
+
+    # Decide per chapter file whether every output still has valid rows for it
+    states = {}
+    changed = []
+    for chapter_file in chapter_files:
+        key = chapter_file.as_posix()
+        state = SourceState(chapter_file)
+        states[key] = state
+        if not all(manifest and state.matches(manifest.files.get(key)) for manifest in manifests):
+            changed.append(chapter_file)
+
+    print(f"{len(chapter_files) - len(changed)} chapter files unchanged, {len(changed)} to re-parse")
+
+    fresh_results = map_chapter_files(worker, changed, jobs)
+    changed_keys = {chapter_file.as_posix() for chapter_file in changed}
+
+    old_handles = []
+    new_handles = []
+    new_manifests = []
+    try:
+        for (output_file, columns), manifest in zip(outputs, manifests):
+            old_handles.append(open(output_file, 'rb') if manifest else None)
+            tmp_file = output_file.with_name(output_file.name + '.tmp')
+            handle = open(tmp_file, 'wb')
+            handle.write(encode_csv_header(columns))
+            new_handles.append(handle)
+            new_manifests.append(ExportManifest(output_file, columns))
+
+        row_counts = [0] * len(outputs)
+
+        for chapter_file in chapter_files:
+            key = chapter_file.as_posix()
+            state = states[key]
+            table_rows = next(fresh_results) if key in changed_keys else None
+
+            for index, manifest in enumerate(manifests):
+                out = new_handles[index]
+                start_byte = out.tell()
+                start_row = row_counts[index]
+
+                if table_rows is None:
+                    # Unchanged: copy the previous bytes for this chapter file
+                    old_entry = manifest.files[key]
+                    old_start, old_end = old_entry['bytes']
+                    old_handle = old_handles[index]
+                    with profile_stage('write'):
+                        old_handle.seek(old_start)
+                        out.write(old_handle.read(old_end - old_start))
+                    row_counts[index] += old_entry['rows'][1] - old_entry['rows'][0]
+                    sha256 = old_entry['sha256']
+                else:
+                    rows = table_rows[index]
+                    with profile_stage('write'):
+                        out.write(encode_csv_rows(outputs[index][1], rows))
+                    row_counts[index] += len(rows)
+                    sha256 = state.sha256
+
+                new_manifests[index].files[key] = {
+                    'size': state.size,
+                    'mtime_ns': state.mtime_ns,
+                    'sha256': sha256,
+                    'rows': [start_row, row_counts[index]],
+                    'bytes': [start_byte, out.tell()],
+                }
+    finally:
+        for handle in old_handles + new_handles:
+            if handle:
+                handle.close()
+
+    for (output_file, _), new_manifest in zip(outputs, new_manifests):
+        os.replace(output_file.with_name(output_file.name + '.tmp'), output_file)
+        new_manifest.save()
+
+    return row_counts, len(changed)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing and profiling hooks for the export scripts.
+
+The exporters wrap their pipeline stages in profile_stage() and every parsed
+file in profile_file(). With --profile these record:
+1. Wall and CPU time per stage (discovery, decode, extract, format, write)
+2. Wall and CPU time per source file, reported slowest first
+3. Optionally a cProfile dump (--cprofile FILE) and a tracemalloc snapshot (--tracemalloc FILE)
+
+Stage time is exclusive: when a lazy pipeline pulls rows into the write stage,
+the time spent decoding, extracting and formatting them is charged to those
+stages, not to write. Without --profile the hooks are no-ops.
+
+Inspect the dumps with:
+    python -m pstats export.prof
+    python -c "import tracemalloc; s = tracemalloc.Snapshot.load('export.tracemalloc'); ..."
+"""
+
+import argparse
+import cProfile
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import ContextManager, Iterator, Optional
+
+# Stages in report order; other stage names are reported after these
+STAGES = ['discovery', 'decode', 'extract', 'format', 'write']
+
+# Number of files / allocation sites listed in the report
+TOP_FILES = 15
+TOP_ALLOCATIONS = 10
+
+_NO_OP = nullcontext()
+
+
+class StageProfiler:
+    """Collects exclusive wall/CPU time per stage and inclusive time per file."""
+
+    def __init__(self):
+        self.enabled = False
+        self.wall = defaultdict(float)
+        self.cpu = defaultdict(float)
+        self.calls = Counter()
+        self.files = {}
+        self._stack = []
+
+    def _charge_top(self, wall_now: float, cpu_now: float) -> None:
+        """Charge the time since the innermost open stage (re)started to that stage."""
+        entry = self._stack[-1]
+        self.wall[entry[0]] += wall_now - entry[1]
+        self.cpu[entry[0]] += cpu_now - entry[2]
+        entry[1] = wall_now
+        entry[2] = cpu_now
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block as stage name, pausing the enclosing stage meanwhile."""
+        wall_now, cpu_now = time.perf_counter(), time.process_time()
+        if self._stack:
+            self._charge_top(wall_now, cpu_now)
+        self._stack.append([name, wall_now, cpu_now])
+        self.calls[name] += 1
+        try:
+            yield
+        finally:
+            wall_now, cpu_now = time.perf_counter(), time.process_time()
+            self._charge_top(wall_now, cpu_now)
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][1] = wall_now
+                self._stack[-1][2] = cpu_now
+
+    @contextmanager
+    def file(self, file_path: Path) -> Iterator[None]:
+        """Time all work done for one source file."""
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = self.files.get(str(file_path), (0.0, 0.0))
+            self.files[str(file_path)] = (
+                wall + time.perf_counter() - wall_start,
+                cpu + time.process_time() - cpu_start,
+            )
+
+    def report(self, total_wall: float, total_cpu: float) -> None:
+        """Print the stage table and the slowest files."""
+        print("\n⏱️  Profile (exclusive time per stage)")
+        print(f"   {'stage':<10} {'wall s':>9} {'cpu s':>9} {'wall %':>7} {'calls':>8}")
+
+        names = [name for name in STAGES if name in self.calls]
+        names += sorted(name for name in self.calls if name not in STAGES)
+        for name in names:
+            share = self.wall[name] / total_wall * 100 if total_wall else 0.0
+            print(f"   {name:<10} {self.wall[name]:>9.3f} {self.cpu[name]:>9.3f} {share:>6.1f}% {self.calls[name]:>8}")
+
+        other_wall = total_wall - sum(self.wall.values())
+        other_cpu = total_cpu - sum(self.cpu.values())
+        print(f"   {'other':<10} {other_wall:>9.3f} {other_cpu:>9.3f}")
+        print(f"   {'total':<10} {total_wall:>9.3f} {total_cpu:>9.3f}")
+
+        if self.files:
+            slowest = sorted(self.files.items(), key=lambda entry: entry[1][0], reverse=True)[:TOP_FILES]
+            print(f"\n   Slowest files ({len(slowest)} of {len(self.files)}):")
+            for path, (wall, cpu) in slowest:
+                print(f"   {wall:>9.4f}s wall {cpu:>9.4f}s cpu  {path}")
+
+
+PROFILER = StageProfiler()
+
+
+def profile_stage(name: str) -> ContextManager[None]:
+    """Context manager timing a pipeline stage (no-op unless profiling)."""
+    return PROFILER.stage(name) if PROFILER.enabled else _NO_OP
+
+
+def profile_file(file_path: Path) -> ContextManager[None]:
+    """Context manager timing the work for one source file (no-op unless profiling)."""
+    return PROFILER.file(file_path) if PROFILER.enabled else _NO_OP
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the shared --profile/--cprofile/--tracemalloc options to an exporter's argument parser."""
+    parser.add_argument(
+        '--profile', action='store_true',
+        help="Report wall/CPU time per stage and the slowest files (runs serially)"
+    )
+    parser.add_argument('--cprofile', type=Path, metavar='FILE', help="Also write cProfile stats to FILE (implies --profile)")
+    parser.add_argument(
+        '--tracemalloc', type=Path, metavar='FILE', help="Also write a tracemalloc snapshot to FILE (implies --profile)"
+    )
+
+
+@contextmanager
+def profiling(args: Optional[argparse.Namespace]) -> Iterator[None]:
+    """Enable the profiler for the duration of an export, as requested by the parsed arguments."""
+    cprofile_file = getattr(args, 'cprofile', None)
+    tracemalloc_file = getattr(args, 'tracemalloc', None)
+    if not (getattr(args, 'profile', False) or cprofile_file or tracemalloc_file):
+        yield
+        return
+
+    PROFILER.enabled = True
+    profiler = cProfile.Profile() if cprofile_file else None
+    if tracemalloc_file:
+        tracemalloc.start()
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        total_wall = time.perf_counter() - wall_start
+        total_cpu = time.process_time() - cpu_start
+        PROFILER.enabled = False
+
+        PROFILER.report(total_wall, total_cpu)
+
+        if profiler:
+            profiler.dump_stats(cprofile_file)
+            print(f"\n   cProfile stats written to {cprofile_file} (view with: python -m pstats {cprofile_file})")
+
+        if tracemalloc_file:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            snapshot.dump(str(tracemalloc_file))
+            print(f"\n   Peak traced memory: {peak / 1_000_000:.1f} MB")
+            print(f"   Top {TOP_ALLOCATIONS} allocation sites still alive at the end:")
+            for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]:
+                print(f"   {stat}")
+            print(f"   tracemalloc snapshot written to {tracemalloc_file}")
@@ -9,14 +9,24 @@ This script:
 4. Exports to CSV in the format required for public.round_objects table
 """
 
+import argparse
 import json
-import csv
+from collections import namedtuple
+from functools import partial
+from itertools import chain
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional
+
+from compressed_io import add_compress_argument, check_compress_argument, compressed_file
+from copy_format import copy_output_file, copy_statement, write_copy_rows
+from export_common import (
+    CONTENT_DIR, RowTally, add_format_argument, add_incremental_argument, add_jobs_argument, chapter_universe_id,
+    find_all_chapter_files, load_chapter_file, map_chapter_files, today, write_csv_rows
+)
+from export_manifest import single_table, write_incremental_csv
+from export_profile import add_profile_arguments, profile_stage, profiling
 
 # Paths
-CONTENT_DIR = Path("public/content/themes")
 OUTPUT_CSV_FILE = Path("round_objects_export.csv")
 
 # CSV columns matching the database table structure
@@ -46,6 +56,36 @@ CSV_COLUMNS = [
     "updated_at"
 ]
 
+# PostgreSQL table and column types for COPY output (id is a bigserial and left to the DB) - see copy_format.py
+COPY_TABLE = "public.round_objects"
+COLUMN_TYPES = {
+    "round_id": "text",
+    "theme_id": "text",
+    "object_type": "text",
+    "order_index": "integer",
+    "word": "text",
+    "entry_type": "text",
+    "image": "text",
+    "visual": "jsonb",
+    "spawn_position": "numeric",
+    "spawn_spread": "numeric",
+    "speed": "numeric",
+    "points": "integer",
+    "hp": "integer",
+    "pattern": "text",
+    "collection_order": "integer",
+    "damage": "integer",
+    "behavior": "text",
+    "redirect": "text",
+    "context": "text",
+    "sound": "text",
+    "created_at": "timestamptz",
+    "updated_at": "timestamptz"
+}
+
+# Typed round object row - a tuple with the COLUMN_TYPES fields in order (no per-row dict)
+RoundObjectRow = namedtuple('RoundObjectRow', list(COLUMN_TYPES))
+
 
 def format_jsonb_for_csv(value: Any) -> str:
     """Format value as JSON string for CSV."""
@@ -56,125 +96,102 @@ def format_jsonb_for_csv(value: Any) -> str:
     return json_str
 
 
-def extract_base_object(round_id: str, theme_id: str, base: Dict[str, Any], created_at: str) -> Dict[str, Any]:
+def extract_base_object(round_id: str, theme_id: str, base: Dict[str, Any], created_at: str) -> RoundObjectRow:
     """Extract base object data."""
     entry = base  # Base doesn't have nested entry structure
     
-    return {
-        'round_id': round_id,
-        'theme_id': theme_id,
-        'object_type': 'base',
-        'order_index': 0,
-        'word': entry.get('word'),
-        'entry_type': entry.get('type'),
-        'image': entry.get('image'),
-        'visual': entry.get('visual', {}),
-        'spawn_position': None,
-        'spawn_spread': None,
-        'speed': None,
-        'points': None,
-        'hp': None,
-        'pattern': None,
-        'collection_order': None,
-        'damage': None,
-        'behavior': None,
-        'redirect': None,
-        'context': None,
-        'sound': None,
-        'created_at': created_at,
-        'updated_at': datetime.now().strftime('%Y-%m-%d')
-    }
-
-
-def extract_correct_object(round_id: str, theme_id: str, correct: Dict[str, Any], order_index: int, created_at: str) -> Dict[str, Any]:
+    return RoundObjectRow(
+        round_id=round_id,
+        theme_id=theme_id,
+        object_type='base',
+        order_index=0,
+        word=entry.get('word'),
+        entry_type=entry.get('type'),
+        image=entry.get('image'),
+        visual=entry.get('visual', {}),
+        spawn_position=None,
+        spawn_spread=None,
+        speed=None,
+        points=None,
+        hp=None,
+        pattern=None,
+        collection_order=None,
+        damage=None,
+        behavior=None,
+        redirect=None,
+        context=None,
+        sound=None,
+        created_at=created_at,
+        updated_at=today()
+    )
+
+
+def extract_correct_object(round_id: str, theme_id: str, correct: Dict[str, Any], order_index: int, created_at: str) -> RoundObjectRow:
     """Extract correct object data."""
     entry = correct.get('entry', {})
     
-    return {
-        'round_id': round_id,
-        'theme_id': theme_id,
-        'object_type': 'correct',
-        'order_index': order_index,
-        'word': entry.get('word'),
-        'entry_type': entry.get('type'),
-        'image': entry.get('image'),
-        'visual': correct.get('visual', {}),
-        'spawn_position': correct.get('spawnPosition'),
-        'spawn_spread': correct.get('spawnSpread'),
-        'speed': correct.get('speed'),
-        'points': correct.get('points'),
-        'hp': correct.get('hp'),
-        'pattern': correct.get('pattern'),
-        'collection_order': correct.get('collectionOrder'),
-        'damage': None,
-        'behavior': None,
-        'redirect': None,
-        'context': correct.get('context'),
-        'sound': correct.get('sound'),
-        'created_at': created_at,
-        'updated_at': datetime.now().strftime('%Y-%m-%d')
-    }
-
-
-def extract_distractor_object(round_id: str, theme_id: str, distractor: Dict[str, Any], order_index: int, created_at: str) -> Dict[str, Any]:
+    return RoundObjectRow(
+        round_id=round_id,
+        theme_id=theme_id,
+        object_type='correct',
+        order_index=order_index,
+        word=entry.get('word'),
+        entry_type=entry.get('type'),
+        image=entry.get('image'),
+        visual=correct.get('visual', {}),
+        spawn_position=correct.get('spawnPosition'),
+        spawn_spread=correct.get('spawnSpread'),
+        speed=correct.get('speed'),
+        points=correct.get('points'),
+        hp=correct.get('hp'),
+        pattern=correct.get('pattern'),
+        collection_order=correct.get('collectionOrder'),
+        damage=None,
+        behavior=None,
+        redirect=None,
+        context=correct.get('context'),
+        sound=correct.get('sound'),
+        created_at=created_at,
+        updated_at=today()
+    )
+
+
+def extract_distractor_object(round_id: str, theme_id: str, distractor: Dict[str, Any], order_index: int, created_at: str) -> RoundObjectRow:
     """Extract distractor object data."""
     entry = distractor.get('entry', {})
     
-    return {
-        'round_id': round_id,
-        'theme_id': theme_id,
-        'object_type': 'distractor',
-        'order_index': order_index,
-        'word': entry.get('word'),
-        'entry_type': entry.get('type'),
-        'image': entry.get('image'),
-        'visual': distractor.get('visual', {}),
-        'spawn_position': distractor.get('spawnPosition'),
-        'spawn_spread': distractor.get('spawnSpread'),
-        'speed': distractor.get('speed'),
-        'points': distractor.get('points'),
-        'hp': distractor.get('hp'),
-        'pattern': None,
-        'collection_order': None,
-        'damage': distractor.get('damage'),
-        'behavior': distractor.get('behavior'),
-        'redirect': distractor.get('redirect'),
-        'context': distractor.get('context'),
-        'sound': distractor.get('sound'),
-        'created_at': created_at,
-        'updated_at': datetime.now().strftime('%Y-%m-%d')
-    }
-
-
-def process_chapter_file(file_path: Path) -> List[Dict[str, Any]]:
-    """Process a single chapter JSON file and return list of round object rows."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            items = json.load(f)
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}")
-        return []
-    
-    if not isinstance(items, list):
-        print(f"Warning: {file_path} does not contain an array of items")
-        return []
-    
-    if len(items) == 0:
-        return []
-    
-    # Get created_at from first item's meta or use current date
-    created_at = None
-    if items and 'meta' in items[0] and isinstance(items[0]['meta'], dict):
-        meta = items[0]['meta']
-        if 'created' in meta:
-            created_at = meta['created']
-    
-    # Default to current date if not found
-    if not created_at:
-        created_at = datetime.now().strftime('%Y-%m-%d')
-    
-    round_objects = []
-    
+    return RoundObjectRow(
+        round_id=round_id,
+        theme_id=theme_id,
+        object_type='distractor',
+        order_index=order_index,
+        word=entry.get('word'),
+        entry_type=entry.get('type'),
+        image=entry.get('image'),
+        visual=distractor.get('visual', {}),
+        spawn_position=distractor.get('spawnPosition'),
+        spawn_spread=distractor.get('spawnSpread'),
+        speed=distractor.get('speed'),
+        points=distractor.get('points'),
+        hp=distractor.get('hp'),
+        pattern=None,
+        collection_order=None,
+        damage=distractor.get('damage'),
+        behavior=distractor.get('behavior'),
+        redirect=distractor.get('redirect'),
+        context=distractor.get('context'),
+        sound=distractor.get('sound'),
+        created_at=created_at,
+        updated_at=today()
+    )
+
+
+def extract_round_object_rows(items: List[Any], created_at: str, universe_id: str) -> Iterator[RoundObjectRow]:
+    """Lazily extract round object rows from the parsed items of a chapter file.
+
+    round_objects has no uuid columns, so universe_id (shared signature with the
+    other chapter table extractors) is not used.
+    """
     for item in items:
         if not isinstance(item, dict):
             continue
@@ -189,64 +206,71 @@ def process_chapter_file(file_path: Path) -> List[Dict[str, Any]]:
         # Extract base object
         base = item.get('base')
         if base:
-            base_obj = extract_base_object(round_id, theme_id, base, created_at)
-            round_objects.append(base_obj)
+            yield extract_base_object(round_id, theme_id, base, created_at)
         
         # Extract correct objects
         corrects = item.get('correct', [])
         if isinstance(corrects, list):
             for idx, correct in enumerate(corrects):
-                correct_obj = extract_correct_object(round_id, theme_id, correct, idx, created_at)
-                round_objects.append(correct_obj)
+                yield extract_correct_object(round_id, theme_id, correct, idx, created_at)
         
         # Extract distractor objects
         distractors = item.get('distractors', [])
         if isinstance(distractors, list):
             for idx, distractor in enumerate(distractors):
-                distractor_obj = extract_distractor_object(round_id, theme_id, distractor, idx, created_at)
-                round_objects.append(distractor_obj)
-    
-    return round_objects
+                yield extract_distractor_object(round_id, theme_id, distractor, idx, created_at)
 
 
-def find_all_chapter_files() -> List[Path]:
-    """Find all chapter JSON files in the content directory.
-    
-    Chapter files are in: public/content/themes/{universe}/{theme}/{chapter}.json
-    We exclude themes.*.json files.
-    """
-    chapter_files = []
-    
-    # Walk through all universe folders
-    for universe_dir in CONTENT_DIR.iterdir():
-        if not universe_dir.is_dir():
-            continue
-        
-        # Walk through all theme folders
-        for theme_dir in universe_dir.iterdir():
-            if not theme_dir.is_dir():
-                continue
-            
-            # Find all JSON files in theme folder (excluding themes.*.json)
-            for json_file in theme_dir.glob("*.json"):
-                # Skip themes.*.json files
-                if json_file.name.startswith("themes."):
-                    continue
-                # Skip level-based files (chapter.1.json, chapter.2.json, etc.)
-                # We only want the main chapter files
-                if any(char.isdigit() for char in json_file.stem.split('.')[-1] if '.' in json_file.stem):
-                    # Check if it's a level file (e.g., "Chapter.1.json")
-                    parts = json_file.stem.split('.')
-                    if len(parts) > 1 and parts[-1].isdigit():
-                        continue
-                
-                chapter_files.append(json_file)
-    
-    return sorted(chapter_files)
-
-
-def generate_csv_export() -> None:
-    """Generate CSV export of all round objects."""
+def process_chapter_file(file_path: Path) -> List[RoundObjectRow]:
+    """Process a single chapter JSON file and return list of round object rows."""
+    loaded = load_chapter_file(file_path)
+    if not loaded:
+        return []
+    items, created_at = loaded
+    with profile_stage('extract'):
+        return list(extract_round_object_rows(items, created_at, chapter_universe_id(file_path)))
+
+
+def format_csv_row(obj: RoundObjectRow) -> List[Any]:
+    """Format a round object row for CSV in CSV_COLUMNS order (id will be auto-generated in DB, so we leave it empty)."""
+    return [
+        '',  # id - auto-generated in DB
+        obj.round_id or '',
+        obj.theme_id or '',
+        obj.object_type or '',
+        obj.order_index if obj.order_index is not None else '',
+        obj.word or '',
+        obj.entry_type or '',
+        obj.image or '',
+        format_jsonb_for_csv(obj.visual),
+        obj.spawn_position if obj.spawn_position is not None else '',
+        obj.spawn_spread if obj.spawn_spread is not None else '',
+        obj.speed if obj.speed is not None else '',
+        obj.points if obj.points is not None else '',
+        obj.hp if obj.hp is not None else '',
+        obj.pattern or '',
+        obj.collection_order if obj.collection_order is not None else '',
+        obj.damage if obj.damage is not None else '',
+        obj.behavior or '',
+        obj.redirect or '',
+        obj.context or '',
+        obj.sound or '',
+        obj.created_at or '',
+        obj.updated_at or ''
+    ]
+
+
+def format_chapter_file(file_path: Path) -> List[List[Any]]:
+    """Parse a chapter file and return its CSV-formatted round object rows (process pool worker)."""
+    rows = process_chapter_file(file_path)
+    with profile_stage('format'):
+        return [format_csv_row(row) for row in rows]
+
+
+def generate_csv_export(
+    jobs: int = 1, incremental: bool = False, output_format: str = 'csv', compress: Optional[str] = None
+) -> None:
+    """Generate CSV (or PostgreSQL COPY) export of all round objects."""
     chapter_files = find_all_chapter_files()
     
     if not chapter_files:
@@ -255,65 +279,61 @@ def generate_csv_export() -> None:
     
     print(f"Found {len(chapter_files)} chapter files")
     
-    all_round_objects = []
-    
-    for chapter_file in chapter_files:
-        print(f"Processing {chapter_file}...")
-        round_objects = process_chapter_file(chapter_file)
-        all_round_objects.extend(round_objects)
-        print(f"  Found {len(round_objects)} round objects")
-    
-    print(f"\nTotal round objects: {len(all_round_objects)}")
-    
-    # Count by type
-    base_count = sum(1 for obj in all_round_objects if obj['object_type'] == 'base')
-    correct_count = sum(1 for obj in all_round_objects if obj['object_type'] == 'correct')
-    distractor_count = sum(1 for obj in all_round_objects if obj['object_type'] == 'distractor')
+    if incremental:
+        (total,), reparsed = write_incremental_csv(
+            [(OUTPUT_CSV_FILE, CSV_COLUMNS)], chapter_files, partial(single_table, format_chapter_file), jobs
+        )
+        print(f"\n✅ Incremental CSV export complete: {OUTPUT_CSV_FILE}")
+        print(f"   Exported {total} round objects ({reparsed} chapter files re-parsed)")
+        return
     
-    print(f"  - Base objects: {base_count}")
-    print(f"  - Correct objects: {correct_count}")
-    print(f"  - Distractor objects: {distractor_count}")
+    if output_format == 'csv':
+        # Rows stream straight from the chapter files into the output file; counts are running tallies
+        tally = RowTally(key=CSV_COLUMNS.index('object_type'))
+        output_file = compressed_file(OUTPUT_CSV_FILE, compress)
+        rows = chain.from_iterable(map_chapter_files(format_chapter_file, chapter_files, jobs))
+        write_csv_rows(output_file, CSV_COLUMNS, tally.count(rows))
+    else:
+        # Typed rows have no id column
+        tally = RowTally(key=RoundObjectRow._fields.index('object_type'))
+        binary = output_format == 'copy-binary'
+        output_file = compressed_file(copy_output_file(OUTPUT_CSV_FILE, binary), compress)
+        rows = chain.from_iterable(map_chapter_files(process_chapter_file, chapter_files, jobs))
+        write_copy_rows(output_file, COLUMN_TYPES, tally.count(rows), binary)
     
-    # Write CSV file
-    with open(OUTPUT_CSV_FILE, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS, quoting=csv.QUOTE_MINIMAL)
-        writer.writeheader()
-        
-        for obj in all_round_objects:
-            # Format row for CSV (id will be auto-generated in DB, so we leave it empty)
-            csv_row = {
-                'id': '',  # Auto-generated in DB
-                'round_id': obj['round_id'] or '',
-                'theme_id': obj['theme_id'] or '',
-                'object_type': obj['object_type'] or '',
-                'order_index': obj['order_index'] if obj['order_index'] is not None else '',
-                'word': obj['word'] or '',
-                'entry_type': obj['entry_type'] or '',
-                'image': obj['image'] or '',
-                'visual': format_jsonb_for_csv(obj['visual']),
-                'spawn_position': obj['spawn_position'] if obj['spawn_position'] is not None else '',
-                'spawn_spread': obj['spawn_spread'] if obj['spawn_spread'] is not None else '',
-                'speed': obj['speed'] if obj['speed'] is not None else '',
-                'points': obj['points'] if obj['points'] is not None else '',
-                'hp': obj['hp'] if obj['hp'] is not None else '',
-                'pattern': obj['pattern'] or '',
-                'collection_order': obj['collection_order'] if obj['collection_order'] is not None else '',
-                'damage': obj['damage'] if obj['damage'] is not None else '',
-                'behavior': obj['behavior'] or '',
-                'redirect': obj['redirect'] or '',
-                'context': obj['context'] or '',
-                'sound': obj['sound'] or '',
-                'created_at': obj['created_at'] or '',
-                'updated_at': obj['updated_at'] or ''
-            }
-            writer.writerow(csv_row)
+    print(f"\nTotal round objects: {tally.total}")
+    print(f"  - Base objects: {tally.by_key['base']}")
+    print(f"  - Correct objects: {tally.by_key['correct']}")
+    print(f"  - Distractor objects: {tally.by_key['distractor']}")
     
-    print(f"\n✅ CSV export complete: {OUTPUT_CSV_FILE}")
-    print(f"   Exported {len(all_round_objects)} round objects")
+    print(f"\n✅ {'CSV' if output_format == 'csv' else 'COPY'} export complete: {output_file}")
+    if output_format != 'csv':
+        print(f"   Load with: {copy_statement(COPY_TABLE, list(COLUMN_TYPES), binary)}")
+    print(f"   Exported {tally.total} round objects")
+
+
+def main() -> None:
+    """Parse command line arguments and run the export."""
+    parser = argparse.ArgumentParser(description="Export all round objects from chapter JSON files to CSV.")
+    add_jobs_argument(parser)
+    add_incremental_argument(parser)
+    add_format_argument(parser)
+    add_compress_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if args.incremental and args.output_format != 'csv':
+        parser.error("--incremental is only supported for --format csv")
+    if args.incremental and args.compress:
+        parser.error("--incremental is not supported with --compress")
+    check_compress_argument(parser, args.compress)
+    with profiling(args):
+        generate_csv_export(
+            jobs=args.jobs, incremental=args.incremental, output_format=args.output_format, compress=args.compress
+        )
 
 
 if __name__ == "__main__":
-    generate_csv_export()
+    main()
 
 
 
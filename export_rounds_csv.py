@@ -8,20 +8,32 @@ This script:
 3. Exports to CSV in the format required for public.rounds table
 """
 
+import argparse
 import json
-import csv
+from functools import partial
+from itertools import chain
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional
+
+import content_uuids
+from compressed_io import add_compress_argument, check_compress_argument, compressed_file
+from copy_format import copy_output_file, copy_statement, write_copy_rows
+from export_common import (
+    CONTENT_DIR, RowTally, add_format_argument, add_incremental_argument, add_jobs_argument, chapter_universe_id,
+    find_all_chapter_files, load_chapter_file, map_chapter_files, today, write_csv_rows
+)
+from export_manifest import single_table, write_incremental_csv
+from export_profile import add_profile_arguments, profile_stage, profiling
 
 # Paths
-CONTENT_DIR = Path("public/content/themes")
 OUTPUT_CSV_FILE = Path("rounds_export.csv")
 
 # CSV columns matching the database table structure
 CSV_COLUMNS = [
     "id",
+    "uuid",
     "chapter_id",
+    "chapter_uuid",
     "level",
     "published",
     "wave_duration",
@@ -32,6 +44,23 @@ CSV_COLUMNS = [
     "updated_at"
 ]
 
+# PostgreSQL table and column types for COPY output - see copy_format.py
+COPY_TABLE = "public.rounds"
+COLUMN_TYPES = {
+    "id": "text",
+    "uuid": "uuid",
+    "chapter_id": "text",
+    "chapter_uuid": "uuid",
+    "level": "integer",
+    "published": "boolean",
+    "wave_duration": "numeric",
+    "meta_source": "text",
+    "meta_tags": "text[]",
+    "meta_difficulty_scaling": "jsonb",
+    "created_at": "timestamptz",
+    "updated_at": "timestamptz"
+}
+
 
 def format_postgres_array(value: List[str]) -> str:
     """Format list as PostgreSQL array string."""
@@ -52,35 +81,8 @@ def format_jsonb_for_csv(value: Any) -> str:
     return json_str
 
 
-def process_chapter_file(file_path: Path) -> List[Dict[str, Any]]:
-    """Process a single chapter JSON file and return list of round rows."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            items = json.load(f)
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}")
-        return []
-    
-    if not isinstance(items, list):
-        print(f"Warning: {file_path} does not contain an array of items")
-        return []
-    
-    if len(items) == 0:
-        return []
-    
-    # Get created_at from first item's meta or use current date
-    created_at = None
-    if items and 'meta' in items[0] and isinstance(items[0]['meta'], dict):
-        meta = items[0]['meta']
-        if 'created' in meta:
-            created_at = meta['created']
-    
-    # Default to current date if not found
-    if not created_at:
-        created_at = datetime.now().strftime('%Y-%m-%d')
-    
-    round_rows = []
-    
+def extract_round_rows(items: List[Any], created_at: str, universe_id: str) -> Iterator[Dict[str, Any]]:
+    """Lazily extract round rows from the parsed items of a chapter file in the given universe folder."""
     for item in items:
         if not isinstance(item, dict):
             continue
@@ -103,10 +105,12 @@ def process_chapter_file(file_path: Path) -> List[Dict[str, Any]]:
             print(f"Warning: Skipping item with missing id or chapter: {item_id}")
             continue
         
-        # Create row
-        row = {
+        theme_id = item.get('theme', '')
+        yield {
             'id': item_id,
+            'uuid': content_uuids.round_uuid(universe_id, theme_id, chapter_id, item_id),
             'chapter_id': chapter_id,
+            'chapter_uuid': content_uuids.chapter_uuid(universe_id, theme_id, chapter_id),
             'level': level,
             'published': published,
             'wave_duration': wave_duration,
@@ -114,52 +118,49 @@ def process_chapter_file(file_path: Path) -> List[Dict[str, Any]]:
             'meta_tags': meta_tags,
             'meta_difficulty_scaling': meta_difficulty_scaling,
             'created_at': created_at,
-            'updated_at': datetime.now().strftime('%Y-%m-%d')
+            'updated_at': today()
         }
-        
-        round_rows.append(row)
-    
-    return round_rows
 
 
-def find_all_chapter_files() -> List[Path]:
-    """Find all chapter JSON files in the content directory.
-    
-    Chapter files are in: public/content/themes/{universe}/{theme}/{chapter}.json
-    We exclude themes.*.json files.
-    """
-    chapter_files = []
-    
-    # Walk through all universe folders
-    for universe_dir in CONTENT_DIR.iterdir():
-        if not universe_dir.is_dir():
-            continue
-        
-        # Walk through all theme folders
-        for theme_dir in universe_dir.iterdir():
-            if not theme_dir.is_dir():
-                continue
-            
-            # Find all JSON files in theme folder (excluding themes.*.json)
-            for json_file in theme_dir.glob("*.json"):
-                # Skip themes.*.json files
-                if json_file.name.startswith("themes."):
-                    continue
-                # Skip level-based files (chapter.1.json, chapter.2.json, etc.)
-                # We only want the main chapter files
-                if any(char.isdigit() for char in json_file.stem.split('.')[-1] if '.' in json_file.stem):
-                    # Check if it's a level file (e.g., "Chapter.1.json")
-                    parts = json_file.stem.split('.')
-                    if len(parts) > 1 and parts[-1].isdigit():
-                        continue
-                
-                chapter_files.append(json_file)
-    
-    return sorted(chapter_files)
-
-
-def generate_csv_export() -> None:
-    """Generate CSV export of all rounds."""
+def process_chapter_file(file_path: Path) -> List[Dict[str, Any]]:
+    """Process a single chapter JSON file and return list of round rows."""
+    loaded = load_chapter_file(file_path)
+    if not loaded:
+        return []
+    items, created_at = loaded
+    with profile_stage('extract'):
+        return list(extract_round_rows(items, created_at, chapter_universe_id(file_path)))
+
+
+def format_csv_row(round_data: Dict[str, Any]) -> Dict[str, str]:
+    """Format a round row for CSV."""
+    return {
+        'id': round_data['id'] or '',
+        'uuid': round_data['uuid'],
+        'chapter_id': round_data['chapter_id'] or '',
+        'chapter_uuid': round_data['chapter_uuid'],
+        'level': round_data['level'] if round_data['level'] is not None else '',
+        'published': 'true' if round_data['published'] else 'false',
+        'wave_duration': round_data['wave_duration'] if round_data['wave_duration'] is not None else '',
+        'meta_source': round_data['meta_source'] or '',
+        'meta_tags': format_postgres_array(round_data['meta_tags']),
+        'meta_difficulty_scaling': format_jsonb_for_csv(round_data['meta_difficulty_scaling']),
+        'created_at': round_data['created_at'] or '',
+        'updated_at': round_data['updated_at'] or ''
+    }
+
+
+def format_chapter_file(file_path: Path) -> List[Dict[str, str]]:
+    """Parse a chapter file and return its CSV-formatted round rows (process pool worker)."""
+    rows = process_chapter_file(file_path)
+    with profile_stage('format'):
+        return [format_csv_row(row) for row in rows]
+
+
+def generate_csv_export(
+    jobs: int = 1, incremental: bool = False, output_format: str = 'csv', compress: Optional[str] = None
+) -> None:
+    """Generate CSV (or PostgreSQL COPY) export of all rounds."""
     chapter_files = find_all_chapter_files()
     
     if not chapter_files:
@@ -168,41 +169,54 @@ def generate_csv_export() -> None:
     
     print(f"Found {len(chapter_files)} chapter files")
     
-    all_rounds = []
-    
-    for chapter_file in chapter_files:
-        print(f"Processing {chapter_file}...")
-        rounds = process_chapter_file(chapter_file)
-        all_rounds.extend(rounds)
-        print(f"  Found {len(rounds)} rounds")
-    
-    print(f"\nTotal rounds: {len(all_rounds)}")
-    
-    # Write CSV file
-    with open(OUTPUT_CSV_FILE, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS, quoting=csv.QUOTE_MINIMAL)
-        writer.writeheader()
-        
-        for round_data in all_rounds:
-            # Format row for CSV
-            csv_row = {
-                'id': round_data['id'] or '',
-                'chapter_id': round_data['chapter_id'] or '',
-                'level': round_data['level'] if round_data['level'] is not None else '',
-                'published': 'true' if round_data['published'] else 'false',
-                'wave_duration': round_data['wave_duration'] if round_data['wave_duration'] is not None else '',
-                'meta_source': round_data['meta_source'] or '',
-                'meta_tags': format_postgres_array(round_data['meta_tags']),
-                'meta_difficulty_scaling': format_jsonb_for_csv(round_data['meta_difficulty_scaling']),
-                'created_at': round_data['created_at'] or '',
-                'updated_at': round_data['updated_at'] or ''
-            }
-            writer.writerow(csv_row)
+    if incremental:
+        (total,), reparsed = write_incremental_csv(
+            [(OUTPUT_CSV_FILE, CSV_COLUMNS)], chapter_files, partial(single_table, format_chapter_file), jobs
+        )
+        print(f"\n✅ Incremental CSV export complete: {OUTPUT_CSV_FILE}")
+        print(f"   Exported {total} rounds ({reparsed} chapter files re-parsed)")
+        return
     
-    print(f"\n✅ CSV export complete: {OUTPUT_CSV_FILE}")
-    print(f"   Exported {len(all_rounds)} rounds")
+    tally = RowTally()
+    if output_format == 'csv':
+        # Rows stream straight from the chapter files into the output file; counts are running tallies
+        output_file = compressed_file(OUTPUT_CSV_FILE, compress)
+        rows = chain.from_iterable(map_chapter_files(format_chapter_file, chapter_files, jobs))
+        write_csv_rows(output_file, CSV_COLUMNS, tally.count(rows))
+    else:
+        binary = output_format == 'copy-binary'
+        output_file = compressed_file(copy_output_file(OUTPUT_CSV_FILE, binary), compress)
+        rows = chain.from_iterable(map_chapter_files(process_chapter_file, chapter_files, jobs))
+        write_copy_rows(output_file, COLUMN_TYPES, tally.count(rows), binary)
+    
+    print(f"\nTotal rounds: {tally.total}")
+    
+    print(f"\n✅ {'CSV' if output_format == 'csv' else 'COPY'} export complete: {output_file}")
+    if output_format != 'csv':
+        print(f"   Load with: {copy_statement(COPY_TABLE, list(COLUMN_TYPES), binary)}")
+    print(f"   Exported {tally.total} rounds")
+
+
+def main() -> None:
+    """Parse command line arguments and run the export."""
+    parser = argparse.ArgumentParser(description="Export all rounds from chapter JSON files to CSV.")
+    add_jobs_argument(parser)
+    add_incremental_argument(parser)
+    add_format_argument(parser)
+    add_compress_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if args.incremental and args.output_format != 'csv':
+        parser.error("--incremental is only supported for --format csv")
+    if args.incremental and args.compress:
+        parser.error("--incremental is not supported with --compress")
+    check_compress_argument(parser, args.compress)
+    with profiling(args):
+        generate_csv_export(
+            jobs=args.jobs, incremental=args.incremental, output_format=args.output_format, compress=args.compress
+        )
 
 
 if __name__ == "__main__":
-    generate_csv_export()
+    main()
 
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Universe shards of the chapter table exports and their manifest.
+
+With export_all.py --shard-by-universe the rounds, items and round_objects
+output is split per universe folder:
+
+    shards/manifest.json
+    shards/{universe}/rounds_export.csv
+    shards/{universe}/items_export.csv
+    shards/{universe}/round_objects_export.csv
+
+(.copy/.pgcopy files with --format copy/copy-binary). The manifest records the
+format and, per universe, the chapter UUIDs in the shard and the path, row count,
+size and sha256 of each shard file. load_postgres.py --shards loads the shards
+concurrently and can replace single universes (--universe englisch) without
+touching the rows of the others.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from export_common import chapter_universe_id, today
+from export_manifest import hash_file
+
+SHARD_MANIFEST_VERSION = 1
+
+# Paths
+SHARD_DIR = Path("shards")
+SHARD_MANIFEST_NAME = "manifest.json"
+
+
+def shard_manifest_path(shard_dir: Path) -> Path:
+    """Return the manifest path of a shard directory."""
+    return shard_dir / SHARD_MANIFEST_NAME
+
+
+def group_by_universe(chapter_files: List[Path]) -> Dict[str, List[Path]]:
+    """Group chapter files by universe folder, keeping their order within each universe."""
+    groups = {}
+    for chapter_file in chapter_files:
+        groups.setdefault(chapter_universe_id(chapter_file), []).append(chapter_file)
+    return groups
+
+
+def shard_file_entry(shard_dir: Path, shard_file: Path, rows: int) -> Dict[str, Any]:
+    """Describe one written shard file for the manifest."""
+    return {
+        'path': shard_file.relative_to(shard_dir).as_posix(),
+        'rows': rows,
+        'size': shard_file.stat().st_size,
+        'sha256': hash_file(shard_file),
+    }
+
+
+def load_shard_manifest(shard_dir: Path) -> Optional[Dict[str, Any]]:
+    """Load the manifest of a shard directory, or None if it is missing or unreadable."""
+    path = shard_manifest_path(shard_dir)
+    if not path.exists():
+        return None
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except Exception as e:
+        print(f"Warning: Ignoring unreadable shard manifest {path}: {e}")
+        return None
+
+    if data.get('version') != SHARD_MANIFEST_VERSION:
+        print(f"Warning: Ignoring shard manifest {path} with unsupported version {data.get('version')}")
+        return None
+    return data
+
+
+def save_shard_manifest(
+    shard_dir: Path, output_format: str, shards: Dict[str, Dict[str, Any]], merge: bool = False
+) -> Path:
+    """Write the shard manifest.
+
+    With merge (a --universe subset was exported) the shards of an earlier run in the
+    same format are kept, so re-exporting one universe only replaces its own entry.
+    A full export replaces the manifest, dropping universes removed from the content.
+    """
+    previous = load_shard_manifest(shard_dir) if merge else None
+    merged = {}
+    if previous and previous.get('format') == output_format:
+        merged.update(previous.get('shards', {}))
+    merged.update(shards)
+
+    data = {
+        'version': SHARD_MANIFEST_VERSION,
+        'format': output_format,
+        'updated_at': today(),
+        'shards': dict(sorted(merged.items())),
+    }
+    path = shard_manifest_path(shard_dir)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def verify_shard_file(shard_dir: Path, entry: Dict[str, Any]) -> Optional[str]:
+    """Check a shard file against its manifest entry and return the problem, or None if it matches."""
+    shard_file = shard_dir / entry['path']
+    if not shard_file.exists():
+        return f"{shard_file} is missing"
+    if shard_file.stat().st_size != entry['size'] or hash_file(shard_file) != entry['sha256']:
+        return f"{shard_file} does not match its checksum in {shard_manifest_path(shard_dir)}"
+    return None
@@ -11,11 +11,15 @@ This script:
 6. Exports to CSV
 """
 
+import argparse
 import json
 import csv
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+from compressed_io import add_compress_argument, check_compress_argument, compressed_file, open_output
+from export_profile import add_profile_arguments, profile_file, profile_stage, profiling
+
 # Paths
 CONTENT_DIR = Path("public/content/themes")
 MAPPING_CSV = Path("Supabase Snippet Themes with Associated Universes.csv")
@@ -55,7 +59,7 @@ def extract_universe_id(file_path: Path) -> str:
 def process_theme_file(file_path: Path, universe_mapping: Dict[str, str]) -> Optional[Dict[str, Any]]:
     """Process a single theme JSON file and return theme data with universe_uuid."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with profile_stage('decode'), open(file_path, 'r', encoding='utf-8') as f:
             theme_data = json.load(f)
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
@@ -89,13 +93,14 @@ def find_all_theme_files() -> List[Path]:
     """Find all themes.*.json files in the content directory."""
     theme_files = []
     
-    for theme_file in CONTENT_DIR.rglob("themes.*.json"):
-        theme_files.append(theme_file)
+    with profile_stage('discovery'):
+        for theme_file in CONTENT_DIR.rglob("themes.*.json"):
+            theme_files.append(theme_file)
     
     return sorted(theme_files)
 
 
-def generate_csv_export() -> None:
+def generate_csv_export(compress: Optional[str] = None) -> None:
     """Generate CSV export of themes with universe_uuid."""
     # Load universe mapping
     universe_mapping = load_universe_mapping()
@@ -113,21 +118,23 @@ def generate_csv_export() -> None:
     all_themes = []
     
     for theme_file in theme_files:
-        theme_data = process_theme_file(theme_file, universe_mapping)
+        with profile_file(theme_file):
+            theme_data = process_theme_file(theme_file, universe_mapping)
         if theme_data:
             all_themes.append(theme_data)
     
     print(f"\nTotal themes: {len(all_themes)}")
     
     # Write CSV file
-    with open(OUTPUT_CSV_FILE, 'w', encoding='utf-8', newline='') as f:
+    output_file = compressed_file(OUTPUT_CSV_FILE, compress)
+    with profile_stage('write'), open_output(output_file) as f:
         writer = csv.DictWriter(f, fieldnames=['theme_id', 'theme_name', 'universe_id', 'universe_uuid'], quoting=csv.QUOTE_MINIMAL)
         writer.writeheader()
         
         for theme in all_themes:
             writer.writerow(theme)
     
-    print(f"\n✅ CSV export complete: {OUTPUT_CSV_FILE}")
+    print(f"\n✅ CSV export complete: {output_file}")
     print(f"   Exported {len(all_themes)} themes")
     
     # Show summary by universe
@@ -141,8 +148,19 @@ def generate_csv_export() -> None:
         print(f"  {universe_id}: {len(themes)} themes")
 
 
+def main() -> None:
+    """Parse command line arguments and run the export."""
+    parser = argparse.ArgumentParser(description="Export all theme names with their universe_uuid to CSV.")
+    add_compress_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    check_compress_argument(parser, args.compress)
+    with profiling(args):
+        generate_csv_export(compress=args.compress)
+
+
 if __name__ == "__main__":
-    generate_csv_export()
+    main()
 
 
 
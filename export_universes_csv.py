@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Export all universes from universe JSON files to CSV format.
+
+This script:
+1. Finds all universe.*.json files in public/content/themes/
+2. Extracts the universe fields from each file
+3. Exports to CSV in the format required for public.universes table
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+import content_uuids
+from compressed_io import add_compress_argument, check_compress_argument, compressed_file
+from export_common import CONTENT_DIR, find_all_universe_files, today, write_csv_rows
+from export_profile import add_profile_arguments, profile_file, profile_stage, profiling
+
+# Paths
+OUTPUT_CSV_FILE = Path("universes_export.csv")
+
+# CSV columns matching the database table structure
+CSV_COLUMNS = [
+    "id",
+    "uuid",
+    "name",
+    "description",
+    "color_primary",
+    "color_accent",
+    "background_gradient",
+    "laser_color",
+    "icon",
+    "available",
+    "language",
+    "music",
+    "particle_effect",
+    "ship_skin",
+    "meta",
+    "created_at",
+    "updated_at"
+]
+
+# Column types of the rows returned by process_universe_file()
+COLUMN_TYPES = {
+    "id": "text",
+    "uuid": "uuid",
+    "name": "text",
+    "description": "text",
+    "color_primary": "text",
+    "color_accent": "text",
+    "background_gradient": "jsonb",
+    "laser_color": "text",
+    "icon": "text",
+    "available": "boolean",
+    "language": "text",
+    "music": "text",
+    "particle_effect": "text",
+    "ship_skin": "text",
+    "meta": "jsonb",
+    "created_at": "timestamptz",
+    "updated_at": "timestamptz"
+}
+
+
+def format_jsonb_for_csv(value: Any) -> str:
+    """Format value as JSON string for CSV."""
+    if value is None:
+        return ''
+    return json.dumps(value, ensure_ascii=False)
+
+
+def process_universe_file(file_path: Path) -> Optional[Dict[str, Any]]:
+    """Process a single universe JSON file and return its universe row."""
+    try:
+        with profile_stage('decode'), open(file_path, 'r', encoding='utf-8') as f:
+            universe_data = json.load(f)
+    except Exception as e:
+        print(f"Error reading {file_path}: {e}")
+        return None
+
+    universe_id = universe_data.get('id', '')
+    if not universe_id:
+        print(f"Warning: No universe id found in {file_path}")
+        return None
+
+    meta = universe_data.get('meta')
+    created_at = meta.get('created') if isinstance(meta, dict) else None
+
+    # universes.music is a text column - keep only the track name of music objects
+    music = universe_data.get('music')
+    if isinstance(music, dict):
+        music = music.get('theme')
+
+    return {
+        'id': universe_id,
+        'uuid': content_uuids.universe_uuid(universe_id),
+        'name': universe_data.get('name', universe_id),
+        'description': universe_data.get('description'),
+        'color_primary': universe_data.get('colorPrimary'),
+        'color_accent': universe_data.get('colorAccent'),
+        'background_gradient': universe_data.get('backgroundGradient'),
+        'laser_color': universe_data.get('laserColor'),
+        'icon': universe_data.get('icon'),
+        'available': universe_data.get('available', True),
+        'language': universe_data.get('language'),
+        'music': music,
+        'particle_effect': universe_data.get('particleEffect'),
+        'ship_skin': universe_data.get('shipSkin'),
+        'meta': meta,
+        'created_at': created_at or today(),
+        'updated_at': today()
+    }
+
+
+def format_csv_row(universe: Dict[str, Any]) -> Dict[str, str]:
+    """Format a universe row for CSV - use raw values, csv.DictWriter handles escaping."""
+    return {
+        'id': universe['id'],
+        'uuid': universe['uuid'],
+        'name': universe['name'] or '',
+        'description': universe['description'] or '',
+        'color_primary': universe['color_primary'] or '',
+        'color_accent': universe['color_accent'] or '',
+        'background_gradient': format_jsonb_for_csv(universe['background_gradient']),
+        'laser_color': universe['laser_color'] or '',
+        'icon': universe['icon'] or '',
+        'available': 'true' if universe['available'] else 'false',
+        'language': universe['language'] or '',
+        'music': universe['music'] or '',
+        'particle_effect': universe['particle_effect'] or '',
+        'ship_skin': universe['ship_skin'] or '',
+        'meta': format_jsonb_for_csv(universe['meta']),
+        'created_at': universe['created_at'] or '',
+        'updated_at': universe['updated_at'] or ''
+    }
+
+
+def generate_csv_export(compress: Optional[str] = None) -> None:
+    """Generate CSV export of all universes."""
+    universe_files = find_all_universe_files()
+
+    if not universe_files:
+        print(f"No universe files found in {CONTENT_DIR}")
+        return
+
+    print(f"Found {len(universe_files)} universe files")
+
+    universes = []
+    for universe_file in universe_files:
+        with profile_file(universe_file):
+            universes.append(process_universe_file(universe_file))
+
+    with profile_stage('format'):
+        rows = [format_csv_row(universe) for universe in universes if universe]
+    output_file = compressed_file(OUTPUT_CSV_FILE, compress)
+    total = write_csv_rows(output_file, CSV_COLUMNS, rows)
+
+    print(f"\n✅ CSV export complete: {output_file}")
+    print(f"   Exported {total} universes")
+
+
+def main() -> None:
+    """Parse command line arguments and run the export."""
+    parser = argparse.ArgumentParser(description="Export all universes from universe JSON files to CSV.")
+    add_compress_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    check_compress_argument(parser, args.compress)
+    with profiling(args):
+        generate_csv_export(compress=args.compress)
+
+
+if __name__ == "__main__":
+    main()
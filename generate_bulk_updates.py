@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Generate chunked bulk UPDATE statements from any keyed CSV file.
+
+This script:
+1. Reads a CSV file with one row per database row (e.g. an export_*_csv.py output)
+2. Matches rows on one or more key columns (themes/rounds: id, chapters: id +
+   themes_uuid_backup (the theme id; chapter ids repeat across themes), items: uuid,
+   round_objects: round_id + object_type + order_index) and aborts if the key is
+   not unique in the CSV - Postgres would apply an arbitrary one of the matching
+   VALUES rows. Repeated rows with identical values are only written once.
+3. Groups the rows into chunks of --chunk-size rows
+4. Writes one statement per chunk instead of one UPDATE per row:
+
+   UPDATE public.rounds AS t
+   SET level = v.level::integer, ...
+   FROM (VALUES ('F40.00_001', '2'), ...) AS v(id, level, ...)
+   WHERE t.id = v.id::text
+     AND (t.level IS DISTINCT FROM v.level::integer OR ...);
+
+Empty CSV values become NULL. Rows whose values (other than updated_at) already
+match are left untouched, unless --all-rows is given.
+"""
+
+import argparse
+import csv
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import export_chapters_csv
+import export_items_csv
+import export_round_objects_csv
+import export_rounds_csv
+import generate_themes_insert
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Columns that hold uuids in the database, including ones no exporter writes (themes.uniuuid)
+UUID_COLUMNS = {
+    "uuid": "uuid",
+    "universe_uuid": "uuid",
+    "uniuuid": "uuid",
+    "themes_uuid": "uuid",
+    "chapter_uuid": "uuid",
+    "round_uuid": "uuid",
+}
+
+# Supported tables: (database table, default key columns, column types)
+TABLES = {
+    "themes": ("public.themes", ["id"], {**generate_themes_insert.COLUMN_TYPES, "updated_at": "timestamptz"}),
+    "chapters": ("public.chapters", ["id", "themes_uuid_backup"], export_chapters_csv.COLUMN_TYPES),
+    "rounds": ("public.rounds", ["id"], export_rounds_csv.COLUMN_TYPES),
+    "items": ("public.items", ["uuid"], export_items_csv.COLUMN_TYPES),
+    "round_objects": (
+        "public.round_objects", ["round_id", "object_type", "order_index"], export_round_objects_csv.COLUMN_TYPES
+    ),
+}
+
+# Columns that are never updated unless named explicitly with --set
+NOT_UPDATED_BY_DEFAULT = {"created_at"}
+
+# Columns that are set but not compared when deciding whether a row changed
+NOT_COMPARED = {"updated_at"}
+
+
+def table_column_types(table: str) -> Dict[str, str]:
+    """Return the PostgreSQL column types of a supported table."""
+    _, _, column_types = TABLES[table]
+    return {**column_types, **UUID_COLUMNS}
+
+
+def sql_literal(value: Optional[str]) -> str:
+    """Quote a CSV value as an SQL string literal (empty -> NULL)."""
+    if value is None or value == '':
+        return 'NULL'
+    return "'" + value.replace("'", "''") + "'"
+
+
+def parse_column_spec(spec: str) -> Tuple[str, str]:
+    """Parse a CSV_COLUMN[:TABLE_COLUMN] spec into (csv_column, table_column)."""
+    csv_column, _, table_column = spec.partition(':')
+    return csv_column, table_column or csv_column
+
+
+def build_update_statement(
+    table: str,
+    keys: Sequence[str],
+    columns: Sequence[str],
+    column_types: Dict[str, str],
+    rows: Sequence[Sequence[Optional[str]]],
+    only_changed: bool = True,
+) -> str:
+    """Build one UPDATE ... FROM (VALUES ...) statement.
+
+    rows hold the key values followed by the column values, as strings; the VALUES
+    list is left untyped and every value is cast to its column type where it is used.
+    """
+    def typed(column: str) -> str:
+        return f"v.{column}::{column_types.get(column, 'text')}"
+
+    values = ',\n  '.join('(' + ', '.join(sql_literal(value) for value in row) + ')' for row in rows)
+    sql = (
+        f"UPDATE {table} AS t\n"
+        f"SET {', '.join(f'{column} = {typed(column)}' for column in columns)}\n"
+        f"FROM (VALUES\n  {values}\n) AS v({', '.join([*keys, *columns])})\n"
+        f"WHERE {' AND '.join(f't.{key} = {typed(key)}' for key in keys)}"
+    )
+    compared = [column for column in columns if column not in NOT_COMPARED]
+    if only_changed and compared:
+        sql += f"\n  AND ({' OR '.join(f't.{column} IS DISTINCT FROM {typed(column)}' for column in compared)})"
+    return sql + ";\n"
+
+
+def find_conflicting_keys(input_csv: Path, positions: Sequence[int], key_count: int) -> List[Tuple[str, ...]]:
+    """Return the keys that occur in several CSV rows with different values (pre-pass over the file)."""
+    seen = {}
+    conflicts = {}
+    with open(input_csv, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            values = tuple(row[position] if position < len(row) else '' for position in positions)
+            key = values[:key_count]
+            if not all(key):
+                continue
+            if seen.setdefault(key, values) != values:
+                conflicts[key] = True
+    return list(conflicts)
+
+
+def iter_chunks(rows: Iterable[List[Optional[str]]], chunk_size: int) -> Iterator[List[List[Optional[str]]]]:
+    """Yield lists of at most chunk_size rows."""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def generate_bulk_updates(
+    input_csv: Path,
+    output_sql: Path,
+    table: str,
+    keys: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    only_changed: bool = True,
+) -> None:
+    """Write chunked bulk UPDATE statements for a keyed CSV file."""
+    if not input_csv.exists():
+        print(f"Error: Input file not found: {input_csv}")
+        return
+
+    db_table, default_keys, _ = TABLES[table]
+    column_types = table_column_types(table)
+    key_specs = [parse_column_spec(spec) for spec in (keys or default_keys)]
+
+    with open(input_csv, 'r', encoding='utf-8', newline='') as f_in:
+        reader = csv.reader(f_in)
+        header = next(reader, [])
+
+        if columns:
+            column_specs = [parse_column_spec(spec) for spec in columns]
+        else:
+            # Every known column of the table except the keys, created_at and uuid references
+            key_columns = {csv_column for csv_column, _ in key_specs}
+            column_specs = [
+                (column, column) for column in header
+                if column in column_types and column not in key_columns
+                and column not in NOT_UPDATED_BY_DEFAULT and column not in UUID_COLUMNS
+            ]
+
+        missing = [csv_column for csv_column, _ in key_specs + column_specs if csv_column not in header]
+        if missing:
+            print(f"Error: {input_csv} has no column(s): {', '.join(missing)}")
+            return
+        if not column_specs:
+            print(f"Error: No columns to update in {input_csv}")
+            return
+
+        positions = [header.index(csv_column) for csv_column, _ in key_specs + column_specs]
+        key_names = [table_column for _, table_column in key_specs]
+        column_names = [table_column for _, table_column in column_specs]
+
+        conflicts = find_conflicting_keys(input_csv, positions, len(key_names))
+        if conflicts:
+            print(f"Error: Key ({', '.join(key_names)}) is not unique in {input_csv}, "
+                  f"{len(conflicts)} key(s) have rows with different values:")
+            for key in conflicts:
+                print(f"   {', '.join(key)}")
+            print("Choose a unique key with --key")
+            return
+
+        def iter_rows() -> Iterator[List[str]]:
+            written = set()
+            for line_number, row in enumerate(reader, start=2):
+                values = [row[position] if position < len(row) else '' for position in positions]
+                key = tuple(values[:len(key_names)])
+                if not all(key):
+                    print(f"Warning: Skipping line {line_number} with a missing key: {row}")
+                    continue
+                if key in written:
+                    print(f"Warning: Skipping line {line_number}, a repeat of key {', '.join(key)}")
+                    continue
+                written.add(key)
+                yield values
+
+        total = 0
+        statements = 0
+        with open(output_sql, 'w', encoding='utf-8') as f_out:
+            f_out.write(f"-- Bulk update of {db_table} ({', '.join(column_names)})\n")
+            f_out.write(f"-- Generated from {input_csv}, {chunk_size} rows per statement\n\n")
+            f_out.write("BEGIN;\n\n")
+
+            for chunk in iter_chunks(iter_rows(), chunk_size):
+                f_out.write(build_update_statement(
+                    db_table, key_names, column_names, column_types, chunk, only_changed
+                ))
+                f_out.write('\n')
+                total += len(chunk)
+                statements += 1
+
+            f_out.write("COMMIT;\n")
+
+    print(f"✅ SQL file generated: {output_sql}")
+    print(f"   {total} rows in {statements} UPDATE statements")
+
+
+def main() -> None:
+    """Parse command line arguments and generate the bulk updates."""
+    parser = argparse.ArgumentParser(description="Generate chunked bulk UPDATE statements from a keyed CSV file.")
+    parser.add_argument('input_csv', type=Path, help="CSV file with a header row")
+    parser.add_argument('--table', choices=list(TABLES), required=True, help="Table to update")
+    parser.add_argument('--key', nargs='+', metavar='COL[:DBCOL]',
+                        help="Key column(s) to match rows on, unique in the CSV (default: id, "
+                             "id themes_uuid_backup for chapters, uuid for items, "
+                             "round_id object_type order_index for round_objects)")
+    parser.add_argument('--set', nargs='+', metavar='COL[:DBCOL]', dest='columns',
+                        help="Column(s) to update (default: all known columns except keys, created_at and uuids)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Rows per UPDATE statement (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--all-rows', action='store_true',
+                        help="Also update rows whose values already match (skips the IS DISTINCT FROM filter)")
+    parser.add_argument('--output', '-o', type=Path, help="Output SQL file (default: update_<table>_bulk.sql)")
+    args = parser.parse_args()
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    generate_bulk_updates(
+        args.input_csv,
+        args.output or Path(f"update_{args.table}_bulk.sql"),
+        args.table,
+        keys=args.key,
+        columns=args.columns,
+        chunk_size=args.chunk_size,
+        only_changed=not args.all_rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,10 @@ Generates 6 chapters × 6 levels × 10 terms = 360 entries
 """
 
 import json
-import random
+
+from distractor_index import DistractorIndex
+from hard_distractors import select_vocabulary_distractors
+from random_streams import stream_random, stream_seed
 
 # Business English vocabulary by chapter and level
 vocabulary = {
@@ -451,24 +454,24 @@ humorous_distractors = [
     "Büroklammer", "Bürostuhl", "Kopierer", "Druckerpapier"
 ]
 
-def generate_distractors(word_en, word_de, chapter, level):
+# Distractor candidates by chapter, level and word type, built once per run
+distractor_index = DistractorIndex(vocabulary)
+
+# Confusable distractors per (chapter, level, word), harder with every level (None without numpy)
+hard_distractors = select_vocabulary_distractors(vocabulary, k=3, seed=stream_seed("business_english"))
+
+def generate_distractors(word_en, word_de, chapter, level, word_type, rng):
     """Generate 3 regular distractors + 1 humorous distractor"""
     distractors = []
     
-    # Get similar words from vocabulary
-    similar_words = []
-    for ch, levels in vocabulary.items():
-        for lvl, words in levels.items():
-            for w_en, w_de, w_type in words:
-                if w_en != word_en and w_de != word_de:
-                    similar_words.append((w_en, w_de))
-    
-    # Select 3 regular distractors
-    selected = random.sample(similar_words[:20], min(3, len(similar_words)))
+    # Select 3 regular distractors: similar-looking terms, else random ones from the same chapter, level and word type
+    selected = hard_distractors.get((chapter, level, word_en), []) if hard_distractors else []
+    if len(selected) < 3:
+        selected = distractor_index.sample(word_en, word_de, chapter, level, word_type, k=3, rng=rng)
     for i, (w_en, w_de) in enumerate(selected):
         distractors.append({
             "entry": {
-                "word": w_de if random.random() > 0.5 else w_en,
+                "word": w_de if rng.random() > 0.5 else w_en,
                 "type": "Wrong"
             },
             "spawnPosition": round(0.2 + i * 0.25, 2),
@@ -480,10 +483,10 @@ def generate_distractors(word_en, word_de, chapter, level):
             "behavior": "linear_inward" if level <= 3 else "seek_center",
             "context": f"{w_de if w_de != word_de else w_en} = {w_en if w_de != word_de else w_de}, nicht {word_de}",
             "visual": {
-                "color": random.choice(["#FF5722", "#9B59B6", "#E91E63", "#FF9800", "#00E676"]),
-                "variant": random.choice(["spike", "square", "hexagon"]),
-                "pulsate": random.choice([True, False]),
-                "shake": random.choice([True, False]),
+                "color": rng.choice(["#FF5722", "#9B59B6", "#E91E63", "#FF9800", "#00E676"]),
+                "variant": rng.choice(["spike", "square", "hexagon"]),
+                "pulsate": rng.choice([True, False]),
+                "shake": rng.choice([True, False]),
                 "fontSize": 1
             },
             "sound": "explosion_minor",
@@ -491,13 +494,13 @@ def generate_distractors(word_en, word_de, chapter, level):
         })
     
     # Add humorous distractor
-    humorous = random.choice(humorous_distractors)
+    humorous = rng.choice(humorous_distractors)
     distractors.append({
         "entry": {
             "word": humorous,
             "type": "Wrong"
         },
-        "spawnPosition": round(0.7 + random.random() * 0.2, 2),
+        "spawnPosition": round(0.7 + rng.random() * 0.2, 2),
         "spawnSpread": 0.05,
         "speed": 1.1 if level <= 3 else 1.2,
         "points": 100,
@@ -507,7 +510,7 @@ def generate_distractors(word_en, word_de, chapter, level):
         "context": f"{humorous} = {humorous.lower()} (humorvoller Distraktor - nicht {word_de}!)",
         "visual": {
             "color": "#FFC107",
-            "variant": random.choice(["bubble", "hexagon"]),
+            "variant": rng.choice(["bubble", "hexagon"]),
             "pulsate": True,
             "shake": True,
             "fontSize": 1
@@ -520,6 +523,8 @@ def generate_distractors(word_en, word_de, chapter, level):
 
 def generate_entry(chapter, level, index, word_en, word_de, word_type):
     """Generate a single entry"""
+    # Own random stream per round: the entry does not depend on the ones generated before it
+    rng = stream_random("business_english", chapter, index)
     entry_id = f"{chapter[:2].upper()}_{index:03d}"
     tier = 2 if level == 1 else 1
     
@@ -551,7 +556,7 @@ def generate_entry(chapter, level, index, word_en, word_de, word_type):
                     "word": word_de,
                     "type": "Translation"
                 },
-                "spawnPosition": round(random.random(), 2),
+                "spawnPosition": round(rng.random(), 2),
                 "spawnSpread": 0.05,
                 "speed": 0.9,
                 "points": 200 if level == 1 else 150,
@@ -561,14 +566,14 @@ def generate_entry(chapter, level, index, word_en, word_de, word_type):
                 "context": f"{word_en} = {word_de}",
                 "visual": {
                     "color": color,
-                    "variant": random.choice(["hexagon", "star", "bubble", "spike"]),
+                    "variant": rng.choice(["hexagon", "star", "bubble", "spike"]),
                     "pulsate": level == 1,
                     "fontSize": 1.1 if level == 1 else 1
                 },
                 "sound": "bubble_hit_soft"
             }
         ],
-        "distractors": generate_distractors(word_en, word_de, chapter, level),
+        "distractors": generate_distractors(word_en, word_de, chapter, level, word_type, rng),
         "meta": {
             "source": "Business English",
             "tags": [
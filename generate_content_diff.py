@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Generate a minimal migration from the last CSV export to the current content tree.
+
+This script:
+1. Reads the last rounds_export.csv, items_export.csv and round_objects_export.csv snapshot
+2. Extracts the same rows from the chapter JSON files in public/content/themes/
+3. Compares them by key:
+   - rounds:        id
+   - round_objects: (round_id, object_type, order_index), the unique constraint in round_objects_table.sql
+   - items:         round_id (items have no natural key, so a round's items are replaced as a whole)
+4. Writes only the statements needed to bring the database from the snapshot to the tree:
+   INSERT ... ON CONFLICT DO UPDATE for new rows, UPDATE of the changed columns for
+   changed rows and DELETE for removed rows
+
+created_at and updated_at are not compared (updated_at is the export date); updated
+rows get today's updated_at. Existing rows keep their uuid and foreign key uuid
+columns and inserted rows are linked to the uuid their chapter / round actually
+has, as in generate_upserts.py. Re-export (export_all.py) after applying the migration
+so the next diff starts from the new snapshot.
+"""
+
+import argparse
+import csv
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import export_items_csv
+import export_round_objects_csv
+import export_rounds_csv
+from compressed_io import find_input_file, open_input
+from export_all import CHAPTER_TABLES, format_chapter_tables
+from export_common import CONTENT_DIR, add_jobs_argument, csv_row_values, find_all_chapter_files, map_chapter_files, today
+from generate_bulk_updates import DEFAULT_CHUNK_SIZE, iter_chunks, sql_literal
+from generate_upserts import build_upsert_statement, is_kept_on_conflict
+
+# Paths
+OUTPUT_SQL_FILE = Path("migration_content_diff.sql")
+
+# Columns that change on every export and are not compared
+UNCOMPARED_COLUMNS = {"created_at", "updated_at"}
+
+# Keyed tables: (exporter, key columns); items are diffed per round (see diff_items)
+KEYED_TABLES = {
+    "rounds": (export_rounds_csv, ["id"]),
+    "round_objects": (export_round_objects_csv, ["round_id", "object_type", "order_index"]),
+}
+
+Row = Dict[str, str]
+
+
+def table_columns(exporter) -> List[str]:
+    """Return the database columns of an exporter's table (without the generated id of round_objects)."""
+    return list(exporter.COLUMN_TYPES)
+
+
+def row_key(row: Row, keys: Sequence[str]) -> Tuple[str, ...]:
+    """Return the key of a row as a tuple of CSV strings."""
+    return tuple(row[key] for key in keys)
+
+
+def read_snapshot(csv_file: Path) -> List[Row]:
+    """Read an export CSV (plain or compressed) into rows keyed by column name."""
+    csv_file = find_input_file(csv_file)
+    if not csv_file.exists():
+        print(f"Warning: Snapshot not found: {csv_file} (treating it as empty)")
+        return []
+    with open_input(csv_file) as f:
+        return list(csv.DictReader(f))
+
+
+def read_content_tree(jobs: int = 1) -> Dict[str, List[Row]]:
+    """Extract the CSV-formatted rows of every chapter table from the content tree."""
+    chapter_files = find_all_chapter_files()
+    print(f"Found {len(chapter_files)} chapter files in {CONTENT_DIR}")
+
+    rows = {exporter.OUTPUT_CSV_FILE: [] for _, exporter, _ in CHAPTER_TABLES}
+    for table_rows in map_chapter_files(format_chapter_tables, chapter_files, jobs):
+        for (_, exporter, _), formatted in zip(CHAPTER_TABLES, table_rows):
+            columns = exporter.CSV_COLUMNS
+            # Stringify like the csv module does, so rows compare equal to the snapshot
+            rows[exporter.OUTPUT_CSV_FILE].extend(
+                dict(zip(columns, (str(value) for value in csv_row_values(row, columns)))) for row in formatted
+            )
+    return rows
+
+
+def index_rows(rows: Iterable[Row], keys: Sequence[str], label: str) -> Dict[Tuple[str, ...], Row]:
+    """Index rows by key; a duplicate key keeps the last row, as a re-import would."""
+    indexed = {}
+    for row in rows:
+        key = row_key(row, keys)
+        if key in indexed:
+            print(f"Warning: Duplicate {label} key {key}, keeping the last row")
+        indexed[key] = row
+    return indexed
+
+
+def changed_columns(old: Row, new: Row, columns: Sequence[str]) -> List[str]:
+    """Return the compared columns whose values differ (existing rows keep their uuid columns)."""
+    return [
+        column for column in columns
+        if column not in UNCOMPARED_COLUMNS and not is_kept_on_conflict(column) and old.get(column, '') != new.get(column, '')
+    ]
+
+
+def where_clause(row: Row, keys: Sequence[str]) -> str:
+    """Build the WHERE condition selecting one row by key."""
+    return ' AND '.join(f"{key} = {sql_literal(row[key])}" for key in keys)
+
+
+def literal_rows(rows: Sequence[Row], columns: Sequence[str]) -> List[List[str]]:
+    """Render CSV rows as rows of SQL literals in column order."""
+    return [[sql_literal(row.get(column, '')) for column in columns] for row in rows]
+
+
+def diff_keyed_table(exporter, keys: List[str], old_rows: List[Row], new_rows: List[Row]) -> Tuple[List[str], List[str], Dict[str, int]]:
+    """Diff one keyed table and return (upsert/update statements, delete statements, counts)."""
+    table = exporter.COPY_TABLE
+    columns = table_columns(exporter)
+    old = index_rows(old_rows, keys, f"{table} snapshot")
+    new = index_rows(new_rows, keys, f"{table} content")
+
+    inserted = [row for key, row in new.items() if key not in old]
+    statements = [
+        build_upsert_statement(table, columns, keys, literal_rows(chunk, columns))
+        for chunk in iter_chunks(inserted, DEFAULT_CHUNK_SIZE)
+    ]
+
+    updated = 0
+    for key, row in new.items():
+        if key not in old:
+            continue
+        changed = changed_columns(old[key], row, columns)
+        if not changed:
+            continue
+        assignments = [f"{column} = {sql_literal(row[column])}" for column in changed]
+        assignments.append(f"updated_at = {sql_literal(today())}")
+        statements.append(f"UPDATE {table} SET {', '.join(assignments)} WHERE {where_clause(row, keys)};\n")
+        updated += 1
+
+    removed = [row for key, row in old.items() if key not in new]
+    deletes = [f"DELETE FROM {table} WHERE {where_clause(row, keys)};\n" for row in removed]
+
+    return statements, deletes, {'inserted': len(inserted), 'updated': updated, 'deleted': len(removed)}
+
+
+def diff_items(old_rows: List[Row], new_rows: List[Row]) -> Tuple[List[str], List[str], Dict[str, int]]:
+    """Diff items per round: a round whose items changed gets them deleted and re-inserted."""
+    exporter = export_items_csv
+    table = exporter.COPY_TABLE
+    columns = table_columns(exporter)
+    compared = [column for column in columns if column not in UNCOMPARED_COLUMNS]
+
+    def by_round(rows: List[Row]) -> Dict[str, List[Row]]:
+        grouped = defaultdict(list)
+        for row in rows:
+            grouped[row['round_id']].append(row)
+        return grouped
+
+    def signature(rows: List[Row]) -> List[Tuple[str, ...]]:
+        return [tuple(row.get(column, '') for column in compared) for row in rows]
+
+    old = by_round(old_rows)
+    new = by_round(new_rows)
+
+    replaced = [
+        round_id for round_id, rows in new.items()
+        if round_id not in old or signature(old[round_id]) != signature(rows)
+    ]
+    removed = [round_id for round_id in old if round_id not in new]
+
+    # Rounds that existed before lose their old items first; the re-insert runs with the upserts
+    stale = [round_id for round_id in replaced if round_id in old] + removed
+    deletes = [
+        f"DELETE FROM {table} WHERE round_id IN ({', '.join(sql_literal(round_id) for round_id in chunk)});\n"
+        for chunk in iter_chunks(stale, DEFAULT_CHUNK_SIZE)
+    ]
+
+    inserted = [row for round_id in replaced for row in new[round_id]]
+    statements = [
+        build_upsert_statement(table, columns, None, literal_rows(chunk, columns))
+        for chunk in iter_chunks(inserted, DEFAULT_CHUNK_SIZE)
+    ]
+
+    return statements, deletes, {'rounds replaced': len(replaced), 'rounds deleted': len(removed), 'rows inserted': len(inserted)}
+
+
+def generate_content_diff(snapshot_dir: Path = Path('.'), output_sql: Path = OUTPUT_SQL_FILE, jobs: int = 1) -> None:
+    """Write the minimal migration from the CSV snapshot in snapshot_dir to the content tree."""
+    current = read_content_tree(jobs)
+
+    def snapshot(exporter) -> List[Row]:
+        return read_snapshot(snapshot_dir / exporter.OUTPUT_CSV_FILE.name)
+
+    def diff_table(name: str) -> Tuple[List[str], List[str], Dict[str, int]]:
+        exporter, keys = KEYED_TABLES[name]
+        return diff_keyed_table(exporter, keys, snapshot(exporter), current[exporter.OUTPUT_CSV_FILE])
+
+    rounds_sql, rounds_deletes, rounds_counts = diff_table('rounds')
+    objects_sql, objects_deletes, objects_counts = diff_table('round_objects')
+    items_sql, items_deletes, items_counts = diff_items(
+        snapshot(export_items_csv), current[export_items_csv.OUTPUT_CSV_FILE]
+    )
+
+    # Children are deleted before their rounds; rounds are written before their children
+    statements = objects_deletes + items_deletes + rounds_deletes + rounds_sql + objects_sql + items_sql
+
+    with open(output_sql, 'w', encoding='utf-8') as f:
+        f.write(f"-- Content diff from the CSV snapshot in {snapshot_dir} to {CONTENT_DIR}\n")
+        f.write(f"-- rounds: {rounds_counts}\n")
+        f.write(f"-- round_objects: {objects_counts}\n")
+        f.write(f"-- items: {items_counts}\n\n")
+        if statements:
+            f.write("BEGIN;\n\n")
+            for statement in statements:
+                f.write(statement)
+            f.write("\nCOMMIT;\n")
+        else:
+            f.write("-- No changes\n")
+
+    print(f"\n✅ SQL file generated: {output_sql} ({len(statements)} statements)")
+    print(f"   rounds: {rounds_counts}")
+    print(f"   round_objects: {objects_counts}")
+    print(f"   items: {items_counts}")
+    if statements:
+        print("   Re-export after applying it so the next diff starts from the new snapshot")
+
+
+def main() -> None:
+    """Parse command line arguments and generate the diff."""
+    parser = argparse.ArgumentParser(description="Generate a minimal migration from the last CSV export to the content tree.")
+    parser.add_argument('--snapshot-dir', type=Path, default=Path('.'),
+                        help="Directory holding the last rounds/items/round_objects export CSVs (default: .)")
+    parser.add_argument('--output', '-o', type=Path, default=OUTPUT_SQL_FILE, help=f"Output SQL file (default: {OUTPUT_SQL_FILE})")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    generate_content_diff(args.snapshot_dir, args.output, args.jobs)
+
+
+if __name__ == "__main__":
+    main()
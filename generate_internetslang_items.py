@@ -2,11 +2,11 @@
 """
 Generate Internetslang Items for WordRush
 Creates chapter JSON files with all items from the provided list.
+The items are built by item_generator.py from THEME_SPEC (python item_generator.py
+generates all themes at once).
 """
 
-import json
-import os
-import random
+from item_generator import ThemeSpec, generate_themes
 
 # Theme and chapter configuration
 THEME_ID = "internetslang"
@@ -140,167 +140,28 @@ ITEMS = {
     60: {"level": 3, "base": "Zaun Stink", "correct": [{"word": "Zaunites Stinkin Like Boiled Eggs", "context": "Fandom roast for smelly vibes."}, {"word": "Maddie Marcus Daughter", "context": "Plot twist meme persisting."}], "distractors": [{"word": "Fresh Breeze", "redirect": "Egg Stench", "context": "Clean air; Zaun boils bad."}, {"word": "Stranger Kid", "redirect": "Family Tie", "context": "No link; Maddie connects dots lol."}]},
 }
 
-def generate_item_id(chapter_abbr, item_num):
-    """Generate item ID like IS_BS_001"""
-    chapter_abbreviations = {
+# Declarative theme spec for item_generator.py
+THEME_SPEC = ThemeSpec(
+    theme_id=THEME_ID,
+    id_prefix=BASE_ID_PREFIX,
+    output_dir="public/content/themes/checkst_du/internetslang",
+    chapter_abbreviations={
         "Basic_Slang": "BS",
         "TikTok_Trends": "TT",
         "Italian_Brainrot": "IB",
         "Meme_Culture": "MC",
         "2025_Trends": "TR",
         "Fandom_Culture": "FC"
-    }
-    abbr = chapter_abbreviations.get(chapter_abbr, "XX")
-    return f"{BASE_ID_PREFIX}_{abbr}_{item_num:03d}"
-
-def create_item(item_num, chapter_name, item_data):
-    """Create a single item entry"""
-    item_id = generate_item_id(chapter_name, item_num)
-    
-    # Base configuration
-    base = {
-        "word": item_data["base"],
-        "type": "SlangTerm",
-        "visual": {
-            "tier": 2,
-            "size": 1,
-            "appearance": "bold",
-            "color": "#00b894",
-            "glow": True,
-            "pulsate": True
-        }
-    }
-    
-    # Correct entries - breitere spawnPosition (0.1-0.9)
-    correct = []
-    # Generiere zufällige spawnPositions im Bereich 0.1-0.9
-    available_positions = [round(x * 0.1, 2) for x in range(1, 10)]  # 0.1, 0.2, ..., 0.9
-    random.shuffle(available_positions)
-    
-    variants = ["star", "hexagon", "bubble", "spike"]
-    
-    # Gleiche speed für alle (keine Unterscheidung)
-    uniform_speed = 1.0
-    uniform_pattern = "linear_inward"
-    
-    for idx, corr in enumerate(item_data["correct"]):
-        correct.append({
-            "entry": {
-                "word": corr["word"],
-                "type": "CorrectMatch"
-            },
-            "spawnPosition": available_positions[idx % len(available_positions)],
-            "spawnSpread": 0.05,
-            "speed": uniform_speed,
-            "points": 200,
-            "pattern": uniform_pattern,
-            "hp": 1,
-            "collectionOrder": idx + 1 if len(item_data["correct"]) > 1 else None,
-            "context": corr["context"],
-            "visual": {
-                "color": "#4CAF50",
-                "variant": variants[idx % len(variants)],
-                "pulsate": False,
-                "fontSize": 1.1
-            },
-            "sound": "bubble_hit_soft"
-        })
-    
-    # Distractor entries - gleiche speed und behavior wie correct
-    distractors = []
-    distractor_variants = ["square", "diamond", "spike", "bubble"]
-    distractor_colors = ["#E91E63", "#9B59B6", "#FF5722", "#FFC107"]
-    
-    # Verwende restliche Positionen für Distractors
-    distractor_positions = available_positions[len(item_data["correct"]):]
-    if len(distractor_positions) < len(item_data["distractors"]):
-        # Falls nicht genug Positionen, generiere weitere
-        additional = [round(x * 0.1, 2) for x in range(1, 10)]
-        distractor_positions.extend([p for p in additional if p not in distractor_positions])
-    
-    for idx, dist in enumerate(item_data["distractors"]):
-        distractors.append({
-            "entry": {
-                "word": dist["word"],
-                "type": "WrongMatch"
-            },
-            "spawnPosition": distractor_positions[idx % len(distractor_positions)],
-            "spawnSpread": 0.05,
-            "speed": uniform_speed,  # Gleiche speed wie correct
-            "points": 100,
-            "hp": 1,
-            "damage": 1,
-            "behavior": uniform_pattern,  # Gleiche behavior wie correct
-            "context": dist["context"],
-            "visual": {
-                "color": distractor_colors[idx % len(distractor_colors)],
-                "variant": distractor_variants[idx % len(distractor_variants)],
-                "pulsate": True,
-                "shake": False,
-                "fontSize": 1.0
-            },
-            "sound": "explosion_minor",
-            "redirect": dist["redirect"]
-        })
-    
-    # Meta information
-    meta = {
-        "source": "Internetslang 2025",
-        "tags": ["internetslang", "slang", "trends", chapter_name.lower()],
-        "related": [],
-        "difficultyScaling": {
-            "speedMultiplierPerReplay": 1.05,
-            "colorContrastFade": True,
-            "angleVariance": 0.3
-        }
-    }
-    
-    return {
-        "id": item_id,
-        "theme": THEME_ID,
-        "chapter": chapter_name,
-        "level": item_data["level"],  # Verwende Level aus Item-Daten
-        "waveDuration": 3,
-        "base": base,
-        "correct": correct,
-        "distractors": distractors,
-        "meta": meta
-    }
-
-def generate_chapters():
-    """Generate all chapter JSON files"""
-    output_dir = "public/content/themes/checkst_du/internetslang"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Group items by chapter
-    chapters = {}
-    for item_num, chapter_name in CHAPTER_MAPPING.items():
-        if chapter_name not in chapters:
-            chapters[chapter_name] = []
-        chapters[chapter_name].append(item_num)
-    
-    # Generate items for each chapter
-    for chapter_name, item_nums in chapters.items():
-        items = []
-        chapter_item_counter = 1
-        
-        for item_num in sorted(item_nums):
-            item_data = ITEMS[item_num]
-            item = create_item(chapter_item_counter, chapter_name, item_data)
-            items.append(item)
-            chapter_item_counter += 1
-        
-        # Write chapter file
-        filename = f"{chapter_name}.json"
-        filepath = os.path.join(output_dir, filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(items, f, indent=2, ensure_ascii=False)
-        
-        print(f"Generated {filename} with {len(items)} items")
+    },
+    chapter_mapping=CHAPTER_MAPPING,
+    items=ITEMS,
+    base_type="SlangTerm",
+    base_color="#00b894",
+    source="Internetslang 2025",
+    tags=["internetslang", "slang", "trends"],
+    seed=42,  # Für reproduzierbare spawnPositions
+)
 
 if __name__ == "__main__":
-    random.seed(42)  # Für reproduzierbare spawnPositions
-    generate_chapters()
+    generate_themes([THEME_SPEC])
     print("All chapter files generated successfully!")
-
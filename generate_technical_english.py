@@ -6,7 +6,10 @@ Uses emojis in terms where appropriate
 """
 
 import json
-import random
+
+from distractor_index import DistractorIndex
+from hard_distractors import select_vocabulary_distractors
+from random_streams import stream_random, stream_seed
 
 # Technical English vocabulary by chapter and level (with emojis where appropriate)
 vocabulary = {
@@ -465,25 +468,22 @@ humorous_distractors = [
     "USB-Stick 🍦", "Kabelchaos 🔌", "Bildschirmschoner 💤", "Desktop-Hintergrund 🖼️"
 ]
 
-def generate_distractors(word_en, word_de, chapter, level):
+# Distractor candidates by chapter, level and word type, built once per run
+distractor_index = DistractorIndex(vocabulary)
+
+# Confusable distractors per (chapter, level, word), harder with every level (None without numpy)
+hard_distractors = select_vocabulary_distractors(vocabulary, k=3, seed=stream_seed("technical_english"))
+
+def generate_distractors(word_en, word_de, chapter, level, word_type, rng):
     """Generate 3 regular distractors + 1 humorous distractor"""
     distractors = []
     
-    # Get similar words from vocabulary
-    similar_words = []
-    for ch, levels in vocabulary.items():
-        for lvl, words in levels.items():
-            for w_en, w_de, w_type in words:
-                # Remove emojis for comparison
-                w_en_clean = w_en.split()[0] if " " in w_en else w_en
-                word_en_clean = word_en.split()[0] if " " in word_en else word_en
-                if w_en_clean != word_en_clean and w_de != word_de:
-                    similar_words.append((w_en, w_de))
-    
-    # Select 3 regular distractors
-    selected = random.sample(similar_words[:30], min(3, len(similar_words)))
+    # Select 3 regular distractors: similar-looking terms, else random ones from the same chapter, level and word type
+    selected = hard_distractors.get((chapter, level, word_en), []) if hard_distractors else []
+    if len(selected) < 3:
+        selected = distractor_index.sample(word_en, word_de, chapter, level, word_type, k=3, rng=rng)
     for i, (w_en, w_de) in enumerate(selected):
-        use_german = random.random() > 0.5
+        use_german = rng.random() > 0.5
         distractors.append({
             "entry": {
                 "word": w_de if use_german else w_en,
@@ -498,10 +498,10 @@ def generate_distractors(word_en, word_de, chapter, level):
             "behavior": "linear_inward" if level <= 3 else "seek_center",
             "context": f"{w_de if use_german else w_en} = {w_en if use_german else w_de}, nicht {word_de}",
             "visual": {
-                "color": random.choice(["#FF5722", "#9B59B6", "#E91E63", "#FF9800", "#00E676"]),
-                "variant": random.choice(["spike", "square", "hexagon"]),
-                "pulsate": random.choice([True, False]),
-                "shake": random.choice([True, False]),
+                "color": rng.choice(["#FF5722", "#9B59B6", "#E91E63", "#FF9800", "#00E676"]),
+                "variant": rng.choice(["spike", "square", "hexagon"]),
+                "pulsate": rng.choice([True, False]),
+                "shake": rng.choice([True, False]),
                 "fontSize": 1
             },
             "sound": "explosion_minor",
@@ -509,13 +509,13 @@ def generate_distractors(word_en, word_de, chapter, level):
         })
     
     # Add humorous distractor
-    humorous = random.choice(humorous_distractors)
+    humorous = rng.choice(humorous_distractors)
     distractors.append({
         "entry": {
             "word": humorous,
             "type": "Wrong"
         },
-        "spawnPosition": round(0.7 + random.random() * 0.2, 2),
+        "spawnPosition": round(0.7 + rng.random() * 0.2, 2),
         "spawnSpread": 0.05,
         "speed": 1.1 if level <= 3 else 1.2,
         "points": 100,
@@ -525,7 +525,7 @@ def generate_distractors(word_en, word_de, chapter, level):
         "context": f"{humorous} (humorvoller Distraktor - nicht {word_de}!)",
         "visual": {
             "color": "#FFC107",
-            "variant": random.choice(["bubble", "hexagon"]),
+            "variant": rng.choice(["bubble", "hexagon"]),
             "pulsate": True,
             "shake": True,
             "fontSize": 1
@@ -538,6 +538,8 @@ def generate_distractors(word_en, word_de, chapter, level):
 
 def generate_entry(chapter, level, index, word_en, word_de, word_type):
     """Generate a single entry"""
+    # Own random stream per round: the entry does not depend on the ones generated before it
+    rng = stream_random("technical_english", chapter, index)
     entry_id = f"{chapter[:2].upper()}_{index:03d}"
     tier = 2 if level == 1 else 1
     
@@ -569,7 +571,7 @@ def generate_entry(chapter, level, index, word_en, word_de, word_type):
                     "word": word_de,
                     "type": "Translation"
                 },
-                "spawnPosition": round(random.random(), 2),
+                "spawnPosition": round(rng.random(), 2),
                 "spawnSpread": 0.05,
                 "speed": 0.9,
                 "points": 200 if level == 1 else 150,
@@ -579,14 +581,14 @@ def generate_entry(chapter, level, index, word_en, word_de, word_type):
                 "context": f"{word_en} = {word_de}",
                 "visual": {
                     "color": color,
-                    "variant": random.choice(["hexagon", "star", "bubble", "spike"]),
+                    "variant": rng.choice(["hexagon", "star", "bubble", "spike"]),
                     "pulsate": level == 1,
                     "fontSize": 1.1 if level == 1 else 1
                 },
                 "sound": "bubble_hit_soft"
             }
         ],
-        "distractors": generate_distractors(word_en, word_de, chapter, level),
+        "distractors": generate_distractors(word_en, word_de, chapter, level, word_type, rng),
         "meta": {
             "source": "Technical English",
             "tags": [
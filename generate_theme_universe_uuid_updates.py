@@ -2,25 +2,22 @@
 """
 Generate SQL UPDATE statements to set universe_uuid for themes.
 
-Reads themes_with_universe_uuid.csv and generates:
-UPDATE public.themes SET uniuuid = 'uuid' WHERE themes.id = 'theme_id';
+Reads themes_with_universe_uuid.csv and generates chunked bulk updates
+(see generate_bulk_updates.py):
+UPDATE public.themes AS t SET uniuuid = v.uniuuid::uuid
+FROM (VALUES ('theme_id', 'uuid'), ...) AS v(id, uniuuid) WHERE t.id = v.id::text ...;
 """
 
 import csv
 from pathlib import Path
 
+from generate_bulk_updates import DEFAULT_CHUNK_SIZE, build_update_statement, iter_chunks, table_column_types
+
 # Paths
 INPUT_CSV = Path("themes_with_universe_uuid copy.csv")
 OUTPUT_SQL = Path("update_themes_universe_uuid.sql")
 
 
-def escape_sql_string(value: str) -> str:
-    """Escape single quotes in SQL strings."""
-    if not value:
-        return ''
-    return value.replace("'", "''")
-
-
 def generate_sql_updates() -> None:
     """Generate SQL UPDATE statements from CSV."""
     
@@ -28,7 +25,7 @@ def generate_sql_updates() -> None:
         print(f"Error: Input file not found: {INPUT_CSV}")
         return
     
-    updates = []
+    rows = []
     
     with open(INPUT_CSV, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
@@ -40,13 +37,14 @@ def generate_sql_updates() -> None:
                 print(f"Warning: Skipping row with missing theme_id or universe_uuid: {row}")
                 continue
             
-            # Escape SQL strings
-            theme_id_escaped = escape_sql_string(theme_id)
-            universe_uuid_escaped = escape_sql_string(universe_uuid)
-            
-            # Generate UPDATE statement
-            update_sql = f"UPDATE public.themes SET uniuuid = '{universe_uuid_escaped}' WHERE themes.id = '{theme_id_escaped}';"
-            updates.append(update_sql)
+            rows.append([theme_id, universe_uuid])
+    
+    # One UPDATE ... FROM (VALUES ...) per chunk instead of one UPDATE per theme
+    column_types = table_column_types('themes')
+    updates = [
+        build_update_statement('public.themes', ['id'], ['uniuuid'], column_types, chunk)
+        for chunk in iter_chunks(rows, DEFAULT_CHUNK_SIZE)
+    ]
     
     # Write SQL file
     with open(OUTPUT_SQL, 'w', encoding='utf-8') as f:
@@ -57,7 +55,7 @@ def generate_sql_updates() -> None:
             f.write(update + '\n')
     
     print(f"✅ SQL file generated: {OUTPUT_SQL}")
-    print(f"   Generated {len(updates)} UPDATE statements")
+    print(f"   Generated {len(updates)} UPDATE statements for {len(rows)} themes")
 
 
 if __name__ == "__main__":
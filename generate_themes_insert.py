@@ -7,20 +7,44 @@ This script:
 2. Extracts universe_id from the folder structure
 3. Maps universe_id to UUID using universe_uuid_mapping.json
 4. Generates SQL INSERT statements for the themes table
+   (with --compress gzip|zstd both outputs are compressed while writing)
 """
 
+import argparse
 import json
 import os
 import re
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+import content_uuids
+from compressed_io import add_compress_argument, check_compress_argument, compressed_file, open_output
+from export_profile import add_profile_arguments, profile_file, profile_stage, profiling
+
 # Paths
 CONTENT_DIR = Path("public/content/themes")
 MAPPING_FILE = Path("universe_uuid_mapping.json")
 OUTPUT_SQL_FILE = Path("migration_insert_themes.sql")
 OUTPUT_CSV_FILE = Path("themes_export.csv")
 
+# Column types of the rows returned by extract_theme_row()
+COLUMN_TYPES = {
+    "id": "text",
+    "uuid": "uuid",
+    "universe_id": "text",
+    "universe_uuid": "uuid",
+    "name": "text",
+    "description": "text",
+    "color_primary": "text",
+    "color_accent": "text",
+    "background_gradient": "jsonb",
+    "laser_color": "text",
+    "icon": "text",
+    "music": "jsonb",
+    "particle_effect": "text",
+    "created_at": "timestamptz"
+}
+
 
 def load_universe_mapping() -> Dict[str, str]:
     """Load universe_id to UUID mapping."""
@@ -63,7 +87,8 @@ def format_csv_value(value: Any) -> str:
     str_value = str(value)
     # Escape quotes by doubling them
     if '"' in str_value or ',' in str_value or '\n' in str_value:
-        return f'"{str_value.replace('"', '""')}"'
+        escaped = str_value.replace('"', '""')
+        return f'"{escaped}"'
     return str_value
 
 
@@ -86,26 +111,23 @@ def extract_universe_id(file_path: Path) -> str:
     return parent_dir
 
 
-def process_theme_file(file_path: Path, universe_uuid: str) -> Optional[tuple[str, str, dict]]:
-    """Process a single theme JSON file and return (SQL INSERT statement, theme_id, csv_row_dict)."""
+def load_theme_file(file_path: Path) -> Optional[Dict[str, Any]]:
+    """Load a theme JSON file, or return None if it can't be read."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            theme_data = json.load(f)
+        with profile_stage('decode'), open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
         return None
-    
-    # Extract fields
-    theme_id = theme_data.get('id', '')
-    name = theme_data.get('name', '')
-    description = theme_data.get('description')
-    color_primary = theme_data.get('colorPrimary')
-    color_accent = theme_data.get('colorAccent')
-    background_gradient = theme_data.get('backgroundGradient')
-    laser_color = theme_data.get('laserColor')
-    icon = theme_data.get('icon')
+
+
+def extract_theme_row(theme_data: Dict[str, Any], universe_id: str, universe_folder: str) -> Dict[str, Any]:
+    """Extract the typed themes table fields from parsed theme JSON.
+
+    universe_id is stored as given (the mapped universe UUID here, the folder name in
+    the content mirror); the uuid columns are derived from the universe folder name.
+    """
     music = theme_data.get('music')
-    particle_effect = theme_data.get('particleEffect')
     
     # Handle music field - keep as JSONB (full object) for new schema
     music_jsonb = None
@@ -121,10 +143,54 @@ def process_theme_file(file_path: Path, universe_uuid: str) -> Optional[tuple[st
     if 'meta' in theme_data and isinstance(theme_data['meta'], dict):
         created_at = theme_data['meta'].get('created')
     
+    theme_id = theme_data.get('id', '')
+    return {
+        'id': theme_id,
+        'uuid': content_uuids.theme_uuid(universe_folder, theme_id),
+        'universe_id': universe_id,
+        'universe_uuid': content_uuids.universe_uuid(universe_folder),
+        'name': theme_data.get('name', ''),
+        'description': theme_data.get('description'),
+        'color_primary': theme_data.get('colorPrimary'),
+        'color_accent': theme_data.get('colorAccent'),
+        'background_gradient': theme_data.get('backgroundGradient'),
+        'laser_color': theme_data.get('laserColor'),
+        'icon': theme_data.get('icon'),
+        'music': music_jsonb,
+        'particle_effect': theme_data.get('particleEffect'),
+        'created_at': created_at
+    }
+
+
+def process_theme_file(file_path: Path, universe_uuid: str) -> Optional[tuple[str, str, dict]]:
+    """Process a single theme JSON file and return (SQL INSERT statement, theme_id, csv_row_dict)."""
+    theme_data = load_theme_file(file_path)
+    if theme_data is None:
+        return None
+    
+    # Extract fields
+    with profile_stage('extract'):
+        row = extract_theme_row(theme_data, universe_uuid, extract_universe_id(file_path))
+    theme_id = row['id']
+    theme_uuid = row['uuid']
+    universe_key = row['universe_uuid']
+    name = row['name']
+    description = row['description']
+    color_primary = row['color_primary']
+    color_accent = row['color_accent']
+    background_gradient = row['background_gradient']
+    laser_color = row['laser_color']
+    icon = row['icon']
+    music_jsonb = row['music']
+    particle_effect = row['particle_effect']
+    created_at = row['created_at']
+    
     # Build SQL INSERT statement (music as JSONB)
     sql = f"""(
   {format_text(theme_id)},
+  {format_text(theme_uuid)},
   {format_text(universe_uuid)},
+  {format_text(universe_key)},
   {format_text(name)},
   {format_text(description)},
   {format_text(color_primary)},
@@ -141,7 +207,9 @@ def process_theme_file(file_path: Path, universe_uuid: str) -> Optional[tuple[st
     # Build CSV row dictionary
     csv_row = {
         'id': theme_id,
+        'uuid': theme_uuid,
         'universe_id': universe_uuid,
+        'universe_uuid': universe_key,
         'name': name or '',
         'description': description or '',
         'color_primary': color_primary or '',
@@ -167,8 +235,9 @@ def find_all_theme_files() -> list[Path]:
         return theme_files
     
     # Find all themes.*.json files
-    for file_path in CONTENT_DIR.rglob("themes.*.json"):
-        theme_files.append(file_path)
+    with profile_stage('discovery'):
+        for file_path in CONTENT_DIR.rglob("themes.*.json"):
+            theme_files.append(file_path)
     
     return sorted(theme_files)
 
@@ -181,7 +250,9 @@ def generate_csv_export(csv_rows: list[dict]) -> str:
     # CSV header (matching table schema, without uuid - will be auto-generated)
     headers = [
         'id',
+        'uuid',
         'universe_id',
+        'universe_uuid',
         'name',
         'description',
         'color_primary',
@@ -216,7 +287,9 @@ def generate_sql_insert(theme_files: list[tuple[str, str]], universe_mapping: Di
         "",
         "INSERT INTO public.themes (",
         "  id,",
+        "  uuid,",
         "  universe_id,",
+        "  universe_uuid,",
         "  name,",
         "  description,",
         "  color_primary,",
@@ -247,7 +320,8 @@ def generate_sql_insert(theme_files: list[tuple[str, str]], universe_mapping: Di
         else:
             sql_lines.append(line)
     
-    # Add ON CONFLICT clause
+    # Add ON CONFLICT clause - existing themes keep uuid and universe_uuid: the live
+    # universes are not keyed by the content uuids, re-pointing them would orphan the theme
     sql_lines.append("")
     sql_lines.append("ON CONFLICT (id) DO UPDATE SET")
     sql_lines.append("  name = EXCLUDED.name,")
@@ -265,8 +339,8 @@ def generate_sql_insert(theme_files: list[tuple[str, str]], universe_mapping: Di
     return '\n'.join(sql_lines)
 
 
-def main():
-    """Main function."""
+def generate_themes_migration(compress: Optional[str] = None):
+    """Generate the themes INSERT migration and CSV export."""
     print("Generating themes INSERT statements...")
     
     # Load universe mapping
@@ -300,7 +374,8 @@ def main():
             continue
         
         universe_uuid = universe_mapping[universe_id]
-        result = process_theme_file(file_path, universe_uuid)
+        with profile_file(file_path):
+            result = process_theme_file(file_path, universe_uuid)
         
         if result:
             sql_value, theme_id, csv_row = result
@@ -319,27 +394,42 @@ def main():
         return
     
     # Generate SQL
-    sql_output = generate_sql_insert(processed_themes, universe_mapping)
+    with profile_stage('format'):
+        sql_output = generate_sql_insert(processed_themes, universe_mapping)
     
     # Write SQL to file
-    with open(OUTPUT_SQL_FILE, 'w', encoding='utf-8') as f:
+    sql_file = compressed_file(OUTPUT_SQL_FILE, compress)
+    with profile_stage('write'), open_output(sql_file) as f:
         f.write(sql_output)
     
     # Generate CSV
-    csv_output = generate_csv_export(csv_rows)
+    with profile_stage('format'):
+        csv_output = generate_csv_export(csv_rows)
     
     # Write CSV to file
-    with open(OUTPUT_CSV_FILE, 'w', encoding='utf-8') as f:
+    csv_file = compressed_file(OUTPUT_CSV_FILE, compress)
+    with profile_stage('write'), open_output(csv_file) as f:
         f.write(csv_output)
     
     print(f"\n✅ Successfully generated SQL for {len(processed_themes)} themes")
-    print(f"📄 SQL output written to: {OUTPUT_SQL_FILE}")
-    print(f"📊 CSV output written to: {OUTPUT_CSV_FILE}")
+    print(f"📄 SQL output written to: {sql_file}")
+    print(f"📊 CSV output written to: {csv_file}")
     
     if errors:
         print(f"\n⚠️  {len(errors)} files had errors (see above)")
 
 
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Generate the themes INSERT migration from theme JSON files.")
+    add_compress_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    check_compress_argument(parser, args.compress)
+    with profiling(args):
+        generate_themes_migration(compress=args.compress)
+
+
 if __name__ == "__main__":
     main()
 
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Generate chunked multi-row UPSERT statements for rounds, items and round_objects.
+
+This script:
+1. Finds all chapter JSON files in public/content/themes/{universe}/{theme}/
+2. Parses each chapter file once and extracts its rounds, items and round objects
+3. Streams them into one SQL file per table, --rows-per-statement rows per
+   INSERT ... ON CONFLICT DO UPDATE statement, with BEGIN/COMMIT around every
+   --statements-per-transaction statements
+4. Keeps re-runs idempotent:
+   - rounds:        ON CONFLICT (id)
+   - round_objects: ON CONFLICT (round_id, object_type, order_index)
+   - items:         no unique key in the schema, so each statement is preceded by a
+                    DELETE of the items of its rounds (a round is never split across statements)
+   Existing rows keep their uuid and foreign key uuid columns on conflict: the live
+   keys may predate the uuid5 content keys (content_uuids.py). Inserted rounds
+   and items are linked to the uuid their chapter / round actually has.
+
+Load in foreign key order, e.g.:
+    psql -f upsert_rounds.sql -f upsert_round_objects.sql -f upsert_items.sql
+"""
+
+import argparse
+from contextlib import ExitStack
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import export_chapters_csv
+import export_items_csv
+import export_round_objects_csv
+import export_rounds_csv
+from copy_format import format_text_value
+from export_all import CHAPTER_TABLES, extract_chapter_tables
+from export_common import (
+    CONTENT_DIR, add_jobs_argument, find_all_chapter_files, find_all_theme_files, map_chapter_files, row_values
+)
+from export_profile import add_profile_arguments, profile_stage, profiling
+
+DEFAULT_ROWS_PER_STATEMENT = 500
+DEFAULT_STATEMENTS_PER_TRANSACTION = 20
+
+# Foreign key uuid columns re-pointed at the parent row after every insert:
+# column -> (parent table, column holding the parent id, parent column scoping the id or None)
+LINKED_UUID_COLUMNS = {
+    "round_uuid": (export_rounds_csv.COPY_TABLE, "round_id", None),
+    # Chapter ids repeat across themes; themes_uuid_backup holds the theme id
+    "chapter_uuid": ("public.chapters", "chapter_id", "themes_uuid_backup"),
+}
+
+# Upsert targets per exporter: (output file, conflict columns, column grouping rows per statement)
+UPSERT_TABLES = {
+    export_rounds_csv: (Path("upsert_rounds.sql"), ["id"], None),
+    export_items_csv: (Path("upsert_items.sql"), None, "round_id"),
+    export_round_objects_csv: (Path("upsert_round_objects.sql"), ["round_id", "object_type", "order_index"], None),
+}
+
+
+def sql_value(value: Any, column_type: str) -> str:
+    """Render a typed value as an SQL literal (the INSERT casts it to the column type)."""
+    if value is None:
+        return 'NULL'
+    return "'" + format_text_value(value, column_type).replace("'", "''") + "'"
+
+
+def is_kept_on_conflict(column: str) -> bool:
+    """Check whether an existing row keeps a column on conflict: created_at, uuid and foreign key uuids."""
+    return column in ('created_at', 'uuid') or column.endswith('_uuid')
+
+
+@lru_cache(maxsize=None)
+def chapter_themes() -> Dict[str, str]:
+    """Map the content uuid of every chapter declared in a theme file to its theme id."""
+    return {
+        row['uuid']: row['themes_uuid_backup']
+        for theme_file in find_all_theme_files()
+        for row in export_chapters_csv.process_theme_file(theme_file)
+    }
+
+
+# Lookups of the scope value of a parent from the content uuid a child row was exported with
+PARENT_SCOPES = {
+    "themes_uuid_backup": chapter_themes,
+}
+
+
+def build_link_updates(table: str, columns: Sequence[str], value_rows: Sequence[Sequence[str]]) -> str:
+    """Build UPDATEs pointing the LINKED_UUID_COLUMNS of the given rows at their parent's uuid.
+
+    Only rows still holding the exported content uuid are re-pointed, so new rows
+    follow parents whose live uuid predates content_uuids.py.
+    """
+    sql = ""
+    for column, (parent_table, id_column, scope_column) in LINKED_UUID_COLUMNS.items():
+        if column not in columns or id_column not in columns:
+            continue
+        uuid_index = list(columns).index(column)
+        id_index = list(columns).index(id_column)
+        scopes = PARENT_SCOPES[scope_column]() if scope_column else {}
+        links = {}
+        for row in value_rows:
+            if row[uuid_index] == 'NULL' or row[id_index] == 'NULL':
+                continue
+            link = (row[uuid_index], row[id_index])
+            if scope_column:
+                scope = scopes.get(row[uuid_index].strip("'"))
+                if scope is None:
+                    continue
+                link += (sql_value(scope, 'text'),)
+            links['(' + ', '.join(link) + ')'] = True
+        if not links:
+            continue
+        link_columns = "uuid, id, scope" if scope_column else "uuid, id"
+        condition = f"child.{column} = link.uuid::uuid AND parent.id = link.id"
+        if scope_column:
+            condition += f" AND parent.{scope_column} = link.scope"
+        sql += (
+            f"UPDATE {table} AS child SET {column} = parent.uuid "
+            f"FROM (VALUES {', '.join(links)}) AS link({link_columns}), {parent_table} AS parent "
+            f"WHERE {condition};\n"
+        )
+    return sql
+
+
+def build_upsert_statement(
+    table: str, columns: Sequence[str], conflict_columns: Optional[Sequence[str]], value_rows: Sequence[Sequence[str]]
+) -> str:
+    """Build one multi-row INSERT from rows of SQL literals, with ON CONFLICT (conflict_columns) DO UPDATE if given.
+
+    Columns kept on conflict (is_kept_on_conflict) are not updated; every other non-key
+    column is overwritten. The INSERT is followed by the link updates of its rows.
+    """
+    values = ',\n  '.join('(' + ', '.join(row) + ')' for row in value_rows)
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES\n  {values}"
+    if conflict_columns:
+        updates = [column for column in columns if column not in conflict_columns and not is_kept_on_conflict(column)]
+        sql += (
+            f"\nON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET\n  "
+            + ',\n  '.join(f"{column} = EXCLUDED.{column}" for column in updates)
+        )
+    return sql + ";\n" + build_link_updates(table, columns, value_rows)
+
+
+class UpsertWriter:
+    """Streaming writer for one upsert SQL file.
+
+    Rows are buffered until rows_per_statement are collected and then written as one
+    statement, so the SQL text for the whole table is never held in memory. With
+    group_column set, a statement only ends where that column changes value and
+    first deletes the existing rows of its groups (for tables without a unique key).
+    """
+
+    def __init__(
+        self,
+        output_file: Path,
+        table: str,
+        column_types: Dict[str, str],
+        conflict_columns: Optional[List[str]] = None,
+        group_column: Optional[str] = None,
+        rows_per_statement: int = DEFAULT_ROWS_PER_STATEMENT,
+        statements_per_transaction: int = DEFAULT_STATEMENTS_PER_TRANSACTION,
+    ):
+        self.output_file = output_file
+        self.table = table
+        self.columns = list(column_types)
+        self.types = list(column_types.values())
+        self.conflict_columns = conflict_columns
+        self.group_index = self.columns.index(group_column) if group_column else None
+        self.rows_per_statement = rows_per_statement
+        self.statements_per_transaction = statements_per_transaction
+        self.written = 0
+        self.statements = 0
+        self._buffer = []
+        self._in_transaction = False
+        self._file = open(output_file, 'w', encoding='utf-8')
+        self._file.write(f"-- Upsert {table}, {rows_per_statement} rows per statement\n")
+        self._file.write(f"-- Generated from chapter JSON files in {CONTENT_DIR}/\n\n")
+
+    def write_row(self, row: Any) -> None:
+        """Buffer one typed row (dict or row tuple, see export_common.row_values)."""
+        values = row_values(row, self.columns)
+        if len(self._buffer) >= self.rows_per_statement and (
+            self.group_index is None or values[self.group_index] != self._buffer[-1][self.group_index]
+        ):
+            self.flush()
+        self._buffer.append(values)
+
+    def flush(self) -> None:
+        """Write the buffered rows as one statement."""
+        if not self._buffer:
+            return
+
+        if not self._in_transaction:
+            self._file.write("BEGIN;\n\n")
+            self._in_transaction = True
+
+        if self.group_index is not None:
+            groups = dict.fromkeys(values[self.group_index] for values in self._buffer)
+            group_type = self.types[self.group_index]
+            self._file.write(
+                f"DELETE FROM {self.table} WHERE {self.columns[self.group_index]} IN "
+                f"({', '.join(sql_value(group, group_type) for group in groups)});\n"
+            )
+
+        value_rows = [
+            [sql_value(value, column_type) for value, column_type in zip(values, self.types)]
+            for values in self._buffer
+        ]
+        self._file.write(build_upsert_statement(self.table, self.columns, self.conflict_columns, value_rows))
+        self._file.write('\n')
+        self.written += len(self._buffer)
+        self.statements += 1
+        self._buffer = []
+
+        if self.statements_per_transaction and self.statements % self.statements_per_transaction == 0:
+            self._end_transaction()
+
+    def _end_transaction(self) -> None:
+        if self._in_transaction:
+            self._file.write("COMMIT;\n\n")
+            self._in_transaction = False
+
+    def close(self) -> None:
+        """Write the remaining rows, commit and close the file."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._end_transaction()
+        self._file.close()
+
+    def __enter__(self) -> 'UpsertWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def generate_upserts(
+    jobs: int = 1,
+    rows_per_statement: int = DEFAULT_ROWS_PER_STATEMENT,
+    statements_per_transaction: int = DEFAULT_STATEMENTS_PER_TRANSACTION,
+) -> None:
+    """Generate the rounds, items and round_objects upsert files, parsing every chapter file once."""
+    chapter_files = find_all_chapter_files()
+
+    if not chapter_files:
+        print(f"No chapter files found in {CONTENT_DIR}")
+        return
+
+    print(f"Found {len(chapter_files)} chapter files")
+
+    with ExitStack() as stack:
+        writers = []
+        for _, exporter, _ in CHAPTER_TABLES:
+            output_file, conflict_columns, group_column = UPSERT_TABLES[exporter]
+            writers.append(stack.enter_context(UpsertWriter(
+                output_file, exporter.COPY_TABLE, exporter.COLUMN_TYPES, conflict_columns, group_column,
+                rows_per_statement, statements_per_transaction
+            )))
+
+        for table_rows in map_chapter_files(extract_chapter_tables, chapter_files, jobs):
+            for writer, rows in zip(writers, table_rows):
+                with profile_stage('write'):
+                    for row in rows:
+                        writer.write_row(row)
+
+    print("\n✅ Upsert SQL generated")
+    for writer in writers:
+        print(f"   {writer.output_file}: {writer.written} rows in {writer.statements} statements")
+    files = ' '.join(f"-f {UPSERT_TABLES[exporter][0]}" for exporter in (export_rounds_csv, export_round_objects_csv, export_items_csv))
+    print(f"   Load with: psql {files}")
+
+
+def main() -> None:
+    """Parse command line arguments and generate the upserts."""
+    parser = argparse.ArgumentParser(description="Generate chunked UPSERT statements for rounds, items and round objects.")
+    parser.add_argument('--rows-per-statement', type=int, default=DEFAULT_ROWS_PER_STATEMENT,
+                        help=f"Rows per INSERT statement (default: {DEFAULT_ROWS_PER_STATEMENT})")
+    parser.add_argument('--statements-per-transaction', type=int, default=DEFAULT_STATEMENTS_PER_TRANSACTION,
+                        help=f"Statements per BEGIN/COMMIT block, 0 = one transaction per file "
+                             f"(default: {DEFAULT_STATEMENTS_PER_TRANSACTION})")
+    add_jobs_argument(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if args.rows_per_statement < 1:
+        parser.error("--rows-per-statement must be at least 1")
+    if args.statements_per_transaction < 0:
+        parser.error("--statements-per-transaction must not be negative")
+    with profiling(args):
+        generate_upserts(args.jobs, args.rows_per_statement, args.statements_per_transaction)
+
+
+if __name__ == "__main__":
+    main()
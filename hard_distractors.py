@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Hard distractor selection by string similarity for the vocabulary generators.
+
+This module:
+1. Embeds every term (english + german) as a hashed character n-gram vector
+   (bigrams and trigrams of the emoji-free, lowercased words)
+2. Computes the cosine similarity of query terms to all candidates in batched
+   NumPy matrix products (no pairwise Python loops)
+3. Drops candidates that are the same word (equal english or german term) or
+   near-identical (similarity >= synonym_similarity), which are likely synonyms
+   or inflections rather than distractors
+4. Picks k distractors at random among the most similar remaining candidates;
+   difficulty (0..1) sets how narrow that band is: (1 - difficulty)^2 of the
+   vocabulary, so 1 = only the most confusable terms, 0 = the whole vocabulary
+
+Used by generate_technical_english.py, generate_business_english.py and
+add_bc_level1.py, with a difficulty rising per level (see level_difficulty).
+With query_seeds every query draws from its own random stream, so its picks do
+not depend on the other queries or on their order.
+Requires numpy (pip install numpy); without it the generators fall back to
+random distractors.
+"""
+
+import math
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from distractor_index import clean_term
+from random_streams import stream_seed
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Hashed n-gram vector size; collisions only blur the similarity slightly
+EMBEDDING_DIM = 512
+NGRAM_SIZES = (2, 3)
+
+# Query rows per similarity matrix product (memory: BATCH_SIZE x candidates floats)
+BATCH_SIZE = 1024
+
+# Candidates at least this similar are treated as the same word
+DEFAULT_SYNONYM_SIMILARITY = 0.8
+
+# Difficulty of the first and last level (linear in between)
+EASIEST_DIFFICULTY = 0.3
+HARDEST_DIFFICULTY = 0.9
+
+# A term: (english, german)
+Term = Tuple[str, str]
+
+
+def level_difficulty(level: int, max_level: int = 6) -> float:
+    """Return the distractor difficulty of a level (EASIEST_DIFFICULTY at 1 to HARDEST_DIFFICULTY at max_level)."""
+    if max_level <= 1:
+        return HARDEST_DIFFICULTY
+    position = min(max(level - 1, 0), max_level - 1) / (max_level - 1)
+    return EASIEST_DIFFICULTY + (HARDEST_DIFFICULTY - EASIEST_DIFFICULTY) * position
+
+
+def term_ngrams(term: Term) -> List[int]:
+    """Return the hashed n-gram buckets of a term's english and german words."""
+    buckets = []
+    for word in term:
+        padded = f" {clean_term(word)} "
+        for size in NGRAM_SIZES:
+            for start in range(len(padded) - size + 1):
+                buckets.append(zlib.crc32(padded[start:start + size].encode('utf-8')) % EMBEDDING_DIM)
+    return buckets
+
+
+def embed_terms(terms: Sequence[Term]) -> 'np.ndarray':
+    """Return the L2-normalized n-gram count vectors of the terms (one row per term)."""
+    rows = []
+    columns = []
+    for row, term in enumerate(terms):
+        buckets = term_ngrams(term)
+        rows.extend([row] * len(buckets))
+        columns.extend(buckets)
+
+    vectors = np.zeros((len(terms), EMBEDDING_DIM), dtype=np.float32)
+    np.add.at(vectors, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)), 1.0)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def term_ids(terms: Sequence[Term], vocabulary: dict) -> 'np.ndarray':
+    """Map the cleaned english and german word of every term to integer ids (two columns)."""
+    return np.array(
+        [[vocabulary.setdefault(clean_term(word), len(vocabulary)) for word in term] for term in terms],
+        dtype=np.int64
+    ).reshape(len(terms), 2)
+
+
+class HardDistractorSelector:
+    """Picks confusable distractors for query terms from a candidate vocabulary."""
+
+    def __init__(self, candidates: Sequence[Term], synonym_similarity: float = DEFAULT_SYNONYM_SIMILARITY):
+        self.candidates = list(candidates)
+        self.synonym_similarity = synonym_similarity
+        self._words = {}
+        self._vectors = embed_terms(self.candidates)
+        self._ids = term_ids(self.candidates, self._words)
+
+    def select(
+        self, queries: Sequence[Term], k: int = 3, difficulty: float = 0.5, seed: Optional[int] = None,
+        query_seeds: Optional[Sequence[int]] = None
+    ) -> List[List[Term]]:
+        """Return up to k distractor terms for every query term, in query order.
+
+        The random picks come from one stream (seed) for all queries, or from one
+        stream per query if query_seeds is given.
+        """
+        rng = np.random.default_rng(seed)
+        count = len(self.candidates)
+        band = min(count, max(2 * k, math.ceil((1.0 - difficulty) ** 2 * count)))
+        query_vectors = embed_terms(queries)
+        query_ids = term_ids(queries, self._words)
+
+        selected = []
+        for start in range(0, len(queries), BATCH_SIZE):
+            similarity = query_vectors[start:start + BATCH_SIZE] @ self._vectors.T
+            ids = query_ids[start:start + BATCH_SIZE]
+
+            # Same word in either language (also across languages), or near-identical
+            excluded = similarity >= self.synonym_similarity
+            for query_column in range(2):
+                for candidate_column in range(2):
+                    excluded |= ids[:, query_column, None] == self._ids[None, :, candidate_column]
+            similarity[excluded] = -np.inf
+
+            # The band of most similar candidates, then k at random within it
+            if band < count:
+                top = np.argpartition(-similarity, band - 1, axis=1)[:, :band]
+            else:
+                top = np.broadcast_to(np.arange(count), similarity.shape)
+            top_similarity = np.take_along_axis(similarity, top, axis=1)
+            if query_seeds is None:
+                keys = rng.random(top.shape)
+            else:
+                keys = np.array([
+                    np.random.default_rng(query_seed).random(band)
+                    for query_seed in query_seeds[start:start + BATCH_SIZE]
+                ]).reshape(top.shape)
+            keys[np.isneginf(top_similarity)] = np.inf
+            order = np.argpartition(keys, k - 1, axis=1)[:, :k] if k < band else np.argsort(keys, axis=1)
+            picks = np.take_along_axis(top, order, axis=1)
+            valid = np.isfinite(np.take_along_axis(keys, order, axis=1))
+
+            for row_picks, row_valid in zip(picks, valid):
+                selected.append([self.candidates[pick] for pick in row_picks[row_valid]])
+        return selected
+
+
+def select_hard_distractors(
+    candidates: Sequence[Term], queries: Sequence[Term], k: int = 3, difficulty: float = 0.5,
+    seed: Optional[int] = None
+) -> Optional[List[List[Term]]]:
+    """Select k hard distractors per query, or return None if numpy is not installed."""
+    if np is None:
+        print("numpy is required for hard distractors, using random ones: pip install numpy")
+        return None
+    return HardDistractorSelector(candidates).select(queries, k, difficulty, seed)
+
+
+def select_vocabulary_distractors(
+    vocabulary: Dict[str, Dict[int, List[Tuple[str, str, str]]]], k: int = 3, seed: Optional[int] = None
+) -> Optional[Dict[Tuple[str, int, str], List[Term]]]:
+    """Select k hard distractors for every term of a generator vocabulary, at the difficulty of its level.
+
+    vocabulary is {chapter: {level: [(english, german, word type), ...]}}; the result
+    is keyed by (chapter, level, english) and drawn from the whole vocabulary. Each
+    term draws from the stream of (seed, chapter, level, english), so with a fixed
+    seed its picks only change when the vocabulary does. Returns None if numpy is
+    not installed.
+    """
+    if np is None:
+        print("numpy is required for hard distractors, using random ones: pip install numpy")
+        return None
+
+    terms_by_level = {}
+    for chapter, levels in vocabulary.items():
+        for level, words in levels.items():
+            terms_by_level.setdefault(level, []).extend((chapter, word_en, word_de) for word_en, word_de, _ in words)
+
+    candidates = [(word_en, word_de) for terms in terms_by_level.values() for _, word_en, word_de in terms]
+    selector = HardDistractorSelector(candidates)
+    max_level = max(terms_by_level, default=1)
+
+    selected = {}
+    for level, terms in sorted(terms_by_level.items()):
+        queries = [(word_en, word_de) for _, word_en, word_de in terms]
+        query_seeds = None
+        if seed is not None:
+            query_seeds = [stream_seed(seed, chapter, level, word_en) for chapter, word_en, _ in terms]
+        distractors = selector.select(queries, k, level_difficulty(level, max_level), seed, query_seeds)
+        for (chapter, word_en, _), chosen in zip(terms, distractors):
+            selected[(chapter, level, word_en)] = chosen
+    return selected
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Import rounds and their objects from the CSV exports back into chapter JSON files.
+
+This script:
+1. Streams rounds_export.csv and round_objects_export.csv (or items_export.csv
+   with --objects items), e.g. as exported from the database; .gz/.zst
+   compressed exports (--compress) are decompressed while streaming
+2. Groups the objects by round_id in one pass, side by side with the rounds
+   (both files must list rounds in the same order and each chapter's rounds
+   together, as export_all.py writes them or a dump ordered by chapter and round)
+3. Rebuilds the nested Item structure (base, correct[], distractors[], visual, meta)
+4. Writes one chapter at a time to public/content/themes/{universe}/{theme}/{chapter}.json
+
+Only one chapter is held in memory at a time. Fields the export does not carry
+(e.g. game, introText, meta.related, or the visual fields missing from items_export.csv)
+are kept from the existing chapter file; rounds missing from the export are dropped.
+Files whose content does not change are not rewritten.
+"""
+
+import argparse
+import csv
+import json
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+import content_uuids
+import export_items_csv
+import export_round_objects_csv
+import export_rounds_csv
+from compressed_io import find_input_file, open_input
+from export_common import CONTENT_DIR, chapter_universe_id, discover_content_files
+
+# Order of the object types within a round
+OBJECT_TYPE_ORDER = {'base': 0, 'correct': 1, 'distractor': 2}
+
+# Keys the export owns, per JSON object. A nested dict lists the owned keys of a
+# nested object; None means the whole value is replaced. Other keys are kept
+# from the existing chapter file.
+ROUND_KEYS = {
+    'id': None, 'theme': None, 'chapter': None, 'level': None, 'waveDuration': None,
+    'base': None, 'correct': None, 'distractors': None,
+    'meta': {'source': None, 'tags': None, 'difficultyScaling': None},
+}
+ENTRY_KEYS = {'word': None, 'type': None, 'image': None}
+
+# Object sources: exporter, type/order columns, owned keys per object type
+OBJECT_SOURCES = {
+    'round_objects': {
+        'exporter': export_round_objects_csv,
+        'entry_type': 'entry_type',
+        'order_index': 'order_index',
+        'keys': {
+            'base': {**ENTRY_KEYS, 'visual': None},
+            'correct': {
+                'entry': ENTRY_KEYS, 'spawnPosition': None, 'spawnSpread': None, 'speed': None, 'points': None,
+                'pattern': None, 'hp': None, 'collectionOrder': None, 'context': None, 'visual': None, 'sound': None,
+            },
+            'distractor': {
+                'entry': ENTRY_KEYS, 'spawnPosition': None, 'spawnSpread': None, 'speed': None, 'points': None,
+                'hp': None, 'damage': None, 'behavior': None, 'redirect': None, 'context': None, 'visual': None,
+                'sound': None,
+            },
+        },
+    },
+    'items': {
+        'exporter': export_items_csv,
+        'entry_type': 'type',
+        'order_index': None,
+        # Keys the exporter fills with the object's index when the object has none
+        'index_defaults': {'correct': ('collectionOrder',)},
+        'keys': {
+            'base': {**ENTRY_KEYS, 'visual': {'color': None, 'variant': None, 'pulsate': None, 'fontSize': None}},
+            'correct': {
+                'entry': ENTRY_KEYS, 'spawnPosition': None, 'spawnSpread': None, 'spawnDelay': None, 'speed': None,
+                'points': None, 'hp': None, 'collectionOrder': None, 'context': None, 'sound': None,
+                'visual': {'color': None, 'variant': None, 'pulsate': None, 'fontSize': None},
+            },
+            'distractor': {
+                'entry': ENTRY_KEYS, 'spawnPosition': None, 'spawnSpread': None, 'spawnDelay': None, 'speed': None,
+                'points': None, 'hp': None, 'damage': None, 'behavior': None, 'redirect': None, 'context': None,
+                'sound': None, 'visual': {'color': None, 'variant': None, 'pulsate': None, 'fontSize': None},
+            },
+        },
+    },
+}
+
+# JSON key -> CSV column per object type (entry fields are handled separately)
+OBJECT_FIELDS = {
+    'spawnPosition': 'spawn_position',
+    'spawnSpread': 'spawn_spread',
+    'spawnDelay': 'spawn_delay',
+    'speed': 'speed',
+    'points': 'points',
+    'pattern': 'pattern',
+    'hp': 'hp',
+    'damage': 'damage',
+    'behavior': 'behavior',
+    'redirect': 'redirect',
+    'context': 'context',
+    'sound': 'sound',
+}
+
+# items_export.csv visual columns
+ITEM_VISUAL_FIELDS = {'color': 'color', 'variant': 'variant', 'pulsate': 'pulsate', 'fontSize': 'font_size'}
+
+Row = Dict[str, str]
+
+
+def parse_number(value: str) -> Any:
+    """Parse a CSV number, keeping integers as int (1 stays 1, 1.0 stays 1.0)."""
+    if any(c in value for c in '.eE') or value.lower() in ('nan', 'infinity', '-infinity'):
+        return float(value)
+    return int(value)
+
+
+def parse_array_literal(value: str) -> List[str]:
+    """Parse a one-dimensional PostgreSQL text[] literal ({a,b} or {"a","b"})."""
+    inner = value.strip()[1:-1]
+    elements = []
+    current = []
+    quoted = False
+    in_quotes = False
+    escaped = False
+    for c in inner:
+        if escaped:
+            current.append(c)
+            escaped = False
+        elif c == '\\':
+            escaped = True
+        elif c == '"':
+            in_quotes = not in_quotes
+            quoted = True
+        elif c == ',' and not in_quotes:
+            elements.append(''.join(current) if quoted else ''.join(current).strip())
+            current = []
+            quoted = False
+        else:
+            current.append(c)
+    if inner:
+        elements.append(''.join(current) if quoted else ''.join(current).strip())
+    return elements
+
+
+def parse_csv_value(value: Optional[str], column_type: str) -> Any:
+    """Convert a CSV field back to its JSON value (empty -> None)."""
+    if value is None or value == '':
+        return None
+    if column_type == 'integer':
+        return int(parse_number(value))
+    if column_type in ('numeric', 'double precision'):
+        return parse_number(value)
+    if column_type == 'boolean':
+        return value.lower() in ('true', 't', '1')
+    if column_type == 'jsonb':
+        return json.loads(value)
+    if column_type == 'text[]':
+        return parse_array_literal(value)
+    return value
+
+
+def typed_value(row: Row, column: str, column_types: Dict[str, str]) -> Any:
+    """Return a typed CSV value (None if the column is missing or empty)."""
+    return parse_csv_value(row.get(column), column_types.get(column, 'text'))
+
+
+def drop_none(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Remove keys without a value, as the chapter files leave them out."""
+    return {key: value for key, value in values.items() if value is not None}
+
+
+def build_object(row: Row, object_type: str, source: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild one base/correct/distractor JSON object from its CSV row."""
+    exporter = source['exporter']
+    column_types = exporter.COLUMN_TYPES
+    owned = source['keys'][object_type]
+
+    entry = drop_none({
+        'word': typed_value(row, 'word', column_types),
+        'type': typed_value(row, source['entry_type'], column_types),
+        'image': typed_value(row, 'image', column_types),
+    })
+
+    if exporter is export_round_objects_csv:
+        visual = typed_value(row, 'visual', column_types)
+        collection_order = typed_value(row, 'collection_order', column_types)
+    else:
+        visual = drop_none({key: typed_value(row, column, column_types) for key, column in ITEM_VISUAL_FIELDS.items()})
+        collection_order = typed_value(row, 'collectionorder', column_types)
+
+    if object_type == 'base':
+        return drop_none({**entry, 'visual': visual})
+
+    # Keys in the order the chapter files use
+    obj = {}
+    for key in owned:
+        if key == 'entry':
+            obj[key] = entry
+        elif key == 'visual':
+            obj[key] = visual
+        elif key == 'collectionOrder':
+            obj[key] = collection_order
+        else:
+            obj[key] = typed_value(row, OBJECT_FIELDS[key], column_types)
+    return drop_none(obj)
+
+
+def build_round(round_row: Row, objects: List[Row], source: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild one round (Item) from its rounds row and object rows."""
+    column_types = export_rounds_csv.COLUMN_TYPES
+    order_column = source['order_index']
+
+    def sort_key(indexed_row: Tuple[int, Row]) -> Tuple[int, int]:
+        index, row = indexed_row
+        order = int(row[order_column]) if order_column and row.get(order_column) else index
+        return OBJECT_TYPE_ORDER.get(row.get('object_type'), 3), order
+
+    base = None
+    correct = []
+    distractors = []
+    theme_id = None
+    for _, row in sorted(enumerate(objects), key=sort_key):
+        object_type = row.get('object_type')
+        theme_id = theme_id or row.get('theme_id') or None
+        if object_type == 'base':
+            base = build_object(row, 'base', source)
+        elif object_type == 'correct':
+            correct.append(build_object(row, 'correct', source))
+        elif object_type == 'distractor':
+            distractors.append(build_object(row, 'distractor', source))
+
+    meta = drop_none({
+        'source': typed_value(round_row, 'meta_source', column_types),
+        'tags': typed_value(round_row, 'meta_tags', column_types),
+        'difficultyScaling': typed_value(round_row, 'meta_difficulty_scaling', column_types),
+    })
+
+    return drop_none({
+        'id': round_row['id'],
+        'theme': theme_id,
+        'chapter': round_row.get('chapter_id') or None,
+        'level': typed_value(round_row, 'level', column_types),
+        'waveDuration': typed_value(round_row, 'wave_duration', column_types),
+        'base': base,
+        'correct': correct,
+        'distractors': distractors,
+        'meta': meta or None,
+    })
+
+
+def merge_owned(existing: Dict[str, Any], imported: Dict[str, Any], owned: Dict[str, Any]) -> Dict[str, Any]:
+    """Overlay imported values on an existing JSON object.
+
+    Owned keys take the imported value (or disappear if it has none, unless they hold
+    null or ""), other keys are kept; the existing key order is preserved and new
+    keys are appended.
+    """
+    result = {}
+    for key, value in existing.items():
+        if key not in owned:
+            result[key] = value
+        elif owned[key] is not None and isinstance(value, dict):
+            merged = merge_owned(value, imported.get(key) or {}, owned[key])
+            if merged:
+                result[key] = merged
+        elif key in imported:
+            result[key] = imported[key]
+        elif value is None or value == '':
+            # The export cannot tell null and "" from a missing value; keep the file's spelling
+            result[key] = value
+    for key, value in imported.items():
+        if key not in result and key not in existing:
+            result[key] = value
+    return result
+
+
+def merge_objects(
+    existing: Any, imported: List[Dict[str, Any]], owned: Dict[str, Any], index_defaults: Tuple[str, ...] = ()
+) -> List[Dict[str, Any]]:
+    """Merge imported correct/distractor objects with the existing ones at the same index.
+
+    An index_defaults key holding the object's index is only taken if the existing
+    object has the key, as the export cannot tell the default from an explicit value.
+    """
+    existing = existing if isinstance(existing, list) else []
+    merged = []
+    for index, obj in enumerate(imported):
+        current = existing[index] if index < len(existing) and isinstance(existing[index], dict) else {}
+        obj = {key: value for key, value in obj.items() if key not in index_defaults or value != index or key in current}
+        merged.append(merge_owned(current, obj, owned) if current else obj)
+    return merged
+
+
+def merge_round(existing: Dict[str, Any], imported: Dict[str, Any], source: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge an imported round with the same round of the existing chapter file."""
+    keys = source['keys']
+    index_defaults = source.get('index_defaults', {})
+    # Without a theme in the object source the file's theme stays where it is
+    owned = ROUND_KEYS if 'theme' in imported else {key: value for key, value in ROUND_KEYS.items() if key != 'theme'}
+    merged = merge_owned(existing, imported, owned)
+    if isinstance(existing.get('base'), dict) and 'base' in imported:
+        merged['base'] = merge_owned(existing['base'], imported['base'], keys['base'])
+    if 'correct' in imported:
+        merged['correct'] = merge_objects(
+            existing.get('correct'), imported['correct'], keys['correct'], index_defaults.get('correct', ())
+        )
+    if 'distractors' in imported:
+        merged['distractors'] = merge_objects(
+            existing.get('distractors'), imported['distractors'], keys['distractor'], index_defaults.get('distractor', ())
+        )
+    return merged
+
+
+class ChapterIndex:
+    """Maps exported chapters to chapter file paths in the content tree."""
+
+    def __init__(self):
+        _, chapter_files = discover_content_files()
+        self.by_uuid = {}
+        self.by_theme_chapter = {}
+        self.by_chapter = {}
+        self.theme_universes = {}
+        for chapter_file in chapter_files:
+            universe_id = chapter_universe_id(chapter_file)
+            theme_id = chapter_file.parent.name
+            chapter_id = chapter_file.stem
+            self.by_uuid[content_uuids.chapter_uuid(universe_id, theme_id, chapter_id)] = chapter_file
+            self.by_theme_chapter[(theme_id, chapter_id)] = chapter_file
+            self.by_chapter.setdefault(chapter_id, []).append(chapter_file)
+            self.theme_universes.setdefault(theme_id, set()).add(universe_id)
+        if CONTENT_DIR.exists():
+            # Themes without chapter files yet
+            for theme_dir in CONTENT_DIR.glob('*/*/'):
+                self.theme_universes.setdefault(theme_dir.name, set()).add(theme_dir.parent.name)
+
+    def resolve(self, chapter_uuid: Optional[str], theme_id: Optional[str], chapter_id: str) -> Optional[Path]:
+        """Return the chapter file path of an exported chapter, or None if it is unknown or ambiguous."""
+        if chapter_uuid and chapter_uuid in self.by_uuid:
+            return self.by_uuid[chapter_uuid]
+        if theme_id:
+            if (theme_id, chapter_id) in self.by_theme_chapter:
+                return self.by_theme_chapter[(theme_id, chapter_id)]
+            universes = self.theme_universes.get(theme_id, set())
+            if len(universes) == 1:
+                return CONTENT_DIR / next(iter(universes)) / theme_id / f"{chapter_id}.json"
+            return None
+        candidates = self.by_chapter.get(chapter_id, [])
+        return candidates[0] if len(candidates) == 1 else None
+
+
+def iter_csv_rows(csv_file: Path) -> Iterator[Row]:
+    """Stream the rows of a (plain or compressed) CSV export."""
+    with open_input(csv_file) as f:
+        yield from csv.DictReader(f)
+
+
+def iter_rounds_with_objects(rounds_csv: Path, objects_csv: Path, stats: Dict[str, int]) -> Iterator[Tuple[Row, List[Row]]]:
+    """Pair every round with its object rows in one pass over both (same-ordered) files."""
+    groups = groupby(iter_csv_rows(objects_csv), key=lambda row: row['round_id'])
+    group = next(groups, None)
+    for round_row in iter_csv_rows(rounds_csv):
+        objects = []
+        if group is not None and group[0] == round_row['id']:
+            objects = list(group[1])
+            group = next(groups, None)
+        stats['objects'] += len(objects)
+        yield round_row, objects
+
+    # Object groups left over belong to rounds that are missing or out of order
+    while group is not None:
+        stats['orphaned objects'] += sum(1 for _ in group[1])
+        group = next(groups, None)
+
+
+def read_chapter_file(chapter_file: Path) -> Optional[List[Any]]:
+    """Read an existing chapter file, or None if there is none (or it cannot be read)."""
+    if not chapter_file.exists():
+        return None
+    try:
+        with open(chapter_file, 'r', encoding='utf-8-sig') as f:
+            items = json.load(f)
+    except Exception as e:
+        print(f"Warning: Cannot read {chapter_file}, replacing it: {e}")
+        return None
+    return items if isinstance(items, list) else None
+
+
+def write_chapter(
+    chapter_file: Path, output_file: Path, rounds: List[Dict[str, Any]], source: Dict[str, Any], merge: bool
+) -> bool:
+    """Write one chapter file from its imported rounds; returns whether the file changed."""
+    existing_items = read_chapter_file(chapter_file)
+    items = rounds
+    if merge and existing_items:
+        existing = {item.get('id'): item for item in existing_items if isinstance(item, dict)}
+        items = [merge_round(existing[item['id']], item, source) if item['id'] in existing else item for item in rounds]
+
+    # Compare parsed content, so unchanged hand-formatted files are left as they are
+    old_items = existing_items if output_file == chapter_file else read_chapter_file(output_file)
+    if old_items == items:
+        return False
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(items, f, indent=2, ensure_ascii=False)
+    return True
+
+
+def import_chapters(
+    input_dir: Path = Path('.'), objects: str = 'round_objects', output_dir: Path = CONTENT_DIR, merge: bool = True
+) -> Optional[Dict[str, int]]:
+    """Stream the rounds and object exports back into chapter JSON files and return the counts."""
+    source = OBJECT_SOURCES[objects]
+    rounds_csv = find_input_file(input_dir / export_rounds_csv.OUTPUT_CSV_FILE.name)
+    objects_csv = find_input_file(input_dir / source['exporter'].OUTPUT_CSV_FILE.name)
+    for csv_file in (rounds_csv, objects_csv):
+        if not csv_file.exists():
+            print(f"Error: Input file not found: {csv_file}")
+            return None
+
+    index = ChapterIndex()
+    stats = {'rounds': 0, 'objects': 0, 'chapters written': 0, 'chapters unchanged': 0,
+             'rounds skipped': 0, 'orphaned objects': 0}
+    finished = set()
+    current_file = None
+    current_rounds = []
+
+    def flush() -> None:
+        if current_file is None:
+            return
+        output_file = output_dir / current_file.relative_to(CONTENT_DIR)
+        if write_chapter(current_file, output_file, current_rounds, source, merge):
+            stats['chapters written'] += 1
+            print(f"Wrote {output_file} ({len(current_rounds)} rounds)")
+        else:
+            stats['chapters unchanged'] += 1
+        finished.add(current_file)
+
+    for round_row, object_rows in iter_rounds_with_objects(rounds_csv, objects_csv, stats):
+        item = build_round(round_row, object_rows, source)
+        chapter_file = index.resolve(round_row.get('chapter_uuid'), item.get('theme'), item.get('chapter', ''))
+        if chapter_file is None:
+            print(f"Warning: Cannot place round {round_row['id']} (chapter {item.get('chapter')}), skipping it")
+            stats['rounds skipped'] += 1
+            continue
+
+        if chapter_file != current_file:
+            if chapter_file in finished:
+                print(f"Error: Rounds of {chapter_file} are not contiguous in {rounds_csv}; "
+                      f"export ordered by chapter and round and run again")
+                return None
+            flush()
+            current_file = chapter_file
+            current_rounds = []
+
+        current_rounds.append(item)
+        stats['rounds'] += 1
+
+    flush()
+
+    print(f"\n✅ Import complete: {output_dir}")
+    for label, count in stats.items():
+        print(f"   {label}: {count}")
+    if stats['orphaned objects']:
+        print(f"   Warning: {objects_csv} lists objects of rounds missing from (or ordered differently than) {rounds_csv}")
+    return stats
+
+
+def main() -> None:
+    """Parse command line arguments and run the import."""
+    parser = argparse.ArgumentParser(description="Import rounds and objects from the CSV exports back into chapter JSON files.")
+    parser.add_argument('--input-dir', type=Path, default=Path('.'), help="Directory with the export CSVs (default: .)")
+    parser.add_argument('--objects', choices=list(OBJECT_SOURCES), default='round_objects',
+                        help="Export to take the base/correct/distractor objects from (default: round_objects)")
+    parser.add_argument('--output-dir', type=Path, default=CONTENT_DIR,
+                        help=f"Root for the written chapter files (default: {CONTENT_DIR}, i.e. in place)")
+    parser.add_argument('--no-merge', action='store_true',
+                        help="Do not keep fields the export does not carry from the existing chapter files")
+    args = parser.parse_args()
+    import_chapters(args.input_dir, args.objects, args.output_dir, merge=not args.no_merge)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Generate chapter JSON files from declarative theme specs.
+
+This script:
+1. Loads the THEME_SPEC of every themed generate_*_items.py script (THEME_MODULES):
+   the item data (ITEMS, CHAPTER_MAPPING) plus ids, output folder, base type,
+   colors, meta source/tags and a styling preset (STYLE_PRESETS)
+2. Builds every item with create_item() - base, correct and distractor objects
+   styled by the preset, spawn positions shuffled per item
+3. Generates all chapters of all themes on a process pool (--jobs)
+4. Writes only the chapter files whose content changed
+
+The spawn positions of every round are shuffled with its own random stream,
+seeded by spec.seed and the theme, chapter and item ids (random_streams.py), so
+each chapter file is reproducible on its own: the output does not depend on
+--jobs or on the other chapters, and only edited rounds change.
+
+Usage:
+    python item_generator.py                  # all themes
+    python item_generator.py --theme disney   # only the given theme ids
+    python generate_disney_items.py           # a single theme, as before
+"""
+
+import argparse
+import importlib
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from export_common import add_jobs_argument, resolve_jobs
+from random_streams import stream_random
+
+# Themed generator scripts that declare a THEME_SPEC
+THEME_MODULES = [
+    "generate_disney_items",
+    "generate_lucifer_items",
+    "generate_gen_alpha_items",
+    "generate_internetslang_items",
+    "generate_italian_brainrot_items",
+    "generate_michael_schur_items",
+    "generate_the_office_items",
+]
+
+# Declarative theme spec: item data plus presentation
+ThemeSpec = namedtuple('ThemeSpec', [
+    'theme_id',               # theme folder / "theme" of every item, e.g. "disney"
+    'id_prefix',              # item id prefix, e.g. "DS" -> DS_FR_001
+    'output_dir',             # e.g. "public/content/themes/filme/disney"
+    'chapter_abbreviations',  # chapter name -> id abbreviation ("XX" if missing)
+    'chapter_mapping',        # item number -> chapter name
+    'items',                  # item number -> {"level", "base", "correct", "distractors"}
+    'base_type',              # base entry type, e.g. "DisneyTerm"
+    'base_color',             # base visual color
+    'source',                 # meta.source
+    'tags',                   # meta.tags (the lowercase chapter name is appended)
+    'style',                  # key of STYLE_PRESETS
+    'seed',                   # seed of the spawn position streams (part of every stream's id path)
+], defaults=['default', 42])
+
+# Styling presets for the objects of a round
+STYLE_PRESETS = {
+    'default': {
+        'speed': 1.0,
+        'pattern': 'linear_inward',
+        'correct_color': '#4CAF50',
+        'correct_variants': ["star", "hexagon", "bubble", "spike"],
+        'distractor_colors': ["#E91E63", "#9B59B6", "#FF5722", "#FFC107"],
+        'distractor_variants': ["square", "diamond", "spike", "bubble"],
+    },
+}
+
+# Spawn positions 0.1 .. 0.9
+SPAWN_POSITIONS = [round(x * 0.1, 2) for x in range(1, 10)]
+
+# One chapter to generate: (spec, chapter name, item numbers)
+ChapterTask = Tuple[ThemeSpec, str, List[int]]
+
+
+def generate_item_id(spec: ThemeSpec, chapter_name: str, item_num: int) -> str:
+    """Generate an item id like DS_FR_001."""
+    abbr = spec.chapter_abbreviations.get(chapter_name, "XX")
+    return f"{spec.id_prefix}_{abbr}_{item_num:03d}"
+
+
+def create_item(spec: ThemeSpec, item_num: int, chapter_name: str, item_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Create a single item entry (spawn positions shuffled by the item's own random stream)."""
+    style = STYLE_PRESETS[spec.style]
+    item_id = generate_item_id(spec, chapter_name, item_num)
+    rng = stream_random(spec.seed, spec.theme_id, chapter_name, item_id)
+
+    base = {
+        "word": item_data["base"],
+        "type": spec.base_type,
+        "visual": {
+            "tier": 2,
+            "size": 1,
+            "appearance": "bold",
+            "color": spec.base_color,
+            "glow": True,
+            "pulsate": True
+        }
+    }
+
+    # Correct entries - breitere spawnPosition (0.1-0.9)
+    available_positions = list(SPAWN_POSITIONS)
+    rng.shuffle(available_positions)
+
+    correct = []
+    for idx, corr in enumerate(item_data["correct"]):
+        correct.append({
+            "entry": {
+                "word": corr["word"],
+                "type": "CorrectMatch"
+            },
+            "spawnPosition": available_positions[idx % len(available_positions)],
+            "spawnSpread": 0.05,
+            "speed": style['speed'],
+            "points": 200,
+            "pattern": style['pattern'],
+            "hp": 1,
+            "collectionOrder": idx + 1 if len(item_data["correct"]) > 1 else None,
+            "context": corr["context"],
+            "visual": {
+                "color": style['correct_color'],
+                "variant": style['correct_variants'][idx % len(style['correct_variants'])],
+                "pulsate": False,
+                "fontSize": 1.1
+            },
+            "sound": "bubble_hit_soft"
+        })
+
+    # Distractor entries - gleiche speed und behavior wie correct, restliche Positionen
+    distractor_positions = available_positions[len(item_data["correct"]):]
+    if len(distractor_positions) < len(item_data["distractors"]):
+        distractor_positions.extend([p for p in SPAWN_POSITIONS if p not in distractor_positions])
+
+    distractors = []
+    for idx, dist in enumerate(item_data["distractors"]):
+        distractors.append({
+            "entry": {
+                "word": dist["word"],
+                "type": "WrongMatch"
+            },
+            "spawnPosition": distractor_positions[idx % len(distractor_positions)],
+            "spawnSpread": 0.05,
+            "speed": style['speed'],
+            "points": 100,
+            "hp": 1,
+            "damage": 1,
+            "behavior": style['pattern'],
+            "context": dist["context"],
+            "visual": {
+                "color": style['distractor_colors'][idx % len(style['distractor_colors'])],
+                "variant": style['distractor_variants'][idx % len(style['distractor_variants'])],
+                "pulsate": True,
+                "shake": False,
+                "fontSize": 1.0
+            },
+            "sound": "explosion_minor",
+            "redirect": dist["redirect"]
+        })
+
+    meta = {
+        "source": spec.source,
+        "tags": list(spec.tags) + [chapter_name.lower()],
+        "related": [],
+        "difficultyScaling": {
+            "speedMultiplierPerReplay": 1.05,
+            "colorContrastFade": True,
+            "angleVariance": 0.3
+        }
+    }
+
+    return {
+        "id": item_id,
+        "theme": spec.theme_id,
+        "chapter": chapter_name,
+        "level": item_data["level"],
+        "waveDuration": 3,
+        "base": base,
+        "correct": correct,
+        "distractors": distractors,
+        "meta": meta
+    }
+
+
+def group_chapters(spec: ThemeSpec) -> Dict[str, List[int]]:
+    """Return the sorted item numbers per chapter, chapters in order of first appearance."""
+    chapters = {}
+    for item_num, chapter_name in spec.chapter_mapping.items():
+        chapters.setdefault(chapter_name, []).append(item_num)
+    return {chapter_name: sorted(item_nums) for chapter_name, item_nums in chapters.items()}
+
+
+def chapter_tasks(spec: ThemeSpec) -> List[ChapterTask]:
+    """Split a theme into independent chapter tasks."""
+    return [(spec, chapter_name, item_nums) for chapter_name, item_nums in group_chapters(spec).items()]
+
+
+def write_if_changed(filepath: str, text: str) -> bool:
+    """Write a file unless it already has this content; return whether it was written."""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return True
+
+
+def generate_chapter(task: ChapterTask) -> Tuple[str, int, bool]:
+    """Generate one chapter file and return (path, item count, written) (process pool worker)."""
+    spec, chapter_name, item_nums = task
+    items = [
+        create_item(spec, chapter_item_num, chapter_name, spec.items[item_num])
+        for chapter_item_num, item_num in enumerate(item_nums, 1)
+    ]
+    filepath = os.path.join(spec.output_dir, f"{chapter_name}.json")
+    return filepath, len(items), write_if_changed(filepath, json.dumps(items, indent=2, ensure_ascii=False))
+
+
+def load_theme_specs(theme_ids: Optional[List[str]] = None) -> List[ThemeSpec]:
+    """Import the THEME_SPEC of every module in THEME_MODULES (optionally only the given theme ids)."""
+    specs = [importlib.import_module(module).THEME_SPEC for module in THEME_MODULES]
+    if theme_ids:
+        specs = [spec for spec in specs if spec.theme_id in theme_ids]
+    return specs
+
+
+def generate_themes(specs: List[ThemeSpec], jobs: int = 1) -> Dict[str, int]:
+    """Generate all chapters of the given themes and return the written/unchanged counts."""
+    tasks = []
+    for spec in specs:
+        os.makedirs(spec.output_dir, exist_ok=True)
+        tasks.extend(chapter_tasks(spec))
+
+    jobs = resolve_jobs(jobs, len(tasks))
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(generate_chapter, tasks))
+    else:
+        results = [generate_chapter(task) for task in tasks]
+
+    counts = {'written': 0, 'unchanged': 0}
+    for filepath, item_count, written in results:
+        if written:
+            print(f"Generated {os.path.basename(filepath)} with {item_count} items")
+            counts['written'] += 1
+        else:
+            counts['unchanged'] += 1
+    return counts
+
+
+def main() -> None:
+    """Parse command line arguments and generate the themes."""
+    parser = argparse.ArgumentParser(description="Generate the chapter files of the themed item generators.")
+    parser.add_argument('--theme', nargs='+', metavar='THEME_ID',
+                        help="Only generate these theme ids (default: all themes in THEME_MODULES)")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    specs = load_theme_specs(args.theme)
+    if not specs:
+        print(f"No theme specs found for: {', '.join(args.theme)}")
+        return
+
+    counts = generate_themes(specs, args.jobs)
+    print(f"\n✅ {len(specs)} themes: {counts['written']} chapter files written, {counts['unchanged']} unchanged")
+
+
+if __name__ == "__main__":
+    main()
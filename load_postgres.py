@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Load the exporter output into PostgreSQL with COPY.
+
+This script:
+1. Finds the export files of every content table in --input-dir
+   (universes_export.csv, themes_export.csv, chapters_export.csv and the
+   rounds/items/round_objects/chapter_payloads exports in --format csv, copy or copy-binary),
+   plain or compressed with --compress gzip|zstd (.gz/.zst, decompressed while streaming)
+2. Loads them in foreign key order:
+   universes -> themes -> chapters -> rounds -> items + round_objects + chapter_payloads
+3. Runs the files of one stage in parallel on a small connection pool
+   (--connections), each COPY in its own transaction
+4. Reports rows, MB and throughput per file and per stage
+
+With --shards, rounds, items and round_objects come from the universe shards of
+export_all.py --shard-by-universe instead (checked against the shard manifest):
+each shard loads in its own transaction, the shards in parallel. --universe
+reloads only the given universes, replacing their rows, e.g.:
+    python export_all.py --shard-by-universe --universe englisch
+    python load_postgres.py --dsn ... --shards shards --universe englisch
+
+For a throwaway or staging database, --create-schema creates missing tables
+(round_objects and chapter_payloads from their *_table.sql files, the others from the exporters'
+column types) and --truncate empties them first, e.g.:
+    python export_all.py --format copy-binary
+    python load_postgres.py --dsn postgresql://localhost/wordrush_test --create-schema --truncate --format copy-binary
+"""
+
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import content_uuids
+import export_chapter_payloads
+import export_chapters_csv
+import export_items_csv
+import export_round_objects_csv
+import export_rounds_csv
+import export_universes_csv
+import generate_themes_insert
+from compressed_io import find_input_file, open_input
+from copy_format import copy_output_file, copy_statement
+from export_common import add_format_argument
+from export_shards import load_shard_manifest, verify_shard_file
+
+try:
+    import psycopg
+    from psycopg_pool import ConnectionPool
+except ImportError:
+    psycopg = None
+    ConnectionPool = None
+
+# Tables created from their own schema files by --create-schema (the others from the column types)
+SCHEMA_FILES = {
+    "public.round_objects": Path("round_objects_table.sql"),
+    "public.chapter_payloads": export_chapter_payloads.SCHEMA_FILE,
+}
+
+DEFAULT_CONNECTIONS = 4
+
+# Bytes per write to the COPY stream
+COPY_BLOCK_SIZE = 1 << 20
+
+# Load stages in foreign key order; the tables of one stage are loaded in parallel.
+# (table, exporter, PostgreSQL column types, whether the exporter writes COPY files)
+LOAD_STAGES = [
+    [("public.universes", export_universes_csv, export_universes_csv.COLUMN_TYPES, False)],
+    [("public.themes", generate_themes_insert, {**generate_themes_insert.COLUMN_TYPES, "updated_at": "timestamptz"}, False)],
+    [("public.chapters", export_chapters_csv, export_chapters_csv.COLUMN_TYPES, False)],
+    [("public.rounds", export_rounds_csv, export_rounds_csv.COLUMN_TYPES, True)],
+    [
+        ("public.items", export_items_csv, export_items_csv.COLUMN_TYPES, True),
+        ("public.round_objects", export_round_objects_csv, export_round_objects_csv.COLUMN_TYPES, True),
+        ("public.chapter_payloads", export_chapter_payloads, export_chapter_payloads.COLUMN_TYPES, True),
+    ],
+]
+
+# Primary keys of the tables created by --create-schema (round_objects.round_id references rounds.id)
+PRIMARY_KEYS = {
+    "public.rounds": "id",
+    "public.items": "uuid",
+}
+
+# Column types per table, in foreign key order
+TABLE_COLUMN_TYPES = {table: column_types for stage in LOAD_STAGES for table, _, column_types, _ in stage}
+
+# Load task: (table, export file, column types, file format)
+LoadTask = Tuple[str, Path, Dict[str, str], str]
+
+# Loaded file: (task, rows, seconds)
+LoadResult = Tuple[LoadTask, int, float]
+
+
+def create_table_sql(table: str, column_types: Dict[str, str]) -> str:
+    """Build a CREATE TABLE IF NOT EXISTS statement from exporter column types."""
+    columns = [f"  {column} {column_type}" for column, column_type in column_types.items()]
+    if table in PRIMARY_KEYS:
+        columns.append(f"  primary key ({PRIMARY_KEYS[table]})")
+    return f"create table if not exists {table} (\n" + ',\n'.join(columns) + "\n);\n"
+
+
+def create_schema(conn) -> None:
+    """Create the content tables that do not exist yet (throwaway/staging databases only)."""
+    for stage in LOAD_STAGES:
+        for table, _, column_types, _ in stage:
+            if table in SCHEMA_FILES:
+                if conn.execute("select to_regclass(%s)", (table,)).fetchone()[0] is None:
+                    conn.execute(SCHEMA_FILES[table].read_text(encoding='utf-8'))
+                continue
+            conn.execute(create_table_sql(table, column_types))
+    conn.commit()
+
+
+def truncate_tables(conn) -> None:
+    """Empty all content tables."""
+    tables = [table for stage in LOAD_STAGES for table, _, _, _ in stage]
+    conn.execute(f"truncate {', '.join(reversed(tables))}")
+    conn.commit()
+
+
+def find_stage_tasks(input_dir: Path, stage, output_format: str) -> List[LoadTask]:
+    """Return the load tasks of one stage; missing export files are reported and skipped."""
+    tasks = []
+    for table, exporter, column_types, writes_copy in stage:
+        file_format = output_format if writes_copy else 'csv'
+        export_file = input_dir / exporter.OUTPUT_CSV_FILE.name
+        if file_format != 'csv':
+            export_file = copy_output_file(export_file, file_format == 'copy-binary')
+        export_file = find_input_file(export_file)
+        if not export_file.exists():
+            print(f"Warning: {export_file} not found, skipping {table}")
+            continue
+        tasks.append((table, export_file, column_types, file_format))
+    return tasks
+
+
+def stream_file(cursor, sql: str, export_file: Path) -> None:
+    """Send a file to COPY ... FROM STDIN as it is (decompressed), block by block."""
+    with open_input(export_file, 'rb') as f, cursor.copy(sql) as copy:
+        while True:
+            block = f.read(COPY_BLOCK_SIZE)
+            if not block:
+                break
+            copy.write(block)
+
+
+def copy_csv_file(cursor, table: str, export_file: Path, column_types: Dict[str, str]) -> None:
+    """COPY a CSV export with a header row.
+
+    The columns come from the header. Columns the table does not load (the empty
+    bigserial id of round_objects) are dropped while streaming the rows.
+    """
+    with open_input(export_file) as f:
+        header = next(csv.reader(f), [])
+        columns = [column for column in header if column in column_types]
+
+        if columns == header:
+            sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, HEADER true)"
+            stream_file(cursor, sql, export_file)
+            return
+
+        positions = [header.index(column) for column in columns]
+        with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in csv.reader(f):
+                # Unquoted empty CSV fields are NULL
+                copy.write_row([row[position] or None for position in positions])
+
+
+def copy_export_file(cursor, table: str, export_file: Path, column_types: Dict[str, str], file_format: str) -> None:
+    """COPY one export file (CSV, COPY text or COPY binary) into its table."""
+    if file_format == 'csv':
+        copy_csv_file(cursor, table, export_file, column_types)
+        return
+
+    stream_file(cursor, copy_statement(table, list(column_types), file_format == 'copy-binary'), export_file)
+
+
+def load_file(pool, task: LoadTask) -> List[LoadResult]:
+    """Load one export file on a pooled connection and return [(task, rows, seconds)]."""
+    table, export_file, column_types, file_format = task
+    start = time.perf_counter()
+    with pool.connection() as conn, conn.cursor() as cursor:
+        copy_export_file(cursor, table, export_file, column_types, file_format)
+        rows = cursor.rowcount
+    return [(task, rows, time.perf_counter() - start)]
+
+
+def delete_universe_rows(cursor, universe_id: str, chapter_uuids: List[str]) -> int:
+    """Delete the items, round objects and rounds of one universe and return the rows deleted.
+
+    The universe's chapters are found through themes.universe_uuid, plus the chapter
+    UUIDs listed for the shard in the manifest (for rounds whose chapter row is missing).
+    """
+    chapters = (
+        "select c.uuid from public.chapters c join public.themes t on t.uuid = c.themes_uuid "
+        "where t.universe_uuid = %(universe_uuid)s::uuid "
+        "union select unnest(%(chapter_uuids)s::uuid[])"
+    )
+    params = {'universe_uuid': content_uuids.universe_uuid(universe_id), 'chapter_uuids': chapter_uuids}
+    deleted = 0
+    for statement in (
+        f"delete from public.items where round_uuid in (select uuid from public.rounds where chapter_uuid in ({chapters}))",
+        f"delete from public.round_objects where round_id in (select id from public.rounds where chapter_uuid in ({chapters}))",
+        f"delete from public.rounds where chapter_uuid in ({chapters})",
+    ):
+        cursor.execute(statement, params)
+        deleted += cursor.rowcount
+    return deleted
+
+
+def load_shard(
+    pool, shard_dir: Path, universe_id: str, shard: Dict[str, Any], file_format: str, replace: bool = False
+) -> List[LoadResult]:
+    """Load the files of one universe shard in foreign key order, in one transaction.
+
+    With replace, the universe's existing rows are deleted first, so a failed load
+    leaves the previous rows in place.
+    """
+    results = []
+    with pool.connection() as conn, conn.cursor() as cursor:
+        if replace:
+            deleted = delete_universe_rows(cursor, universe_id, shard.get('chapter_uuids', []))
+            print(f"      {universe_id}: deleted {deleted} existing rows")
+        for table, column_types in TABLE_COLUMN_TYPES.items():
+            entry = shard['files'].get(table)
+            if not entry:
+                continue
+            export_file = shard_dir / entry['path']
+            start = time.perf_counter()
+            copy_export_file(cursor, table, export_file, column_types, file_format)
+            results.append(((table, export_file, column_types, file_format), cursor.rowcount, time.perf_counter() - start))
+    return results
+
+
+def select_shards(shard_dir: Path, universes: Optional[List[str]] = None) -> Optional[Tuple[str, Dict[str, Dict[str, Any]]]]:
+    """Read the shard manifest, pick the requested universes and verify their files.
+
+    Returns (format, shards by universe), or None if the shards cannot be loaded.
+    """
+    manifest = load_shard_manifest(shard_dir)
+    if manifest is None:
+        print(f"Error: No shard manifest in {shard_dir} (export with: python export_all.py --shard-by-universe)")
+        return None
+
+    shards = manifest.get('shards', {})
+    if universes:
+        missing = [universe for universe in universes if universe not in shards]
+        if missing:
+            print(f"Error: No shards for universe(s): {', '.join(missing)}")
+            return None
+        shards = {universe: shards[universe] for universe in universes}
+
+    problems = []
+    for shard in shards.values():
+        for entry in shard['files'].values():
+            problem = verify_shard_file(shard_dir, entry)
+            if problem:
+                problems.append(problem)
+    if problems:
+        for problem in problems:
+            print(f"Error: {problem}")
+        return None
+
+    return manifest['format'], shards
+
+
+def format_throughput(rows: int, size: int, seconds: float) -> str:
+    """Format rows, size and throughput of a load."""
+    seconds = max(seconds, 1e-9)
+    mb = size / 1_000_000
+    return f"{rows:>8} rows  {mb:8.2f} MB  {seconds:7.2f}s  {rows / seconds:>10.0f} rows/s  {mb / seconds:7.2f} MB/s"
+
+
+def load_exports(
+    dsn: str,
+    input_dir: Path = Path('.'),
+    output_format: str = 'csv',
+    connections: int = DEFAULT_CONNECTIONS,
+    create: bool = False,
+    truncate: bool = False,
+    shard_dir: Optional[Path] = None,
+    universes: Optional[List[str]] = None,
+) -> Optional[Dict[str, int]]:
+    """Load all export files in foreign key order and return the rows loaded per table.
+
+    With shard_dir, the tables in the shard manifest are loaded per universe shard
+    (one transaction per shard, shards in parallel) instead of from input_dir. With
+    universes, only those shards are loaded, replacing the universes' existing rows,
+    and the unsharded tables are left alone.
+    """
+    if psycopg is None:
+        print("psycopg and psycopg_pool are required for the loader: pip install 'psycopg[binary,pool]'")
+        return None
+
+    shards = {}
+    shard_format = output_format
+    if shard_dir is not None:
+        selected = select_shards(shard_dir, universes)
+        if selected is None:
+            return None
+        shard_format, shards = selected
+    sharded_tables = {table for shard in shards.values() for table in shard['files']}
+
+    # Jobs per stage: ('file', task) or ('shard', universe_id, shard); all shards run in
+    # the stage of the first sharded table, each loading its tables in order
+    stages = []
+    shards_placed = False
+    for stage in LOAD_STAGES:
+        unsharded = [entry for entry in stage if entry[0] not in sharded_tables]
+        jobs = [] if universes else [('file', task) for task in find_stage_tasks(input_dir, unsharded, output_format)]
+        if not shards_placed and len(unsharded) < len(stage):
+            jobs += [('shard', universe_id, shard) for universe_id, shard in shards.items()]
+            shards_placed = True
+        stages.append(jobs)
+
+    def job_files(job) -> List[Path]:
+        if job[0] == 'file':
+            return [job[1][1]]
+        return [shard_dir / entry['path'] for entry in job[2]['files'].values()]
+
+    def file_label(export_file: Path) -> str:
+        if shard_dir is not None and shard_dir in export_file.parents:
+            return export_file.relative_to(shard_dir).as_posix()
+        return export_file.name
+
+    task_count = sum(len(job_files(job)) for jobs in stages for job in jobs)
+    if not task_count:
+        print(f"No export files found in {input_dir}")
+        return None
+
+    totals = {}
+    started = time.perf_counter()
+    total_bytes = 0
+    done = 0
+
+    # The export files are UTF-8
+    pool_kwargs = {'client_encoding': 'utf8'}
+    with ConnectionPool(dsn, min_size=1, max_size=connections, kwargs=pool_kwargs, open=True) as pool:
+        with pool.connection() as conn:
+            if create:
+                create_schema(conn)
+            if truncate:
+                truncate_tables(conn)
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            for jobs in stages:
+                if not jobs:
+                    continue
+                stage_started = time.perf_counter()
+                stage_bytes = sum(export_file.stat().st_size for job in jobs for export_file in job_files(job))
+                stage_rows = 0
+                stage_tables = []
+
+                # The next stage references this one, so wait for all of its files
+                futures = [
+                    executor.submit(load_file, pool, job[1]) if job[0] == 'file'
+                    else executor.submit(load_shard, pool, shard_dir, job[1], job[2], shard_format, bool(universes))
+                    for job in jobs
+                ]
+                for future in as_completed(futures):
+                    for (table, export_file, _, _), rows, seconds in future.result():
+                        done += 1
+                        stage_rows += rows
+                        stage_tables.append(table)
+                        totals[table] = totals.get(table, 0) + rows
+                        print(f"[{done}/{task_count}] {table:<20} {format_throughput(rows, export_file.stat().st_size, seconds)}"
+                              f"  {file_label(export_file)}")
+
+                total_bytes += stage_bytes
+                if len(stage_tables) > 1:
+                    tables = ' + '.join(table for table in TABLE_COLUMN_TYPES if table in stage_tables)
+                    print(f"      stage {tables}: "
+                          f"{format_throughput(stage_rows, stage_bytes, time.perf_counter() - stage_started)}")
+
+    print(f"\n✅ Load complete: {format_throughput(sum(totals.values()), total_bytes, time.perf_counter() - started)}")
+    for table, rows in totals.items():
+        print(f"   {table}: {rows}")
+    return totals
+
+
+def main() -> None:
+    """Parse command line arguments and load the exports."""
+    parser = argparse.ArgumentParser(description="Load the content exports into PostgreSQL with COPY.")
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL'),
+                        help="PostgreSQL connection string (default: $DATABASE_URL)")
+    parser.add_argument('--input-dir', type=Path, default=Path('.'), help="Directory with the export files (default: .)")
+    add_format_argument(parser)
+    parser.add_argument('--shards', type=Path, metavar='SHARD_DIR',
+                        help="Load rounds, items and round_objects from the universe shards of "
+                             "export_all.py --shard-by-universe (format from the shard manifest)")
+    parser.add_argument('--universe', nargs='+', metavar='UNIVERSE',
+                        help="Only reload the shards of these universes, replacing their rows (with --shards)")
+    parser.add_argument('--connections', '-c', type=int, default=DEFAULT_CONNECTIONS,
+                        help=f"Connection pool size = files loaded in parallel (default: {DEFAULT_CONNECTIONS})")
+    parser.add_argument('--create-schema', action='store_true',
+                        help="Create missing content tables (throwaway/staging databases only)")
+    parser.add_argument('--truncate', action='store_true', help="Empty the content tables before loading")
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("--dsn or $DATABASE_URL is required")
+    if args.connections < 1:
+        parser.error("--connections must be at least 1")
+    if args.universe and not args.shards:
+        parser.error("--universe requires --shards")
+    if args.universe and args.truncate:
+        parser.error("--universe replaces single universes and cannot be combined with --truncate")
+
+    load_exports(
+        args.dsn, args.input_dir, args.output_format, args.connections, args.create_schema, args.truncate,
+        args.shards, args.universe
+    )
+
+
+if __name__ == "__main__":
+    main()
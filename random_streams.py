@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Reproducible random streams for the content generators.
+
+Instead of the global random module, every generator draws from a
+random.Random seeded by the ids of what it generates:
+    rng = stream_random("disney", "Frozen", "DS_FR_001")
+so every round - and with it every chapter file - comes out the same no matter
+in which order or on which worker it is generated, and adding or changing one
+round does not reshuffle the others.
+
+Like content_uuids.py the seed is a hash of the id path (theme / chapter /
+round / ...); Python's hash() is salted per process and must not be used.
+"""
+
+import hashlib
+import random
+
+# Namespace of all stream seeds - changing it reshuffles all generated content
+STREAM_NAMESPACE = 'wordrush:random'
+
+
+def stream_seed(*path: object) -> int:
+    """Return the 64-bit seed of an id path."""
+    key = '/'.join([STREAM_NAMESPACE] + [str(part) for part in path])
+    return int.from_bytes(hashlib.sha256(key.encode('utf-8')).digest()[:8], 'big')
+
+
+def stream_random(*path: object) -> random.Random:
+    """Return a random.Random seeded by an id path."""
+    return random.Random(stream_seed(*path))
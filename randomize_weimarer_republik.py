@@ -2,23 +2,30 @@
 """
 Randomisiert spawnPosition, speed und behavior/pattern in den Weimarer Republik JSON-Dateien,
 um Stereotypien zu vermeiden - man soll nicht am Verhalten erkennen können, was correct/distractor ist.
+
+Jede Runde nutzt einen eigenen Zufallsstrom aus Theme, Kapitel und Runden-ID
+(random_streams.py): das Ergebnis ist reproduzierbar und unabhängig von der
+Reihenfolge der Dateien und Runden.
 """
 
 import json
-import random
 from pathlib import Path
 
+from random_streams import stream_random
+
+THEME_ID = 'weimarer_republik'
+
 # Mögliche Patterns für correct entries
 CORRECT_PATTERNS = ['linear_inward', 'zigzag', 'wave', 'seek_center']
 
 # Mögliche Behaviors für distractor entries
 DISTRACTOR_BEHAVIORS = ['linear_inward', 'seek_center', 'zigzag', 'wave', None]
 
-def randomize_spawn_position():
+def randomize_spawn_position(rng):
     """Zufällige spawnPosition zwischen 0.1 und 0.9"""
-    return round(random.uniform(0.1, 0.9), 2)
+    return round(rng.uniform(0.1, 0.9), 2)
 
-def randomize_speed(level):
+def randomize_speed(level, rng):
     """Speed basierend auf Level, aber mit Überlappung zwischen correct/distractor"""
     base_speed = {
         1: (0.85, 1.15),
@@ -28,22 +35,22 @@ def randomize_speed(level):
         5: (0.95, 1.30)
     }
     min_speed, max_speed = base_speed.get(level, (0.9, 1.2))
-    return round(random.uniform(min_speed, max_speed), 2)
+    return round(rng.uniform(min_speed, max_speed), 2)
 
-def randomize_correct_entry(entry, level):
+def randomize_correct_entry(entry, level, rng):
     """Randomisiert einen correct entry"""
-    entry['spawnPosition'] = randomize_spawn_position()
-    entry['speed'] = randomize_speed(level)
+    entry['spawnPosition'] = randomize_spawn_position(rng)
+    entry['speed'] = randomize_speed(level, rng)
     # Pattern variieren
-    entry['pattern'] = random.choice(CORRECT_PATTERNS)
+    entry['pattern'] = rng.choice(CORRECT_PATTERNS)
     return entry
 
-def randomize_distractor_entry(entry, level):
+def randomize_distractor_entry(entry, level, rng):
     """Randomisiert einen distractor entry"""
-    entry['spawnPosition'] = randomize_spawn_position()
-    entry['speed'] = randomize_speed(level)
+    entry['spawnPosition'] = randomize_spawn_position(rng)
+    entry['speed'] = randomize_speed(level, rng)
     # Behavior variieren oder weglassen
-    behavior = random.choice(DISTRACTOR_BEHAVIORS)
+    behavior = rng.choice(DISTRACTOR_BEHAVIORS)
     if behavior:
         entry['behavior'] = behavior
     elif 'behavior' in entry:
@@ -60,17 +67,18 @@ def process_json_file(file_path):
     items_modified = 0
     for item in data:
         level = item.get('level', 1)
+        rng = stream_random(THEME_ID, file_path.stem, item.get('id'))
         
         # Correct entries randomisieren
         if 'correct' in item:
             for correct_entry in item['correct']:
-                randomize_correct_entry(correct_entry, level)
+                randomize_correct_entry(correct_entry, level, rng)
                 items_modified += 1
         
         # Distractor entries randomisieren
         if 'distractors' in item:
             for distractor_entry in item['distractors']:
-                randomize_distractor_entry(distractor_entry, level)
+                randomize_distractor_entry(distractor_entry, level, rng)
                 items_modified += 1
     
     # Zurück schreiben
@@ -100,7 +108,5 @@ def main():
     print(f"\nTotal entries modified: {total_modified}")
 
 if __name__ == '__main__':
-    # Seed für Reproduzierbarkeit (optional - entfernen für echte Randomisierung)
-    random.seed()
     main()
 